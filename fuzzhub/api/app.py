@@ -3,14 +3,22 @@ File: fuzzhub/api/app.py
 """
 
 import asyncio
-import json
-from typing import List
+import os
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, HTTPException, Request, Response
+from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
+from fuzzhub.api.ws_hub import WebSocketHub
 from fuzzhub.database.session import SessionLocal
-from fuzzhub.database.models import MetricSnapshot, Crash
+from fuzzhub.database.queries import campaign_rows, listing_etag, page
+from fuzzhub.collectors.rollups import query_history
+from fuzzhub.collectors.clusters import get_cluster, list_clusters
+from fuzzhub.core.scheduler import PlacementError
+from fuzzhub.utils.input_store import get_input_store
 
 
 class StartFuzzerRequest(BaseModel):
@@ -19,183 +27,325 @@ class StartFuzzerRequest(BaseModel):
     config: dict = {}
 
 
+class MinimizeCorpusRequest(BaseModel):
+    target_binary: Optional[str] = None
+    target_args: Optional[List[str]] = None
+    showmap_path: Optional[str] = None
+    dirs: List[str] = []
+
+
+class ImportInputsRequest(BaseModel):
+    dirs: List[str] = []
+
+
 def create_api(campaign_manager, event_bus):
     print("EVENT BUS (api):", id(event_bus))
 
     app = FastAPI(title="FuzzHub API")
 
     # -----------------------------------------
-    # WebSocket Connection Registry
+    # WebSocket Fan-out
     # -----------------------------------------
 
-    active_connections: List[WebSocket] = []
+    ws_hub = WebSocketHub(live_source=campaign_manager.list_fuzzer_states)
 
-    loop = asyncio.get_event_loop()
+    # Subscribe to all events; the hub serializes each one once
+    event_bus.subscribe("*", ws_hub.publish)
 
-    async def broadcast(data: dict):
-        print("BROADCAST TO:", len(active_connections))
-        dead_connections = []
+    def not_modified(request: Request, response: Response, body) -> bool:
+        """
+        Tag the response; True if the client's copy is still current.
+        """
+        tag = listing_etag(body)
+        response.headers["ETag"] = tag
+        return tag in request.headers.get("if-none-match", "")
 
-        for connection in active_connections:
-            try:
-                await connection.send_text(json.dumps(data))
-            except Exception:
-                dead_connections.append(connection)
+    def etag_body(fuzzer: dict) -> dict:
+        # uptime_seconds changes on every request; clients derive it
+        # from started_at
+        return {k: v for k, v in fuzzer.items() if k != "uptime_seconds"}
 
-        for conn in dead_connections:
-            if conn in active_connections:
-                active_connections.remove(conn)
-
-    def handle_event(event):
+    # -----------------------------------------
+    # Health
+    # -----------------------------------------
 
-        loop = getattr(app.state, "loop", None)
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
 
-        if not loop:
-            print("NO LOOP AVAILABLE YET")
-            return
+    # -----------------------------------------
+    # Internal Pipeline Stats
+    # -----------------------------------------
 
-        print("SCHEDULING ON LOOP:", id(loop))
+    @app.get("/stats")
+    def stats():
+        return {**campaign_manager.stats(), "websocket": ws_hub.stats()}
 
-        loop.call_soon_threadsafe(
-            asyncio.create_task,
-            broadcast(event)
-        )
+    # -----------------------------------------
+    # Core Placement
+    # -----------------------------------------
 
-    # Subscribe to all events
-    event_bus.subscribe("*", handle_event)
+    @app.get("/placement")
+    def placement():
+        return campaign_manager.placement_info()
 
     # -----------------------------------------
-    # Health
+    # Core Allocator
     # -----------------------------------------
 
-    @app.get("/health")
-    def health():
-        return {"status": "ok"}
+    @app.get("/allocator")
+    def allocator_status():
+        return campaign_manager.allocator.status()
+
+    @app.post("/allocator/run")
+    def run_allocator():
+        if not campaign_manager.allocator.enabled:
+            raise HTTPException(status_code=409, detail="Allocator disabled")
+        campaign_manager.allocator.run_now()
+        return {"status": "scheduled"}
 
     # -----------------------------------------
     # List Fuzzers
     # -----------------------------------------
 
     @app.get("/fuzzers")
-    def list_fuzzers():
-        db = SessionLocal()
-        data = []
-
-        # Collect all known fuzzer IDs from DB
-        known_ids = {
-            row[0]
-            for row in db.query(MetricSnapshot.fuzzer_instance_id).distinct()
-        }
+    def list_fuzzers(
+        request: Request,
+        response: Response,
+        campaign_id: Optional[str] = None,
+        state: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ):
+        # Served from CampaignManager's in-memory state table
+        fuzzers = [
+            f for f in campaign_manager.list_fuzzer_states()
+            if (campaign_id is None or f["campaign_id"] == campaign_id)
+            and (state is None or f["state"] == state)
+        ]
 
-        # Include currently running fuzzers
-        for fuzzer_id, f in campaign_manager._fuzzers.items():
-            known_ids.add(fuzzer_id)
-
-        for fuzzer_id in known_ids:
-
-            f = campaign_manager._fuzzers.get(fuzzer_id)
-
-            if f:
-                status = f.status()
-            else:
-                status = {
-                    "id": fuzzer_id,
-                    "state": "stopped",
-                    "pid": None,
-                    "uptime_seconds": None,
-                }
-
-            latest_metric = (
-                db.query(MetricSnapshot)
-                .filter_by(fuzzer_instance_id=fuzzer_id)
-                .order_by(MetricSnapshot.timestamp.desc())
-                .first()
-            )
+        try:
+            fuzzers, next_cursor = page(fuzzers, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-            crash_count = (
-                db.query(Crash)
-                .filter_by(fuzzer_instance_id=fuzzer_id)
-                .count()
-            )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
 
-            data.append({
-                **status,
-                "exec_per_sec": latest_metric.exec_per_sec if latest_metric else None,
-                "corpus_size": latest_metric.corpus_size if latest_metric else None,
-                "coverage": latest_metric.coverage if latest_metric else None,
-                "crash_count": crash_count,
-            })
+        if not_modified(request, response, [etag_body(f) for f in fuzzers]):
+            return Response(status_code=304, headers=dict(response.headers))
 
-        db.close()
-        return data
+        return fuzzers
 
     # -----------------------------------------
     # Get Single Fuzzer (NEW)
     # -----------------------------------------
 
     @app.get("/fuzzers/{fuzzer_id}")
-    def get_fuzzer(fuzzer_id: str):
-        db = SessionLocal()
+    def get_fuzzer(fuzzer_id: str, request: Request, response: Response):
+        fuzzer = campaign_manager.get_fuzzer_state(fuzzer_id)
 
-        # Try running fuzzers first
-        f = campaign_manager._fuzzers.get(fuzzer_id)
-
-        if f:
-            status = f.status()
-        else:
-            # Fallback: look up latest metrics to reconstruct stopped fuzzer
-            latest_metric = (
-                db.query(MetricSnapshot)
-                .filter_by(fuzzer_instance_id=fuzzer_id)
-                .order_by(MetricSnapshot.timestamp.desc())
-                .first()
-            )
+        if fuzzer is None:
+            raise HTTPException(status_code=404, detail="Fuzzer not found")
 
-            if not latest_metric:
-                db.close()
-                raise HTTPException(status_code=404, detail="Fuzzer not found")
-
-            status = {
-                "id": fuzzer_id,
-                "state": "stopped",
-                "pid": None,
-                "uptime_seconds": None,
-            }
-
-        latest_metric = (
-            db.query(MetricSnapshot)
-            .filter_by(fuzzer_instance_id=fuzzer_id)
-            .order_by(MetricSnapshot.timestamp.desc())
-            .first()
-        )
+        if not_modified(request, response, etag_body(fuzzer)):
+            return Response(status_code=304, headers=dict(response.headers))
 
-        crash_count = (
-            db.query(Crash)
-            .filter_by(fuzzer_instance_id=fuzzer_id)
-            .count()
-        )
+        return fuzzer
 
-        db.close()
+    # -----------------------------------------
+    # Fuzzer Metric History
+    # -----------------------------------------
+
+    @app.get("/fuzzers/{fuzzer_id}/metrics")
+    def get_fuzzer_metrics(
+        fuzzer_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        max_points: int = 500,
+    ):
+        end = end or datetime.utcnow()
+        start = start or end - timedelta(hours=1)
+
+        if start >= end:
+            raise HTTPException(status_code=400, detail="start must be before end")
+
+        db = SessionLocal()
+        try:
+            resolution, points = query_history(
+                db, fuzzer_id, start, end, max_points=max(1, max_points)
+            )
+        finally:
+            db.close()
 
         return {
-            **status,
-            "exec_per_sec": latest_metric.exec_per_sec if latest_metric else None,
-            "corpus_size": latest_metric.corpus_size if latest_metric else None,
-            "coverage": latest_metric.coverage if latest_metric else None,
-            "crash_count": crash_count,
+            "id": fuzzer_id,
+            "resolution": resolution,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "points": points,
         }
 
+    # -----------------------------------------
+    # List Campaigns
+    # -----------------------------------------
+
+    @app.get("/campaigns")
+    def list_campaigns(
+        request: Request,
+        response: Response,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ):
+        db = SessionLocal()
+        try:
+            campaigns, next_cursor = campaign_rows(db, limit=limit, cursor=cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        finally:
+            db.close()
+
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+
+        if not_modified(request, response, campaigns):
+            return Response(status_code=304, headers=dict(response.headers))
+
+        return campaigns
+
+    # -----------------------------------------
+    # Campaign Coverage
+    # -----------------------------------------
+
+    @app.get("/campaigns/{campaign_id}/coverage")
+    def get_campaign_coverage(campaign_id: str):
+        coverage = campaign_manager.campaign_coverage(campaign_id)
+
+        if coverage is None:
+            raise HTTPException(status_code=404, detail="No coverage for campaign")
+
+        return coverage
+
+    @app.get("/campaigns/{campaign_id}/corpus")
+    def get_campaign_corpus(campaign_id: str):
+        corpus = campaign_manager.campaign_corpus(campaign_id)
+
+        if corpus is None:
+            raise HTTPException(status_code=404, detail="No corpus sync for campaign")
+
+        return corpus
+
+    @app.post("/campaigns/{campaign_id}/cmin")
+    def start_corpus_minimization(campaign_id: str,
+                                  req: Optional[MinimizeCorpusRequest] = None):
+        req = req or MinimizeCorpusRequest()
+        return campaign_manager.minimize_corpus(
+            campaign_id,
+            target_binary=req.target_binary,
+            target_args=req.target_args,
+            showmap_path=req.showmap_path,
+            dirs=req.dirs,
+        )
+
+    @app.get("/campaigns/{campaign_id}/cmin")
+    def get_corpus_minimization(campaign_id: str):
+        return campaign_manager.corpus_minimization_status(campaign_id)
+
+    @app.post("/campaigns/{campaign_id}/corpus/sync")
+    def sync_campaign_corpus(campaign_id: str):
+        campaign_manager.corpus_sync.sync_now()
+        return {"status": "scheduled"}
+
+    # -----------------------------------------
+    # Crash Clusters
+    # -----------------------------------------
+
+    @app.get("/crashes/clusters")
+    def get_crash_clusters(
+        campaign_id: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ):
+        db = SessionLocal()
+        try:
+            return list_clusters(
+                db, campaign_id, limit=min(max(1, limit), 1000), offset=max(0, offset)
+            )
+        finally:
+            db.close()
+
+    @app.get("/crashes/clusters/{cluster_id}")
+    def get_crash_cluster(cluster_id: str, limit: int = 500):
+        db = SessionLocal()
+        try:
+            cluster = get_cluster(db, cluster_id, limit=min(max(1, limit), 5000))
+        finally:
+            db.close()
+
+        if cluster is None:
+            raise HTTPException(status_code=404, detail="Cluster not found")
+
+        return cluster
+
+    # -----------------------------------------
+    # Crash Re-Bucketing (backfill)
+    # -----------------------------------------
+
+    @app.post("/crashes/rebucket")
+    def start_crash_rebucket():
+        return campaign_manager.rebucket_crashes()
+
+    @app.get("/crashes/rebucket")
+    def get_crash_rebucket():
+        return campaign_manager.rebucket_status()
+
+    # -----------------------------------------
+    # Crash Triage
+    # -----------------------------------------
+
+    @app.post("/crashes/{crash_id}/triage")
+    def triage_crash(crash_id: str):
+        if not campaign_manager.triage_crash(crash_id):
+            raise HTTPException(status_code=409, detail="Triage disabled or queue full")
+        return {"status": "queued", "crash_id": crash_id}
+
+    # -----------------------------------------
+    # Crash Inputs (content-addressed store)
+    # -----------------------------------------
+
+    @app.post("/crashes/inputs/import")
+    def start_input_import(req: Optional[ImportInputsRequest] = None):
+        return campaign_manager.import_inputs(req.dirs if req else None)
+
+    @app.get("/crashes/inputs/import")
+    def get_input_import():
+        return campaign_manager.import_inputs_status()
+
+    @app.get("/crashes/inputs/{sha256}")
+    def get_crash_input(sha256: str):
+        if not re.fullmatch(r"[0-9a-f]{64}", sha256):
+            raise HTTPException(status_code=400, detail="Invalid SHA-256")
+
+        path = get_input_store().path_for(sha256)
+        if not os.path.isfile(path):
+            raise HTTPException(status_code=404, detail="Input not found")
+
+        return FileResponse(path, media_type="application/octet-stream", filename=sha256)
+
     # -----------------------------------------
     # Start Fuzzer
     # -----------------------------------------
 
     @app.post("/fuzzers/start")
     def start_fuzzer(req: StartFuzzerRequest):
-        fuzzer_id = campaign_manager.start_fuzzer(
-            req.campaign_id,
-            req.fuzzer_type,
-            req.config,
-        )
+        try:
+            fuzzer_id = campaign_manager.start_fuzzer(
+                req.campaign_id,
+                req.fuzzer_type,
+                req.config,
+            )
+        except PlacementError as e:
+            raise HTTPException(status_code=503, detail=str(e))
         return {"fuzzer_id": fuzzer_id}
 
     # -----------------------------------------
@@ -234,27 +384,18 @@ def create_api(campaign_manager, event_bus):
         if not hasattr(app.state, "loop"):
             app.state.loop = asyncio.get_running_loop()
             print("CAPTURED LOOP:", id(app.state.loop))
+            ws_hub.start(app.state.loop)
 
-        await websocket.accept()
-        active_connections.append(websocket)
-
-        try:
-            while True:
-                await asyncio.sleep(3600)
-
-        except asyncio.CancelledError:
-            pass
-
-        except Exception:
-            pass
-
-        finally:
-            if websocket in active_connections:
-                active_connections.remove(websocket)
+        await ws_hub.serve(websocket)
 
     @app.on_event("startup")
     async def startup_event():
         app.state.loop = asyncio.get_running_loop()
         print("CAPTURED LOOP:", id(app.state.loop))
+        ws_hub.start(app.state.loop)
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        await ws_hub.stop()
 
     return app
@@ -0,0 +1,222 @@
+"""
+File: fuzzhub/api/live_state.py
+
+Server side of the v2 live-state WebSocket protocol.
+
+The state of every instance is kept as a flat row. Each tick diffs a
+fresh read against the previous one and produces at most one delta
+batch carrying only changed fields. To keep deltas small, rows are
+addressed by a slot number and fields by their index in the field
+list, both stable for the whole epoch (one per daemon run):
+
+    {"type": "snapshot", "v": 2, "epoch": e, "seq": n,
+     "fields": [name, ...],
+     "rows": [[slot, value, ...], ...]}
+
+    {"type": "delta", "v": 2, "seq": n,
+     "fields": [name, ...],                 # appended to the list, if any
+     "added": [[slot, value, ...], ...],    # new rows, all fields
+     "changes": [[slot, field, value, field, value, ...], ...],
+     "removed": [slot, ...]}
+
+Batches are numbered; the last `history` of them are kept so a client
+that reconnects with epoch=<epoch>&since=<seq> gets only what it
+missed.
+"""
+
+import threading
+import uuid
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# Derived from started_at; would change on every tick
+_VOLATILE = ("uptime_seconds",)
+
+_FLOAT_DIGITS = 2
+
+
+def _compact(value):
+    if isinstance(value, float):
+        return round(value, _FLOAT_DIGITS)
+    return value
+
+
+def live_row(status: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: _compact(v) for k, v in status.items() if k not in _VOLATILE}
+
+
+class LiveState:
+    """
+    Versioned instance table: snapshot + numbered delta batches.
+    """
+
+    def __init__(self, source: Callable[[], Iterable[dict]], history: int = 600):
+        self._source = source
+        self._rows: Dict[str, dict] = {}
+        self._history: deque = deque(maxlen=max(1, history))
+        self._lock = threading.Lock()
+
+        self._fields: List[str] = []
+        self._field_ix: Dict[str, int] = {}
+        self._slots: Dict[str, int] = {}
+        # slot -> (id, campaign_id); kept after removal for routing
+        self._owners: Dict[int, tuple] = {}
+
+        self.seq = 0
+        self.epoch = uuid.uuid4().hex[:12]
+
+        self.ticks = 0
+        self.batches = 0
+        self.changed_fields = 0
+
+    # -----------------------------------------
+    # Updates
+    # -----------------------------------------
+
+    def tick(self) -> Optional[dict]:
+        """
+        Diff the source against the current rows.
+
+        Returns the new delta batch, or None when nothing changed.
+        """
+        fresh = {s["id"]: live_row(s) for s in self._source()}
+
+        with self._lock:
+            self.ticks += 1
+            new_fields = []
+            added, changes = [], []
+
+            for fid, row in fresh.items():
+                for name in row:
+                    if name not in self._field_ix:
+                        self._field_ix[name] = len(self._fields)
+                        self._fields.append(name)
+                        new_fields.append(name)
+
+                old = self._rows.get(fid)
+                if old is None:
+                    slot = self._slots.setdefault(fid, len(self._slots))
+                    self._owners[slot] = (fid, row.get("campaign_id"))
+                    added.append([slot] + [row.get(f) for f in self._fields])
+                    self._rows[fid] = row
+                    self.changed_fields += len(row)
+                    continue
+
+                entry = [self._slots[fid]]
+                for name, value in row.items():
+                    if old.get(name) != value:
+                        entry += [self._field_ix[name], value]
+                for name in old:
+                    if name not in row:
+                        entry += [self._field_ix[name], None]
+
+                if len(entry) > 1:
+                    changes.append(entry)
+                    self.changed_fields += (len(entry) - 1) // 2
+                    self._rows[fid] = row
+
+            removed = [self._slots[fid] for fid in self._rows if fid not in fresh]
+            for slot in removed:
+                del self._rows[self._owners[slot][0]]
+
+            if not added and not changes and not removed:
+                return None
+
+            self.seq += 1
+            self.batches += 1
+            batch = {"type": "delta", "v": 2, "seq": self.seq}
+            if new_fields:
+                batch["fields"] = new_fields
+            if added:
+                batch["added"] = added
+            if changes:
+                batch["changes"] = changes
+            if removed:
+                batch["removed"] = removed
+
+            self._history.append(batch)
+            return batch
+
+    # -----------------------------------------
+    # Reads
+    # -----------------------------------------
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "type": "snapshot",
+                "v": 2,
+                "epoch": self.epoch,
+                "seq": self.seq,
+                "fields": list(self._fields),
+                "rows": [
+                    [self._slots[fid]] + [row.get(f) for f in self._fields]
+                    for fid, row in self._rows.items()
+                ],
+            }
+
+    def since(self, epoch: str, seq: int) -> Optional[List[dict]]:
+        """
+        Batches after `seq`, or None if some of them are no longer
+        kept or come from another daemon run (the client needs a
+        snapshot).
+        """
+        with self._lock:
+            if epoch != self.epoch or seq > self.seq or seq < 0:
+                return None
+            if seq == self.seq:
+                return []
+            if not self._history or self._history[0]["seq"] > seq + 1:
+                return None
+            return [b for b in self._history if b["seq"] > seq]
+
+    def owner(self, slot: int) -> tuple:
+        """
+        (fuzzer_id, campaign_id) of a slot.
+        """
+        return self._owners.get(slot, (None, None))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "seq": self.seq,
+                "rows": len(self._rows),
+                "fields": len(self._fields),
+                "ticks": self.ticks,
+                "batches": self.batches,
+                "changed_fields": self.changed_fields,
+                "history": len(self._history),
+            }
+
+
+def filter_batch(batch: dict, wants: Callable[[str, Optional[str]], bool],
+                 owner: Callable[[int], tuple]) -> Optional[dict]:
+    """
+    The part of a snapshot or delta batch a topic-filtered client sees
+    (None if a delta has nothing left). wants(fuzzer_id, campaign_id)
+    decides; owner(slot) resolves slots.
+    """
+    def keep(slot):
+        return wants(*owner(slot))
+
+    if batch["type"] == "snapshot":
+        return {**batch, "rows": [r for r in batch["rows"] if keep(r[0])]}
+
+    filtered = {"type": "delta", "v": 2, "seq": batch["seq"]}
+    if "fields" in batch:
+        # Field numbering is shared by every client
+        filtered["fields"] = batch["fields"]
+
+    for key in ("added", "changes"):
+        entries = [e for e in batch.get(key, []) if keep(e[0])]
+        if entries:
+            filtered[key] = entries
+
+    removed = [slot for slot in batch.get("removed", []) if keep(slot)]
+    if removed:
+        filtered["removed"] = removed
+
+    if len(filtered) == 3:
+        return None
+    return filtered
@@ -0,0 +1,408 @@
+"""
+File: fuzzhub/api/ws_hub.py
+
+WebSocket fan-out for bus events.
+
+Each event is serialized once, off the event loop, and the resulting
+text is queued for every interested client. Every client has its own
+bounded send queue drained by its own writer task, so a slow client
+only delays (and, once its queue is full, loses the oldest of) its own
+messages.
+
+Clients pick what they receive with topics:
+
+    campaign:<id>   events about one campaign
+    fuzzer:<id>     events about one instance
+    crashes         crash_found events only
+
+A client with no topics receives everything. Topics are given as
+?topics=a,b on connect or changed later with
+{"op": "subscribe" | "unsubscribe", "topics": [...]}.
+
+Protocol 2 (?v=2) replaces per-instance fuzzer_update events with the
+live-state stream (see live_state.py): one snapshot, then numbered
+field-level deltas every live_interval seconds. ?encoding=msgpack
+switches to binary MessagePack frames (when msgpack is installed) and
+?epoch=<e>&since=<seq> resumes a previous stream without a snapshot.
+
+The server sends {"type": "ping"} every ping_interval seconds. Any
+message from the client ({"op": "pong"} is enough) counts as a sign of
+life; clients silent for ping_timeout seconds are disconnected.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from fastapi import WebSocket
+
+from fuzzhub.api.live_state import LiveState, filter_batch
+from fuzzhub.utils.config import get_config
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def event_topics(event: Dict[str, Any]) -> set:
+    """
+    Topics an event is published under.
+    """
+    payload = event.get("payload") or {}
+    fuzzer = payload.get("fuzzer") or {}
+
+    topics = set()
+
+    campaign_id = payload.get("campaign_id") or fuzzer.get("campaign_id")
+    if campaign_id:
+        topics.add(f"campaign:{campaign_id}")
+
+    fuzzer_id = payload.get("fuzzer_id") or fuzzer.get("id")
+    if fuzzer_id:
+        topics.add(f"fuzzer:{fuzzer_id}")
+
+    if event.get("type") == "crash_found":
+        topics.add("crashes")
+
+    return topics
+
+
+def encode(message: Dict[str, Any], encoding: str):
+    if encoding == "msgpack":
+        return msgpack.packb(message, default=str, use_bin_type=True)
+    return json.dumps(message, default=str)
+
+
+def _decode(frame):
+    if isinstance(frame, bytes):
+        if msgpack is None:
+            raise ValueError("msgpack unavailable")
+        return msgpack.unpackb(frame, raw=False)
+    return json.loads(frame)
+
+
+class _Client:
+
+    def __init__(self, websocket: WebSocket, topics: Iterable[str], queue_size: int,
+                 protocol: int = 1, encoding: str = "json"):
+        self.websocket = websocket
+        self.topics = set(topics)
+        self.protocol = protocol
+        self.encoding = encoding
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.last_seen = time.monotonic()
+        self.writer: Optional[asyncio.Task] = None
+        # Last live-state batch this client has (protocol 2)
+        self.seq = 0
+        # A dropped delta would corrupt a protocol 2 client's state
+        self.overflowed = False
+        self.sent = 0
+        self.sent_bytes = 0
+        self.dropped = 0
+
+    @property
+    def stream_key(self):
+        # Clients sharing this key get byte-identical live-state frames
+        return self.encoding, frozenset(self.topics)
+
+    def wants(self, topics: set) -> bool:
+        return not self.topics or bool(self.topics & topics)
+
+    def wants_fuzzer(self, fuzzer_id: str, campaign_id: Optional[str]) -> bool:
+        if not self.topics:
+            return True
+        return f"fuzzer:{fuzzer_id}" in self.topics or f"campaign:{campaign_id}" in self.topics
+
+    def push(self, frame):
+        # Called on the loop thread only
+        if self.queue.full():
+            if self.protocol == 2:
+                # Start over from a snapshot (see WebSocketHub._resync)
+                self.dropped += self.queue.qsize()
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                self.overflowed = True
+                return
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(frame)
+
+    def send(self, message: Dict[str, Any]):
+        self.push(encode(message, self.encoding))
+
+    async def write(self):
+        while True:
+            frame = await self.queue.get()
+            if isinstance(frame, bytes):
+                await self.websocket.send_bytes(frame)
+            else:
+                await self.websocket.send_text(frame)
+            self.sent += 1
+            self.sent_bytes += len(frame)
+
+
+class WebSocketHub:
+
+    def __init__(self, live_source: Optional[Callable[[], Iterable[dict]]] = None):
+        cfg = get_config().get("websocket", {})
+
+        self.queue_size = max(1, int(cfg.get("queue_size", 1000)))
+        self.ping_interval = float(cfg.get("ping_interval", 20))
+        self.ping_timeout = float(cfg.get("ping_timeout", 60))
+        self.live_interval = float(cfg.get("live_interval", 1.0))
+
+        self.live = None
+        if live_source is not None:
+            self.live = LiveState(live_source, history=int(cfg.get("live_history", 600)))
+
+        self._clients: Dict[WebSocket, _Client] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks = []
+
+        self.published = 0
+        self.evicted = 0
+
+    # -----------------------------------------
+    # Lifecycle
+    # -----------------------------------------
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        if not self._tasks:
+            self._tasks.append(loop.create_task(self._ping_loop()))
+            if self.live is not None:
+                self._tasks.append(loop.create_task(self._live_loop()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        for client in list(self._clients.values()):
+            await self._drop(client)
+
+    # -----------------------------------------
+    # Publishing (any thread)
+    # -----------------------------------------
+
+    def publish(self, event: Dict[str, Any]):
+        """
+        Serialize an event once and queue it for every interested
+        client. Safe to call from any thread.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed() or not self._clients:
+            return
+
+        text = json.dumps(event, default=str)
+        loop.call_soon_threadsafe(self._fan_out, event, event_topics(event), text)
+
+    def _fan_out(self, event: Dict[str, Any], topics: set, text: str):
+        self.published += 1
+        # Protocol 2 gets instance state from the live stream instead
+        live = self.live is not None and event.get("type") == "fuzzer_update"
+        packed = None
+
+        for client in list(self._clients.values()):
+            if not client.wants(topics):
+                continue
+            if client.protocol == 1:
+                client.push(text)
+            elif live:
+                continue
+            else:
+                if client.encoding == "msgpack" and packed is None:
+                    packed = encode(event, "msgpack")
+                client.push(packed if client.encoding == "msgpack" else text)
+                self._resync(client)
+
+    async def _live_loop(self):
+        while True:
+            await asyncio.sleep(self.live_interval)
+
+            # Nobody is listening: rows keep what clients last saw, so
+            # the next tick still produces correct deltas
+            if not any(c.protocol == 2 for c in self._clients.values()):
+                continue
+
+            try:
+                batch = await asyncio.to_thread(self.live.tick)
+            except Exception as e:
+                print(f"[!] Live state tick failed: {e}")
+                continue
+
+            if batch is not None:
+                self._fan_out_batch(batch)
+
+    def _fan_out_batch(self, batch: dict):
+        frames = {}
+
+        for client in list(self._clients.values()):
+            if client.protocol != 2 or batch["seq"] <= client.seq:
+                continue
+
+            key = client.stream_key
+            if key not in frames:
+                message = batch
+                if client.topics:
+                    message = filter_batch(batch, client.wants_fuzzer, self.live.owner)
+                frames[key] = None if message is None else encode(message, client.encoding)
+
+            client.seq = batch["seq"]
+            if frames[key] is not None:
+                client.push(frames[key])
+            self._resync(client)
+
+    def _resync(self, client: _Client):
+        if client.overflowed:
+            client.overflowed = False
+            self._send_live(client)
+
+    def _send_live(self, client: _Client, epoch: Optional[str] = None,
+                   since: Optional[int] = None):
+        """
+        Bring a protocol 2 client up to date: replay what it missed
+        if possible, otherwise send a snapshot.
+        """
+        batches = None
+        if epoch is not None and since is not None:
+            batches = self.live.since(epoch, since)
+
+        if batches is None:
+            snapshot = self.live.snapshot()
+            if client.topics:
+                snapshot = filter_batch(snapshot, client.wants_fuzzer, self.live.owner)
+            client.seq = snapshot["seq"]
+            client.send(snapshot)
+            return
+
+        client.send({"type": "resumed", "v": 2, "epoch": epoch, "seq": since})
+        for batch in batches:
+            if client.topics:
+                batch = filter_batch(batch, client.wants_fuzzer, self.live.owner)
+            if batch is not None:
+                client.send(batch)
+        client.seq = max([since] + [b["seq"] for b in batches])
+
+    # -----------------------------------------
+    # Connections
+    # -----------------------------------------
+
+    async def serve(self, websocket: WebSocket):
+        """
+        Run one connection until the client goes away or is evicted.
+        """
+        await websocket.accept()
+
+        params = websocket.query_params
+        protocol = 2 if params.get("v") == "2" and self.live is not None else 1
+        encoding = "msgpack" if params.get("encoding") == "msgpack" and msgpack else "json"
+
+        client = _Client(
+            websocket, [t for t in params.get("topics", "").split(",") if t],
+            self.queue_size, protocol=protocol, encoding=encoding,
+        )
+        client.writer = asyncio.create_task(self._write(client))
+        self._clients[websocket] = client
+
+        if protocol == 2:
+            since = params.get("since")
+            self._send_live(
+                client, params.get("epoch"),
+                int(since) if since and since.isdigit() else None,
+            )
+
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                client.last_seen = time.monotonic()
+                self._handle(client, message.get("text") or message.get("bytes"))
+
+        except Exception:
+            pass
+
+        finally:
+            await self._drop(client)
+
+    def _handle(self, client: _Client, frame):
+        try:
+            request = _decode(frame)
+        except Exception:
+            return
+        if not isinstance(request, dict):
+            return
+
+        op = request.get("op")
+        topics = request.get("topics") or []
+
+        if op == "subscribe":
+            client.topics.update(topics)
+        elif op == "unsubscribe":
+            client.topics.difference_update(topics)
+        elif op == "ping":
+            client.send({"type": "pong"})
+            return
+        else:
+            # "pong" and anything else: last_seen already refreshed
+            return
+
+        client.send({"type": "subscribed", "topics": sorted(client.topics)})
+        if client.protocol == 2:
+            # Rows for the new topic set
+            self._send_live(client)
+
+    async def _write(self, client: _Client):
+        try:
+            await client.write()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Send failed: the peer is gone
+            await self._drop(client, cancel_writer=False)
+
+    async def _drop(self, client: _Client, cancel_writer: bool = True):
+        if self._clients.pop(client.websocket, None) is None:
+            return
+
+        if cancel_writer and client.writer and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+
+        try:
+            await client.websocket.close()
+        except Exception:
+            pass
+
+    async def _ping_loop(self):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            now = time.monotonic()
+
+            for client in list(self._clients.values()):
+                if now - client.last_seen > self.ping_timeout:
+                    print("[!] Evicting unresponsive WebSocket client")
+                    self.evicted += 1
+                    await self._drop(client)
+                else:
+                    client.send({"type": "ping"})
+                    self._resync(client)
+
+    # -----------------------------------------
+    # Introspection
+    # -----------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        clients = list(self._clients.values())
+        return {
+            "clients": len(clients),
+            "clients_v2": sum(1 for c in clients if c.protocol == 2),
+            "published": self.published,
+            "evicted": self.evicted,
+            "sent": sum(c.sent for c in clients),
+            "sent_bytes": sum(c.sent_bytes for c in clients),
+            "dropped": sum(c.dropped for c in clients),
+            "max_queue_depth": max((c.queue.qsize() for c in clients), default=0),
+            "live": self.live.stats() if self.live is not None else None,
+        }
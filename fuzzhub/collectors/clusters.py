@@ -0,0 +1,292 @@
+"""
+File: fuzzhub/collectors/clusters.py
+
+Near-duplicate crash clustering (MinHash + LSH).
+
+Exact signatures split one bug into several buckets when a frame is
+inlined differently or an extra wrapper shows up. Each crash gets a
+MinHash sketch of its stack (frames and adjacent frame pairs), stored
+on the crash row. Clusters keep their first member's sketch, and an
+in-memory LSH table (bands of the sketch -> cluster ids) finds
+candidate clusters for a new crash with a few dict lookups instead of
+comparing against every stored crash.
+
+A crash without recognizable frames (AFL before triage, honggfuzz)
+has nothing to compare but its type, so its signature, which carries
+the input hash or the fuzzer's own stack hash, is shingled as well;
+such crashes only share a cluster with their own bucket.
+"""
+
+import threading
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+
+from fuzzhub.collectors.signatures import crash_kind, extract_frames
+from fuzzhub.database.models import Crash, CrashCluster
+from fuzzhub.utils.config import get_config
+
+
+NUM_PERM = 64
+
+# Universal hashing (a*x + b) mod p with a Mersenne prime below 2^32.
+# The seed is fixed: sketches stored in the database must stay
+# comparable across restarts.
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(1, (1 << 31) - 1, size=NUM_PERM, dtype=np.uint64)[:, None]
+_B = _rng.integers(0, (1 << 31) - 1, size=NUM_PERM, dtype=np.uint64)[:, None]
+
+
+# -------------------------------------------------
+# Sketches
+# -------------------------------------------------
+
+def _shingles(crash_type: Optional[str], stack_trace: Optional[str],
+              max_frames: int, signature: Optional[str] = None) -> Set[str]:
+    stack_trace = stack_trace or ""
+    frames = extract_frames(stack_trace)[:max_frames]
+
+    shingles = {"type:" + crash_kind(crash_type, stack_trace)}
+    if not frames and signature:
+        # Otherwise every frameless crash of one type scores 1.0
+        shingles.add("sig:" + signature)
+    shingles.update(frames)
+    shingles.update(f"{a}>{b}" for a, b in zip(frames, frames[1:]))
+    return shingles
+
+
+def minhash(crash_type: Optional[str], stack_trace: Optional[str],
+            max_frames: int = None, signature: Optional[str] = None) -> np.ndarray:
+    """
+    NUM_PERM-value uint32 MinHash sketch of a crash's stack
+    (signature is used when the stack has no frames).
+    """
+    if max_frames is None:
+        max_frames = _config().get("frames", 16)
+
+    shingles = _shingles(crash_type, stack_trace, max_frames, signature)
+    x = np.fromiter(
+        (zlib.crc32(s.encode()) for s in shingles),
+        dtype=np.uint64, count=len(shingles),
+    )[None, :]
+
+    return ((_A * x + _B) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Estimated Jaccard similarity of two sketches.
+    """
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def to_bytes(sketch: np.ndarray) -> bytes:
+    return sketch.astype("<u4").tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4").astype(np.uint32)
+
+
+def _config() -> dict:
+    return get_config().get("collectors", {}).get("clusters", {})
+
+
+# -------------------------------------------------
+# LSH Index
+# -------------------------------------------------
+
+class CrashClusterIndex:
+    """
+    In-memory LSH table over cluster representative sketches.
+    """
+
+    def __init__(self, bands: int = None, threshold: float = None):
+        cfg = _config()
+
+        self.bands = bands or cfg.get("bands", 16)
+        if NUM_PERM % self.bands:
+            raise ValueError(f"clusters.bands must divide {NUM_PERM}")
+        self.rows = NUM_PERM // self.bands
+        self.threshold = threshold if threshold is not None else cfg.get("threshold", 0.5)
+
+        self._lock = threading.Lock()
+        self._sketches: Dict[str, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(self.bands)]
+
+        self.assigned = 0
+        self.created = 0
+        self.candidates_checked = 0
+
+    def warm(self, db):
+        rows = db.execute(select(CrashCluster.id, CrashCluster.minhash)).all()
+
+        with self._lock:
+            self._sketches.clear()
+            self._buckets = [{} for _ in range(self.bands)]
+            for cluster_id, data in rows:
+                if data:
+                    self._add(cluster_id, from_bytes(data))
+
+        print(f"[*] Crash cluster index warmed ({len(rows)} clusters)")
+
+    def _band_keys(self, sketch: np.ndarray):
+        data = to_bytes(sketch)
+        step = self.rows * 4
+        return [data[i * step:(i + 1) * step] for i in range(self.bands)]
+
+    def _add(self, cluster_id: str, sketch: np.ndarray):
+        self._sketches[cluster_id] = sketch
+        for band, key in zip(self._buckets, self._band_keys(sketch)):
+            band.setdefault(key, []).append(cluster_id)
+
+    def assign(self, sketch: np.ndarray, new_id: str) -> Tuple[str, bool]:
+        """
+        Best matching cluster for a sketch, or register new_id as a
+        new cluster. Returns (cluster_id, created).
+        """
+        with self._lock:
+            candidates = set()
+            for band, key in zip(self._buckets, self._band_keys(sketch)):
+                members = band.get(key)
+                if members:
+                    candidates.update(members)
+
+            best, best_score = None, self.threshold
+            for cluster_id in candidates:
+                score = similarity(sketch, self._sketches[cluster_id])
+                if score >= best_score:
+                    best, best_score = cluster_id, score
+
+            self.candidates_checked += len(candidates)
+
+            if best is not None:
+                self.assigned += 1
+                return best, False
+
+            self._add(new_id, sketch)
+            self.created += 1
+            return new_id, True
+
+    def discard(self, cluster_id: str):
+        """
+        Forget a cluster whose row never made it to the database.
+        """
+        with self._lock:
+            sketch = self._sketches.pop(cluster_id, None)
+            if sketch is None:
+                return
+            for band, key in zip(self._buckets, self._band_keys(sketch)):
+                members = band.get(key)
+                if members and cluster_id in members:
+                    members.remove(cluster_id)
+                    if not members:
+                        del band[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "clusters": len(self._sketches),
+                "bands": self.bands,
+                "rows_per_band": self.rows,
+                "threshold": self.threshold,
+                "assigned": self.assigned,
+                "created": self.created,
+                "candidates_checked": self.candidates_checked,
+            }
+
+
+# -------------------------------------------------
+# Queries
+# -------------------------------------------------
+
+def _cluster_row(row) -> dict:
+    return {
+        "id": row.id,
+        "signature": row.signature,
+        "representative_crash_id": row.representative_crash_id,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "crashes": row.crashes,
+        "occurrences": row.occurrences,
+        "last_seen": row.last_seen.isoformat() if row.last_seen else None,
+    }
+
+
+def _cluster_query(campaign_id: Optional[str] = None):
+    query = (
+        select(
+            CrashCluster.id,
+            CrashCluster.signature,
+            CrashCluster.representative_crash_id,
+            CrashCluster.created_at,
+            func.count(Crash.id).label("crashes"),
+            func.sum(Crash.occurrences).label("occurrences"),
+            func.max(Crash.last_seen).label("last_seen"),
+        )
+        .join(Crash, Crash.cluster_id == CrashCluster.id)
+        .group_by(
+            CrashCluster.id,
+            CrashCluster.signature,
+            CrashCluster.representative_crash_id,
+            CrashCluster.created_at,
+        )
+    )
+    if campaign_id:
+        query = query.where(Crash.campaign_id == campaign_id)
+    return query
+
+
+def list_clusters(db, campaign_id: Optional[str] = None,
+                  limit: int = 100, offset: int = 0) -> List[dict]:
+    """
+    Clusters with member counts, largest first.
+    """
+    rows = db.execute(
+        _cluster_query(campaign_id)
+        .order_by(func.count(Crash.id).desc(), CrashCluster.id)
+        .limit(limit)
+        .offset(offset)
+    ).all()
+    return [_cluster_row(row) for row in rows]
+
+
+def get_cluster(db, cluster_id: str, limit: int = 500) -> Optional[dict]:
+    """
+    One cluster with its member crashes (most occurrences first).
+    """
+    row = db.execute(
+        _cluster_query().where(CrashCluster.id == cluster_id)
+    ).first()
+    if row is None:
+        return None
+
+    members = db.execute(
+        select(
+            Crash.id, Crash.campaign_id, Crash.fuzzer_instance_id,
+            Crash.crash_type, Crash.signature, Crash.input_path,
+            Crash.occurrences, Crash.first_seen, Crash.last_seen,
+        )
+        .where(Crash.cluster_id == cluster_id)
+        .order_by(Crash.occurrences.desc())
+        .limit(limit)
+    ).all()
+
+    cluster = _cluster_row(row)
+    cluster["members"] = [
+        {
+            "id": m.id,
+            "campaign_id": m.campaign_id,
+            "fuzzer_instance_id": m.fuzzer_instance_id,
+            "crash_type": m.crash_type,
+            "signature": m.signature,
+            "input_path": m.input_path,
+            "occurrences": m.occurrences,
+            "first_seen": m.first_seen.isoformat() if m.first_seen else None,
+            "last_seen": m.last_seen.isoformat() if m.last_seen else None,
+        }
+        for m in members
+    ]
+    return cluster
@@ -0,0 +1,324 @@
+"""
+File: fuzzhub/collectors/coverage.py
+
+Campaign-wide edge coverage aggregation.
+
+Each fuzzer instance exposes one or more coverage sources (see
+BaseFuzzer.coverage_sources). They are loaded into sorted arrays of
+covered edge indexes, and every campaign keeps a per-edge count of
+how many instances cover it. Updating one instance subtracts its old
+edges and adds its new ones, so a tick costs O(edges of the changed
+bitmaps) and the campaign's unique-edge count is kept incrementally.
+
+Supported source formats:
+
+    afl_bitmap    AFL/AFL++ fuzz_bitmap (virgin map, 0xFF = not hit)
+    afl_showmap   afl-showmap output, one "edge_id:hit_count" per line
+    sancov        SanitizerCoverage .sancov PC dump
+    libfuzzer     -print_coverage output (COVERED_FUNC lines)
+
+Edges are only comparable within one space (AFL map offsets, PCs,
+libFuzzer function edges), so counts are kept per space and the
+campaign total is their sum.
+"""
+
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from fuzzhub.utils.config import get_config
+from fuzzhub.utils.files import file_signature
+
+
+_SANCOV_MAGIC64 = 0xC0BFFFFFFFFFFF64
+_SANCOV_MAGIC32 = 0xC0BFFFFFFFFFFF32
+
+# COVERED_FUNC: hits: 5 edges: 3/4 LLVMFuzzerTestOneInput /src/fuzz.cc:10
+_COVERED_FUNC = re.compile(r"COVERED_FUNC:.*?edges:\s*(\d+)/\d+\s+(.*)$")
+
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+# -------------------------------------------------
+# Source Loaders
+# -------------------------------------------------
+
+def _load_afl_bitmap(path: str):
+    bitmap = np.fromfile(path, dtype=np.uint8)
+    return np.flatnonzero(bitmap != 0xFF), len(bitmap)
+
+
+def _load_afl_showmap(path: str):
+    with open(path, "rb") as f:
+        lines = f.read().split()
+    edges = np.array([int(line.split(b":", 1)[0]) for line in lines], dtype=np.int64)
+    return np.unique(edges), None
+
+
+def _load_sancov(path: str):
+    raw = np.fromfile(path, dtype=np.uint8)
+    if len(raw) < 8:
+        return [], None
+
+    magic = int(raw[:8].view(np.uint64)[0])
+    if magic == _SANCOV_MAGIC64:
+        pcs = raw[8:len(raw) - (len(raw) - 8) % 8].view(np.uint64)
+    elif magic == _SANCOV_MAGIC32:
+        pcs = raw[8:len(raw) - (len(raw) - 8) % 4].view(np.uint32)
+    else:
+        raise ValueError(f"not a .sancov file: {path}")
+
+    return np.unique(pcs).tolist(), None
+
+
+def _load_libfuzzer(path: str):
+    # Only per-function edge counts are printed, so edge k of a function
+    # stands in for "the k-th covered edge" (approximate across instances)
+    keys = []
+    with open(path, "r", errors="replace") as f:
+        for line in f:
+            match = _COVERED_FUNC.search(line)
+            if match:
+                func = match.group(2).strip()
+                keys.extend(f"{func}#{k}" for k in range(int(match.group(1))))
+    return keys, None
+
+
+# format -> (space, loader, keyed)
+# keyed loaders return hashable keys that are mapped to dense indexes
+_FORMATS = {
+    "afl_bitmap": ("afl", _load_afl_bitmap, False),
+    "afl_showmap": ("afl", _load_afl_showmap, False),
+    "sancov": ("pc", _load_sancov, True),
+    "libfuzzer": ("libfuzzer", _load_libfuzzer, True),
+}
+
+
+# -------------------------------------------------
+# Aggregation
+# -------------------------------------------------
+
+class _Space:
+    """
+    Per-edge instance counts for one campaign and one edge space.
+    """
+
+    def __init__(self, keyed: bool):
+        self.counts = np.zeros(0, dtype=np.uint32)
+        self.keys: Optional[Dict] = {} if keyed else None
+        self.covered = 0
+        self.map_size = None
+
+    def index(self, keys) -> np.ndarray:
+        index = self.keys
+        return np.fromiter(
+            (index.setdefault(k, len(index)) for k in keys),
+            dtype=np.int64, count=len(keys),
+        )
+
+    def reserve(self, size: int):
+        if size > len(self.counts):
+            grown = np.zeros(max(size, len(self.counts) * 2), dtype=np.uint32)
+            grown[:len(self.counts)] = self.counts
+            self.counts = grown
+
+    def replace(self, old: np.ndarray, new: np.ndarray):
+        counts = self.counts
+
+        if len(old):
+            lost = int(np.count_nonzero(counts[old] == 1))
+            counts[old] -= 1
+            self.covered -= lost
+
+        if len(new):
+            self.reserve(int(new[-1]) + 1)
+            counts = self.counts
+            gained = int(np.count_nonzero(counts[new] == 0))
+            counts[new] += 1
+            self.covered += gained
+
+
+class _CampaignCoverage:
+
+    def __init__(self):
+        self.spaces: Dict[str, _Space] = {}
+        # fuzzer_id -> space -> sorted unique edge indexes
+        self.instances: Dict[str, Dict[str, np.ndarray]] = {}
+        self.updated_at = None
+
+
+class CoverageAggregator:
+    """
+    Campaign coverage maps built from per-instance sources.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._campaigns: Dict[str, _CampaignCoverage] = {}
+        self._owner: Dict[str, str] = {}
+
+        # fuzzer_id -> path -> (signature, space, edges)
+        self._sources: Dict[str, Dict[str, tuple]] = {}
+
+        self.loads = 0
+        self.skipped = 0
+        self.errors = 0
+        self.last_update_ms = None
+
+    # -----------------------------------------
+    # Updates
+    # -----------------------------------------
+
+    def update(self, fuzzer) -> bool:
+        """
+        Re-read the fuzzer's changed coverage sources and fold them
+        into its campaign. Returns True if anything changed.
+        """
+        started = time.perf_counter()
+        cache = self._sources.setdefault(fuzzer.id, {})
+        loaded = []
+
+        for fmt, path in fuzzer.coverage_sources():
+            if fmt not in _FORMATS:
+                continue
+
+            sig = file_signature(path)
+            if sig is None:
+                continue
+
+            cached = cache.get(path)
+            if cached is not None and cached[0] == sig:
+                self.skipped += 1
+                continue
+
+            space, loader, keyed = _FORMATS[fmt]
+            try:
+                edges, map_size = loader(path)
+            except (OSError, ValueError) as e:
+                self.errors += 1
+                print(f"[!] Coverage source {path} unreadable: {e}")
+                continue
+
+            self.loads += 1
+            loaded.append((path, sig, space, keyed, edges, map_size))
+
+        if not loaded:
+            return False
+
+        with self._lock:
+            campaign = self._campaigns.setdefault(fuzzer.campaign_id, _CampaignCoverage())
+            self._owner[fuzzer.id] = fuzzer.campaign_id
+
+            changed_spaces = set()
+
+            for path, sig, space_name, keyed, edges, map_size in loaded:
+                space = campaign.spaces.get(space_name)
+                if space is None:
+                    space = campaign.spaces[space_name] = _Space(keyed)
+
+                if space.keys is not None:
+                    edges = np.unique(space.index(edges))
+                if map_size:
+                    space.map_size = max(space.map_size or 0, map_size)
+                    space.reserve(map_size)
+
+                cache[path] = (sig, space_name, edges)
+                changed_spaces.add(space_name)
+
+            instance = campaign.instances.setdefault(fuzzer.id, {})
+
+            for space_name in changed_spaces:
+                parts = [e for _, s, e in cache.values() if s == space_name]
+                new = parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+                old = instance.get(space_name, _EMPTY)
+                campaign.spaces[space_name].replace(old, new)
+                instance[space_name] = new
+
+            campaign.updated_at = time.time()
+
+        self.last_update_ms = (time.perf_counter() - started) * 1000.0
+        return True
+
+    def remove(self, fuzzer_id: str):
+        """
+        Drop an instance's edges from its campaign (e.g. when its
+        output directory is deleted). Stopped instances are normally
+        kept: what they covered still counts for the campaign.
+        """
+        with self._lock:
+            self._sources.pop(fuzzer_id, None)
+            campaign = self._campaigns.get(self._owner.pop(fuzzer_id, None))
+            if campaign is None:
+                return
+
+            for space_name, edges in campaign.instances.pop(fuzzer_id, {}).items():
+                campaign.spaces[space_name].replace(edges, _EMPTY)
+
+    # -----------------------------------------
+    # Queries
+    # -----------------------------------------
+
+    def summary(self, campaign_id: str) -> Optional[dict]:
+        with self._lock:
+            campaign = self._campaigns.get(campaign_id)
+            if campaign is None:
+                return None
+
+            spaces = {
+                name: {
+                    "unique_edges": space.covered,
+                    "map_size": space.map_size,
+                }
+                for name, space in campaign.spaces.items()
+            }
+
+            instances = {}
+            for fuzzer_id, per_space in campaign.instances.items():
+                edges = 0
+                marginal = 0
+                for space_name, idx in per_space.items():
+                    edges += len(idx)
+                    # Edges no other instance has reached
+                    marginal += int(np.count_nonzero(campaign.spaces[space_name].counts[idx] == 1))
+                instances[fuzzer_id] = {"edges": edges, "unique_edges": marginal}
+
+            return {
+                "campaign_id": campaign_id,
+                "unique_edges": sum(s["unique_edges"] for s in spaces.values()),
+                "spaces": spaces,
+                "instances": instances,
+                "updated_at": campaign.updated_at,
+            }
+
+    def stats(self) -> dict:
+        return {
+            "campaigns": len(self._campaigns),
+            "instances": len(self._owner),
+            "loads": self.loads,
+            "skipped_unchanged": self.skipped,
+            "errors": self.errors,
+            "last_update_ms": self.last_update_ms,
+        }
+
+
+class CoverageCollector:
+    """
+    Periodic coverage job for one fuzzer, run by CollectionScheduler.
+    """
+
+    def __init__(self, fuzzer, aggregator: CoverageAggregator,
+                 interval: float = None):
+        self.fuzzer = fuzzer
+        self.aggregator = aggregator
+        self.interval = interval or fuzzer.config.get("coverage_interval") or (
+            get_config().get("collectors", {}).get("coverage", {}).get("interval", 30)
+        )
+
+    def collect(self):
+        try:
+            self.aggregator.update(self.fuzzer)
+        except Exception as e:
+            print(f"[!] Coverage error: {e}")
@@ -1,73 +1,615 @@
 """
 File: fuzzhub/collectors/crashes.py
 
-Crash collection and deduplication thread.
+Crash collection and deduplication job.
+
+Crashes are bucketed by normalized signature (see signatures.py) and
+crash_hash is the signature's sha256. Deduplication goes through a
+shared CrashIndex: an LRU-bounded map of known crash hashes, warmed
+from the crashes table at startup. Repeats of a known crash only bump
+an in-memory counter; the index thread flushes the accumulated counts
+as one batched UPDATE ... SET occurrences = occurrences + k. A
+rebucket batch runs with flushing held off and moves pending counts
+to the rewritten hashes (CrashIndex.rehash). Only hashes the index
+has not seen touch the database synchronously; that is also where a
+new crash is sketched and assigned to a near-duplicate cluster, and
+its input is stored by content (see inputs.py).
 """
 
 import threading
 import time
-import hashlib
+import uuid
+from collections import OrderedDict
 from datetime import datetime
 
+from sqlalchemy import bindparam, case, delete, insert, select, update
+
+from fuzzhub.collectors.clusters import CrashClusterIndex, minhash, to_bytes
+from fuzzhub.collectors.signatures import bucket
 from fuzzhub.database.session import SessionLocal
-from fuzzhub.database.models import Crash
+from fuzzhub.database.models import Crash, CrashCluster
+from fuzzhub.utils.config import get_config
 
 
-class CrashCollector(threading.Thread):
+class CrashIndex(threading.Thread):
+    """
+    In-memory crash hash index with batched occurrence updates.
+    """
+
+    def __init__(self, max_size: int = None, flush_interval_ms: int = None,
+                 inputs=None, on_new=None):
+        super().__init__(daemon=True, name="crash-index")
+
+        cfg = get_config().get("collectors", {}).get("crashes", {})
+
+        self.max_size = max_size or cfg.get("index_size", 100000)
+        self.flush_interval = (
+            flush_interval_ms or cfg.get("flush_interval_ms", 2000)
+        ) / 1000.0
+
+        # crash_hash -> crash id, least recently seen first
+        self._index: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Serializes the slow path so one new hash is inserted once
+        self._insert_lock = threading.Lock()
+
+        # crash_hash -> [occurrences to add, last_seen]
+        self._pending = {}
+        # Held while pending counts are written (see rehash)
+        self._flush_lock = threading.Lock()
+
+        self.clusters = CrashClusterIndex()
+
+        # CrashInputIngest; new crashes record their input's SHA-256
+        self.inputs = inputs
+
+        # Called as on_new(crash_id, new_cluster, crash) after a crash is inserted
+        self.on_new = on_new
 
-    def __init__(self, fuzzer, interval: int = 3):
-        super().__init__(daemon=True)
-        self.fuzzer = fuzzer
-        self.interval = interval
         self._running = True
+        self._wake = threading.Event()
+
+        self._hits = 0
+        self._misses = 0
+        self._inserted = 0
+        self._flushes = 0
+        self._flush_errors = 0
+        self._rows_updated = 0
+        self._last_flush_ms = None
+
+    # -----------------------------------------
+    # Warm-Up
+    # -----------------------------------------
+
+    def warm(self):
+        """
+        Load the most recently seen crash hashes.
+        """
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(Crash.crash_hash, Crash.id)
+                .order_by(Crash.last_seen.desc())
+                .limit(self.max_size)
+            ).all()
+            self.clusters.warm(db)
+        finally:
+            db.close()
+
+        with self._lock:
+            self._index.clear()
+            for crash_hash, crash_id in reversed(rows):
+                self._index[crash_hash] = crash_id
+
+        print(f"[*] Crash index warmed ({len(rows)} hashes)")
+
+    # -----------------------------------------
+    # Recording
+    # -----------------------------------------
+
+    def record(self, fuzzer, crash_data: dict) -> bool:
+        """
+        Count one reported crash. Returns True if it is a new crash.
+        """
+        signature, key = bucket(crash_data)
+
+        if self._bump(key):
+            return False
+
+        # Store the input before taking the insert lock: copying it
+        # must not hold up every other collector's new crashes
+        input_path = crash_data.get("input_path")
+        input_sha256 = None
+        if input_path and self.inputs is not None:
+            input_sha256 = self.inputs.ingest(input_path)
+
+        with self._insert_lock:
+            # Another collector may have inserted it while we waited
+            if self._bump(key):
+                return False
+
+            with self._lock:
+                self._misses += 1
+
+            return self._insert_or_bump(fuzzer, key, signature, crash_data, input_sha256)
+
+    def _bump(self, key: str) -> bool:
+        now = datetime.utcnow()
+
+        with self._lock:
+            if key not in self._index:
+                return False
+
+            self._index.move_to_end(key)
+            self._hits += 1
+            self._add_pending(key, 1, now)
+
+        return True
+
+    def _add_pending(self, key: str, count: int, last_seen):
+        # Caller holds self._lock
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = [count, last_seen]
+        else:
+            pending[0] += count
+            pending[1] = max(pending[1], last_seen)
+
+    def _insert_or_bump(self, fuzzer, key: str, signature: str,
+                        crash_data: dict, input_sha256: str = None) -> bool:
+        now = datetime.utcnow()
+
+        db = SessionLocal()
+        try:
+            # Evicted from the index but still in the table
+            crash_id = db.execute(
+                select(Crash.id).where(Crash.crash_hash == key).limit(1)
+            ).scalar()
+
+            if crash_id is None:
+                crash_id = str(uuid.uuid4())
+                sketch = minhash(
+                    crash_data.get("type"), crash_data.get("stack_trace"), signature=signature
+                )
+                cluster_id, created = self.clusters.assign(sketch, str(uuid.uuid4()))
+
+                db.add(Crash(
+                    id=crash_id,
+                    campaign_id=fuzzer.campaign_id,
+                    fuzzer_instance_id=fuzzer.id,
+                    crash_hash=key,
+                    signature=signature,
+                    minhash=to_bytes(sketch),
+                    cluster_id=cluster_id,
+                    crash_type=crash_data.get("type"),
+                    input_path=crash_data.get("input_path"),
+                    input_sha256=input_sha256,
+                    stack_trace=crash_data.get("stack_trace"),
+                    first_seen=now,
+                    last_seen=now,
+                    occurrences=1,
+                ))
+
+                if created:
+                    db.add(CrashCluster(
+                        id=cluster_id,
+                        representative_crash_id=crash_id,
+                        signature=signature,
+                        minhash=to_bytes(sketch),
+                    ))
+
+                try:
+                    db.commit()
+                except Exception:
+                    if created:
+                        self.clusters.discard(cluster_id)
+                    raise
+
+                is_new = True
+
+                if self.on_new is not None:
+                    self.on_new(crash_id, created, {
+                        "id": crash_id,
+                        "campaign_id": fuzzer.campaign_id,
+                        "fuzzer_id": fuzzer.id,
+                        "crash_type": crash_data.get("type"),
+                        "signature": signature,
+                        "cluster_id": cluster_id,
+                        "new_cluster": created,
+                        "first_seen": now.isoformat(),
+                    })
+            else:
+                is_new = False
+        finally:
+            db.close()
+
+        with self._lock:
+            self._index[key] = crash_id
+            while len(self._index) > self.max_size:
+                self._index.popitem(last=False)
+
+            if is_new:
+                self._inserted += 1
+            else:
+                self._add_pending(key, 1, now)
+
+        return is_new
+
+    # -----------------------------------------
+    # Flush Loop
+    # -----------------------------------------
 
     def run(self):
         while self._running:
-            try:
-                crashes = self.fuzzer.collect_crashes()
-                for crash in crashes:
-                    self._process_crash(crash)
-            except Exception as e:
-                print(f"[!] Crash collector error: {e}")
+            self._wake.wait(self.flush_interval)
+            self._flush()
+        self._flush()
 
-            time.sleep(self.interval)
-
-    def stop(self):
+    def stop(self, timeout: float = 5.0):
         self._running = False
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def _flush(self):
+        with self._flush_lock:
+            self._flush_pending()
+
+    def _flush_pending(self):
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+
+        started = time.perf_counter()
+
+        rows = [
+            {"b_hash": key, "b_count": count, "b_seen": last_seen}
+            for key, (count, last_seen) in pending.items()
+        ]
+
+        table = Crash.__table__
+        stmt = (
+            update(table)
+            .where(table.c.crash_hash == bindparam("b_hash"))
+            .values(
+                occurrences=table.c.occurrences + bindparam("b_count"),
+                last_seen=bindparam("b_seen"),
+            )
+        )
+
+        db = SessionLocal()
+        try:
+            db.execute(stmt, rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[!] Crash index flush failed ({len(rows)} hashes): {e}")
+            self._requeue(pending)
+            with self._lock:
+                self._flush_errors += 1
+            return
+        finally:
+            db.close()
+
+        with self._lock:
+            self._flushes += 1
+            self._rows_updated += len(rows)
+            self._last_flush_ms = (time.perf_counter() - started) * 1000.0
+
+    def rehash(self, batch):
+        """
+        Run batch() (a rebucket batch rewriting crash_hash and deleting
+        merged rows) with nothing pending and no flush in between, so
+        the rows it reads carry every count. batch() returns
+        (result, moved), moved mapping old crash_hash -> (new
+        crash_hash, crash id); index entries and counts that arrived
+        meanwhile are moved accordingly. Returns result.
+        """
+        with self._flush_lock:
+            self._flush_pending()
+            result, moved = batch()
+
+            with self._lock:
+                for old, (new, crash_id) in moved.items():
+                    if self._index.pop(old, None) is not None:
+                        self._index[new] = crash_id
+                    pending = self._pending.pop(old, None)
+                    if pending is not None:
+                        self._add_pending(new, *pending)
+
+        return result
+
+    def _requeue(self, pending: dict):
+        # Keep counts from a failed flush for the next one
+        with self._lock:
+            for key, (count, last_seen) in pending.items():
+                self._add_pending(key, count, last_seen)
 
     # -----------------------------------------
-    # Deduplication Logic
+    # Monitoring
     # -----------------------------------------
 
-    def _process_crash(self, crash_data):
-        crash_hash = self._generate_hash(crash_data)
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._index),
+                "capacity": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "inserted": self._inserted,
+                "pending_hashes": len(self._pending),
+                "flushes": self._flushes,
+                "flush_errors": self._flush_errors,
+                "rows_updated": self._rows_updated,
+                "last_flush_ms": self._last_flush_ms,
+            }
 
-        db = SessionLocal()
-        existing = db.query(Crash).filter_by(crash_hash=crash_hash).first()
 
-        if existing:
-            existing.occurrences += 1
-            existing.last_seen = datetime.utcnow()
+class CrashRebucket(threading.Thread):
+    """
+    Backfill: re-bucket existing crash rows with the current
+    signature engine.
+
+    Walks the crashes table in keyset batches (by id) so memory stays
+    bounded by batch size plus one entry per bucket. The first row
+    seen for a bucket becomes canonical and gets the new signature /
+    hash; later rows in the same bucket are folded into it
+    (occurrences summed, first/last seen widened) and deleted.
+    Canonical rows without a MinHash sketch are sketched and assigned
+    to a cluster. Rows inserted behind the cursor while it runs are
+    left for a re-run.
+    """
+
+    def __init__(self, clusters: CrashClusterIndex, batch_size: int = None,
+                 on_done=None, index: CrashIndex = None):
+        super().__init__(daemon=True, name="crash-rebucket")
+
+        cfg = get_config().get("collectors", {}).get("crashes", {})
+        self.batch_size = batch_size or cfg.get("rebucket_batch_size", 1000)
+        self.clusters = clusters
+        self.index = index
+        self.on_done = on_done
+
+        self._status = {
+            "state": "pending",
+            "scanned": 0,
+            "updated": 0,
+            "merged": 0,
+            "clustered": 0,
+            "buckets": 0,
+            "batches": 0,
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+        }
+        self._lock = threading.Lock()
+
+    def status(self) -> dict:
+        with self._lock:
+            return dict(self._status)
+
+    def _set(self, **fields):
+        with self._lock:
+            self._status.update(fields)
+
+    def run(self):
+        self._set(state="running", started_at=datetime.utcnow().isoformat())
+
+        try:
+            self._rebucket()
+        except Exception as e:
+            print(f"[!] Crash rebucket failed: {e}")
+            self._set(state="failed", error=str(e))
         else:
-            crash = Crash(
-                campaign_id=self.fuzzer.campaign_id,
-                fuzzer_instance_id=self.fuzzer.id,
-                crash_hash=crash_hash,
-                crash_type=crash_data.get("type"),
-                input_path=crash_data.get("input_path"),
-                stack_trace=crash_data.get("stack_trace"),
-                first_seen=datetime.utcnow(),
-                last_seen=datetime.utcnow(),
-                occurrences=1,
-            )
-            db.add(crash)
+            self._set(state="done")
+        finally:
+            self._set(finished_at=datetime.utcnow().isoformat())
+            if self.on_done:
+                self.on_done()
+
+    def _rebucket(self):
+        canonical = {}
+        last_id = ""
+
+        while True:
+            def batch():
+                return self._batch(last_id, canonical)
+
+            if self.index is not None:
+                rows, plan = self.index.rehash(batch)
+            else:
+                rows, plan = batch()[0]
+
+            if not rows:
+                return
 
-        db.commit()
-        db.close()
+            last_id = rows[-1].id
+            updated, merges, deleted, clustered, clusters, moved = plan
 
-    def _generate_hash(self, crash_data):
-        base = (
-            crash_data.get("type", "") +
-            crash_data.get("stack_trace", "")
+            with self._lock:
+                self._status["scanned"] += len(rows)
+                self._status["updated"] += len(updated)
+                self._status["merged"] += len(deleted)
+                self._status["clustered"] += len(clustered)
+                self._status["buckets"] = len(canonical)
+                self._status["batches"] += 1
+
+    def _batch(self, last_id: str, canonical: dict):
+        """
+        Read, plan and apply one batch after last_id.
+        Returns ((rows, plan), moved hashes).
+        """
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(
+                    Crash.id, Crash.crash_type, Crash.stack_trace,
+                    Crash.input_path, Crash.input_sha256, Crash.crash_hash,
+                    Crash.signature, Crash.occurrences,
+                    Crash.first_seen, Crash.last_seen, Crash.cluster_id,
+                )
+                .where(Crash.id > last_id)
+                .order_by(Crash.id)
+                .limit(self.batch_size)
+            ).all()
+
+            if not rows:
+                return (rows, None), {}
+
+            plan = self._plan_batch(rows, canonical)
+            updated, merges, deleted, clustered, clusters, moved = plan
+
+            try:
+                self._apply_batch(db, updated, merges, deleted, clustered, clusters)
+            except Exception:
+                for cluster in clusters:
+                    self.clusters.discard(cluster["id"])
+                raise
+        finally:
+            db.close()
+
+        return (rows, plan), moved
+
+    def _plan_batch(self, rows, canonical: dict):
+        updated = []
+        merges = {}
+        deleted = []
+        clustered = []
+        clusters = []
+        # old crash_hash -> (new crash_hash, surviving crash id)
+        moved = {}
+
+        for row in rows:
+            signature, key = bucket({
+                "type": row.crash_type,
+                "stack_trace": row.stack_trace,
+                "input_path": row.input_path,
+                "input_sha256": row.input_sha256,
+            })
+            target = canonical.get(key)
+
+            if target is None:
+                canonical[key] = row.id
+                if row.crash_hash != key or row.signature != signature:
+                    updated.append({"b_id": row.id, "b_hash": key, "b_sig": signature})
+                    moved[row.crash_hash] = (key, row.id)
+
+                if row.cluster_id is None:
+                    sketch = minhash(row.crash_type, row.stack_trace, signature=signature)
+                    cluster_id, created = self.clusters.assign(sketch, str(uuid.uuid4()))
+                    clustered.append({
+                        "b_id": row.id, "b_minhash": to_bytes(sketch), "b_cluster": cluster_id,
+                    })
+                    if created:
+                        clusters.append({
+                            "id": cluster_id,
+                            "representative_crash_id": row.id,
+                            "signature": signature,
+                            "minhash": to_bytes(sketch),
+                        })
+                continue
+
+            merge = merges.get(target)
+            if merge is None:
+                merge = merges[target] = {
+                    "b_id": target, "b_count": 0,
+                    "b_first": row.first_seen, "b_last": row.last_seen,
+                }
+
+            merge["b_count"] += row.occurrences or 1
+            if row.first_seen and (merge["b_first"] is None or row.first_seen < merge["b_first"]):
+                merge["b_first"] = row.first_seen
+            if row.last_seen and (merge["b_last"] is None or row.last_seen > merge["b_last"]):
+                merge["b_last"] = row.last_seen
+
+            deleted.append({"b_old": row.id, "b_new": target})
+            moved[row.crash_hash] = (key, target)
+
+        return updated, list(merges.values()), deleted, clustered, clusters, moved
+
+    def _apply_batch(self, db, updated, merges, deleted, clustered, clusters):
+        table = Crash.__table__
+
+        try:
+            if clusters:
+                db.execute(insert(CrashCluster), clusters)
+
+            if clustered:
+                db.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("b_id"))
+                    .values(minhash=bindparam("b_minhash"), cluster_id=bindparam("b_cluster")),
+                    clustered,
+                )
+
+            if updated:
+                db.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("b_id"))
+                    .values(crash_hash=bindparam("b_hash"), signature=bindparam("b_sig")),
+                    updated,
+                )
+
+            if merges:
+                # Relative update: live CrashIndex flushes may touch the same rows
+                db.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("b_id"))
+                    .values(
+                        occurrences=table.c.occurrences + bindparam("b_count"),
+                        first_seen=case(
+                            (table.c.first_seen > bindparam("b_first"), bindparam("b_first")),
+                            else_=table.c.first_seen,
+                        ),
+                        last_seen=case(
+                            (table.c.last_seen < bindparam("b_last"), bindparam("b_last")),
+                            else_=table.c.last_seen,
+                        ),
+                    ),
+                    merges,
+                )
+
+            if deleted:
+                # Clusters represented by a merged row now point at the survivor
+                clusters_table = CrashCluster.__table__
+                db.execute(
+                    update(clusters_table)
+                    .where(clusters_table.c.representative_crash_id == bindparam("b_old"))
+                    .values(representative_crash_id=bindparam("b_new")),
+                    deleted,
+                )
+                db.execute(delete(table).where(table.c.id.in_([d["b_old"] for d in deleted])))
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+
+class CrashCollector:
+    """
+    Periodic crash job for one fuzzer, run by CollectionScheduler.
+    """
+
+    def __init__(self, fuzzer, index: CrashIndex, state=None,
+                 interval: float = None):
+        self.fuzzer = fuzzer
+        self.index = index
+        self.state = state
+        self.interval = interval or fuzzer.config.get("crash_interval") or (
+            get_config().get("collectors", {}).get("crashes", {}).get("interval", 3)
         )
-        return hashlib.sha256(base.encode()).hexdigest()
+
+    def collect(self):
+        new = 0
+        try:
+            for crash in self.fuzzer.collect_crashes():
+                if self.index.record(self.fuzzer, crash):
+                    new += 1
+        except Exception as e:
+            print(f"[!] Crash collector error: {e}")
+        finally:
+            if new and self.state is not None:
+                self.state.add_crashes(self.fuzzer.id, new)
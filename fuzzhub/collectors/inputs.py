@@ -0,0 +1,412 @@
+"""
+File: fuzzhub/collectors/inputs.py
+
+Crash input ingestion.
+
+Every running fuzzer's crash directories (BaseFuzzer.crash_dirs) are
+watched through one DirectoryWatcher (inotify, polling fallback).
+Each new file is copied into the content-addressed InputStore by a
+small worker pool once it has stopped changing, so inputs survive the
+fuzzer's output directory being cleaned and identical inputs are kept
+once. New crash rows record their input's SHA-256
+(see CrashIndex); InputImport backfills older rows and imports
+existing crash directories.
+"""
+
+import os
+import select
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, select as sql_select, update
+
+from fuzzhub.database.session import SessionLocal
+from fuzzhub.database.models import Crash
+from fuzzhub.utils.config import get_config
+from fuzzhub.utils.files import file_signature
+from fuzzhub.utils.inotify import DirectoryWatcher
+from fuzzhub.utils.input_store import InputChanged, InputStore, get_input_store
+
+
+# Bookkeeping files fuzzers keep next to their crash inputs
+_SKIP_NAMES = {"README.txt", "HONGGFUZZ.REPORT.TXT"}
+
+
+def _is_input(path: str) -> bool:
+    name = os.path.basename(path)
+    return not name.startswith(".") and name not in _SKIP_NAMES
+
+
+def _config() -> dict:
+    return get_config().get("storage", {}).get("inputs", {})
+
+
+class CrashInputIngest(threading.Thread):
+    """
+    Watches crash directories and stores new inputs by content.
+    """
+
+    def __init__(self, store: InputStore = None, workers: int = None,
+                 force_polling: bool = None):
+        super().__init__(daemon=True, name="input-ingest")
+
+        cfg = _config()
+
+        self.store = store or get_input_store()
+        self.workers = workers or cfg.get("workers", 4)
+        self.poll_interval = cfg.get("poll_interval", 1.0)
+        self.cache_size = cfg.get("cache_size", 100000)
+
+        if force_polling is None:
+            force_polling = cfg.get("force_polling", False)
+
+        # The watcher is not thread-safe; every call goes through _lock
+        self._watcher = DirectoryWatcher(force_polling=force_polling)
+        self._lock = threading.Lock()
+        self._dirs: Dict[str, List[str]] = {}
+
+        # Files possibly still being written, retried next round
+        self._deferred: List[str] = []
+        # Files that changed while being stored (see ingest)
+        self._retry: List[str] = []
+
+        # path -> (file signature, sha256), least recently used first
+        self._known: "OrderedDict[str, tuple]" = OrderedDict()
+        self._known_lock = threading.Lock()
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="input-ingest"
+        )
+        self._running = True
+
+        self._ingested = 0
+        self._stored = 0
+        self._duplicates = 0
+        self._errors = 0
+        self._bytes_stored = 0
+        self._queued = 0
+        self._last_ingest_ms = None
+
+    # -----------------------------------------
+    # Watch Management
+    # -----------------------------------------
+
+    def watch(self, fuzzer):
+        dirs = list(fuzzer.crash_dirs())
+        if not dirs:
+            return
+
+        with self._lock:
+            self._dirs[fuzzer.id] = dirs
+            for path in dirs:
+                self._watcher.add(path)
+
+    def unwatch(self, fuzzer_id: str):
+        """
+        Stop watching a fuzzer's directories after picking up
+        whatever it wrote before it stopped.
+        """
+        with self._lock:
+            dirs = self._dirs.pop(fuzzer_id, None)
+            if not dirs:
+                return
+
+            paths = self._watcher.poll()
+            still_watched = {d for ds in self._dirs.values() for d in ds}
+            for path in dirs:
+                if path not in still_watched:
+                    self._watcher.remove(path)
+
+        self._submit(paths)
+
+    def watched_dirs(self) -> List[str]:
+        with self._lock:
+            return sorted({d for ds in self._dirs.values() for d in ds})
+
+    # -----------------------------------------
+    # Ingestion
+    # -----------------------------------------
+
+    def ingest(self, path: str) -> Optional[str]:
+        """
+        Store one input file; returns its SHA-256 (None if the file
+        is gone). Unchanged files already ingested are not re-read.
+        """
+        sig = file_signature(path)
+        if sig is None:
+            return None
+
+        with self._known_lock:
+            cached = self._known.get(path)
+            if cached is not None and cached[0] == sig:
+                self._known.move_to_end(path)
+                return cached[1]
+
+        started = time.perf_counter()
+        try:
+            sha256, size, new = self.store.put(path)
+        except FileNotFoundError:
+            return None
+        except InputChanged:
+            with self._known_lock:
+                self._retry.append(path)
+            return None
+        except OSError as e:
+            with self._known_lock:
+                self._errors += 1
+            print(f"[!] Input ingest failed for {path}: {e}")
+            return None
+
+        with self._known_lock:
+            self._known[path] = (sig, sha256)
+            self._known.move_to_end(path)
+            while len(self._known) > self.cache_size:
+                self._known.popitem(last=False)
+
+            self._ingested += 1
+            if new:
+                self._stored += 1
+                self._bytes_stored += size
+            else:
+                self._duplicates += 1
+            self._last_ingest_ms = (time.perf_counter() - started) * 1000.0
+
+        return sha256
+
+    def _ingest_queued(self, path: str):
+        try:
+            self.ingest(path)
+        finally:
+            with self._known_lock:
+                self._queued -= 1
+
+    def _submit(self, paths: List[str]):
+        paths = [p for p in paths if _is_input(p)]
+        if not paths:
+            return
+
+        with self._known_lock:
+            self._queued += len(paths)
+        for path in paths:
+            self._pool.submit(self._ingest_queued, path)
+
+    # -----------------------------------------
+    # Watch Loop
+    # -----------------------------------------
+
+    def run(self):
+        while self._running:
+            fd = self._watcher.fileno()
+            if fd is not None:
+                try:
+                    select.select([fd], [], [], self.poll_interval)
+                except (OSError, ValueError):
+                    time.sleep(self.poll_interval)
+            else:
+                time.sleep(self.poll_interval)
+
+            if not self._running:
+                break
+
+            with self._lock:
+                paths = self._watcher.poll()
+
+            with self._known_lock:
+                paths += self._retry
+                self._retry = []
+
+            self._submit(self._settled(paths))
+
+    def _settled(self, paths: List[str]) -> List[str]:
+        # Files listed by a scan (first watch, polling fallback, queue
+        # overflow) rather than reported by IN_CLOSE_WRITE may still be
+        # growing; only take files not modified for a poll interval
+        ready = []
+        waiting = []
+        cutoff = time.time_ns() - int(self.poll_interval * 1e9)
+
+        for path in self._deferred + paths:
+            sig = file_signature(path)
+            if sig is None:
+                continue
+            if sig[0] > cutoff:
+                waiting.append(path)
+            else:
+                ready.append(path)
+
+        self._deferred = waiting
+        return ready
+
+    def stop(self, timeout: float = 5.0):
+        self._running = False
+        if self.is_alive():
+            self.join(timeout)
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            self._watcher.close()
+
+    # -----------------------------------------
+    # Monitoring
+    # -----------------------------------------
+
+    def stats(self) -> dict:
+        with self._lock:
+            watched = len({d for ds in self._dirs.values() for d in ds})
+
+        with self._known_lock:
+            return {
+                "store": self.store.root,
+                "uses_inotify": self._watcher.uses_inotify,
+                "watched_dirs": watched,
+                "queued": self._queued,
+                "ingested": self._ingested,
+                "stored": self._stored,
+                "duplicates": self._duplicates,
+                "bytes_stored": self._bytes_stored,
+                "errors": self._errors,
+                "cached_paths": len(self._known),
+                "last_ingest_ms": self._last_ingest_ms,
+            }
+
+
+class InputImport(threading.Thread):
+    """
+    Backfill: store inputs that predate the ingest stage.
+
+    First imports every file under the given directories, then walks
+    crash rows without an input hash in keyset batches, stores their
+    input_path and writes the hash back with one executemany per
+    batch. Files are hashed and copied by a dedicated thread pool, so
+    a large import does not hold up live ingestion. Rows whose input
+    file no longer exists are counted as missing and left unset.
+    """
+
+    def __init__(self, ingest: CrashInputIngest, dirs: List[str] = None,
+                 workers: int = None, batch_size: int = None):
+        super().__init__(daemon=True, name="input-import")
+
+        cfg = _config()
+        self.ingest = ingest
+        self.dirs = [os.path.abspath(d) for d in (dirs or [])]
+        self.workers = workers or cfg.get("import_workers", 8)
+        self.batch_size = batch_size or cfg.get("import_batch_size", 1000)
+
+        self._status = {
+            "state": "pending",
+            "dirs": self.dirs,
+            "files": 0,
+            "rows_scanned": 0,
+            "rows_updated": 0,
+            "missing": 0,
+            "batches": 0,
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+        }
+        self._lock = threading.Lock()
+
+    def status(self) -> dict:
+        with self._lock:
+            return dict(self._status)
+
+    def _set(self, **fields):
+        with self._lock:
+            self._status.update(fields)
+
+    def _add(self, **counts):
+        with self._lock:
+            for key, value in counts.items():
+                self._status[key] += value
+
+    def run(self):
+        self._set(state="running", started_at=datetime.utcnow().isoformat())
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers,
+                                    thread_name_prefix="input-import") as pool:
+                self._import_dirs(pool)
+                self._backfill_rows(pool)
+        except Exception as e:
+            print(f"[!] Input import failed: {e}")
+            self._set(state="failed", error=str(e))
+        else:
+            self._set(state="done")
+        finally:
+            self._set(finished_at=datetime.utcnow().isoformat())
+
+    def _walk(self):
+        for root in self.dirs:
+            for dirpath, _, names in os.walk(root):
+                for name in names:
+                    path = os.path.join(dirpath, name)
+                    if _is_input(path):
+                        yield path
+
+    def _import_dirs(self, pool):
+        batch = []
+        for path in self._walk():
+            batch.append(path)
+            if len(batch) >= self.batch_size:
+                list(pool.map(self.ingest.ingest, batch))
+                self._add(files=len(batch))
+                batch = []
+
+        if batch:
+            list(pool.map(self.ingest.ingest, batch))
+            self._add(files=len(batch))
+
+    def _backfill_rows(self, pool):
+        table = Crash.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(input_sha256=bindparam("b_sha"))
+        )
+        last_id = ""
+
+        while True:
+            db = SessionLocal()
+            try:
+                rows = db.execute(
+                    sql_select(Crash.id, Crash.input_path)
+                    .where(
+                        Crash.id > last_id,
+                        Crash.input_sha256.is_(None),
+                        Crash.input_path.isnot(None),
+                    )
+                    .order_by(Crash.id)
+                    .limit(self.batch_size)
+                ).all()
+
+                if not rows:
+                    return
+
+                last_id = rows[-1].id
+                hashes = list(pool.map(self.ingest.ingest, [r.input_path for r in rows]))
+
+                updates = [
+                    {"b_id": row.id, "b_sha": sha256}
+                    for row, sha256 in zip(rows, hashes)
+                    if sha256 is not None
+                ]
+
+                if updates:
+                    try:
+                        db.execute(stmt, updates)
+                        db.commit()
+                    except Exception:
+                        db.rollback()
+                        raise
+            finally:
+                db.close()
+
+            self._add(
+                rows_scanned=len(rows),
+                rows_updated=len(updates),
+                missing=len(rows) - len(updates),
+                batches=1,
+            )
@@ -1,51 +1,185 @@
 """
 File: fuzzhub/collectors/metrics.py
 
-Metric collection thread for fuzzer instances.
+Metric collection job for fuzzer instances and the shared
+batched writer that persists their snapshots.
 """
 
+import queue
 import threading
 import time
 from datetime import datetime
 
+from sqlalchemy import insert
+
 from fuzzhub.database.session import SessionLocal
 from fuzzhub.database.models import MetricSnapshot
+from fuzzhub.utils.config import get_config
 
 
-class MetricsCollector(threading.Thread):
+class MetricsWriter(threading.Thread):
+    """
+    Single background writer for metric snapshots.
 
-    def __init__(self, fuzzer, interval: int = 5):
-        super().__init__(daemon=True)
-        self.fuzzer = fuzzer
-        self.interval = interval
+    Collectors enqueue rows with submit(); the writer drains the
+    bounded queue and flushes them with one bulk INSERT per batch,
+    either when batch_size rows are pending or flush_interval_ms
+    has elapsed since the first pending row.
+    """
+
+    def __init__(self, queue_size: int = None, batch_size: int = None,
+                 flush_interval_ms: int = None):
+        super().__init__(daemon=True, name="metrics-writer")
+
+        cfg = get_config().get("collectors", {}).get("metrics", {})
+
+        self.batch_size = batch_size or cfg.get("batch_size", 500)
+        self.flush_interval = (
+            flush_interval_ms or cfg.get("flush_interval_ms", 1000)
+        ) / 1000.0
+
+        self._queue = queue.Queue(
+            maxsize=queue_size or cfg.get("queue_size", 10000)
+        )
         self._running = True
 
+        self._stats_lock = threading.Lock()
+        self._dropped = 0
+        self._written = 0
+        self._flushes = 0
+        self._flush_errors = 0
+        self._last_flush_ms = None
+        self._max_flush_ms = 0.0
+
+    # -----------------------------------------
+    # Producer API
+    # -----------------------------------------
+
+    def submit(self, fuzzer_id: str, metrics: dict) -> bool:
+        """
+        Enqueue one snapshot without blocking.
+
+        Returns False (and counts the row as dropped) when the
+        queue is full.
+        """
+        row = {
+            "fuzzer_instance_id": fuzzer_id,
+            "exec_per_sec": metrics.get("exec_per_sec"),
+            "corpus_size": metrics.get("corpus_size"),
+            "coverage": metrics.get("coverage"),
+            "crashes_found": metrics.get("crashes_found"),
+            "timestamp": datetime.utcnow(),
+        }
+
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._stats_lock:
+                self._dropped += 1
+            return False
+
+        return True
+
+    # -----------------------------------------
+    # Writer Loop
+    # -----------------------------------------
+
     def run(self):
-        while self._running:
+        while self._running or not self._queue.empty():
+            batch = self._next_batch()
+            if batch:
+                self._flush(batch)
+
+    def stop(self, timeout: float = 5.0):
+        self._running = False
+        if self.is_alive():
+            self.join(timeout)
+
+    def _next_batch(self) -> list:
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
             try:
-                metrics = self.fuzzer.collect_metrics()
-                if metrics:
-                    self._persist(metrics)
-            except Exception as e:
-                print(f"[!] Metrics error: {e}")
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
 
-            time.sleep(self.interval)
+        return batch
 
-    def stop(self):
-        self._running = False
+    def _flush(self, batch: list):
+        started = time.perf_counter()
 
-    def _persist(self, metrics):
         db = SessionLocal()
+        try:
+            db.execute(insert(MetricSnapshot), batch)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[!] Metrics writer flush failed ({len(batch)} rows): {e}")
+            with self._stats_lock:
+                self._flush_errors += 1
+                self._dropped += len(batch)
+            return
+        finally:
+            db.close()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+        with self._stats_lock:
+            self._written += len(batch)
+            self._flushes += 1
+            self._last_flush_ms = elapsed_ms
+            self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
 
-        snapshot = MetricSnapshot(
-            fuzzer_instance_id=self.fuzzer.id,
-            exec_per_sec=metrics.get("exec_per_sec"),
-            corpus_size=metrics.get("corpus_size"),
-            coverage=metrics.get("coverage"),
-            crashes_found=metrics.get("crashes_found"),
-            timestamp=datetime.utcnow(),
+    # -----------------------------------------
+    # Monitoring
+    # -----------------------------------------
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "rows_written": self._written,
+                "rows_dropped": self._dropped,
+                "flushes": self._flushes,
+                "flush_errors": self._flush_errors,
+                "last_flush_ms": self._last_flush_ms,
+                "max_flush_ms": self._max_flush_ms,
+            }
+
+
+class MetricsCollector:
+    """
+    Periodic metrics job for one fuzzer, run by CollectionScheduler.
+    """
+
+    def __init__(self, fuzzer, writer: MetricsWriter, state=None,
+                 interval: float = None):
+        self.fuzzer = fuzzer
+        self.writer = writer
+        self.state = state
+        self.interval = interval or fuzzer.config.get("metrics_interval") or (
+            get_config().get("collectors", {}).get("metrics", {}).get("interval", 5)
         )
 
-        db.add(snapshot)
-        db.commit()
-        db.close()
+    def collect(self):
+        try:
+            metrics = self.fuzzer.collect_metrics()
+            if metrics:
+                self._persist(metrics)
+        except Exception as e:
+            print(f"[!] Metrics error: {e}")
+
+    def _persist(self, metrics):
+        if self.state is not None:
+            self.state.update_metrics(self.fuzzer.id, metrics)
+        self.writer.submit(self.fuzzer.id, metrics)
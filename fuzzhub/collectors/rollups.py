@@ -0,0 +1,362 @@
+"""
+File: fuzzhub/collectors/rollups.py
+
+Time-series compaction for metric snapshots.
+
+Raw snapshots are rolled up into 1-minute buckets, 1-minute buckets
+into 15-minute buckets and 15-minute buckets into 1-hour buckets.
+Each bucket keeps min/max/avg/last per metric. Rows that have been
+compacted are expired according to the configured retention.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select
+
+from fuzzhub.database.session import SessionLocal
+from fuzzhub.database.models import (
+    MetricSnapshot,
+    MetricRollup1m,
+    MetricRollup15m,
+    MetricRollup1h,
+)
+from fuzzhub.utils.config import get_config
+
+
+METRIC_FIELDS = ("exec_per_sec", "corpus_size", "coverage", "crashes_found")
+
+# (name, model, source model) ordered finest to coarsest
+TIERS = (
+    ("1m", MetricRollup1m, MetricSnapshot),
+    ("15m", MetricRollup15m, MetricRollup1m),
+    ("1h", MetricRollup1h, MetricRollup15m),
+)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _floor(ts: datetime, seconds: int) -> datetime:
+    offset = int((ts - _EPOCH).total_seconds()) // seconds * seconds
+    return _EPOCH + timedelta(seconds=offset)
+
+
+# -------------------------------------------------
+# Bucket Aggregation
+# -------------------------------------------------
+
+class _Bucket:
+
+    def __init__(self, fuzzer_id: str, bucket_start: datetime):
+        self.fuzzer_id = fuzzer_id
+        self.bucket_start = bucket_start
+        self.samples = 0
+        self._min = {}
+        self._max = {}
+        self._sum = {}
+        self._weight = {}
+        self._last = {}
+
+    def add(self, samples: int, values: dict):
+        """
+        Merge one source row.
+
+        `values` maps field -> (min, max, avg, last); raw snapshots
+        pass the same value for all four with samples=1.
+        """
+        self.samples += samples
+
+        for field, (lo, hi, avg, last) in values.items():
+            if last is None:
+                continue
+
+            if field in self._min:
+                self._min[field] = min(self._min[field], lo)
+                self._max[field] = max(self._max[field], hi)
+            else:
+                self._min[field] = lo
+                self._max[field] = hi
+
+            self._sum[field] = self._sum.get(field, 0.0) + avg * samples
+            self._weight[field] = self._weight.get(field, 0) + samples
+            self._last[field] = last
+
+    def row(self) -> dict:
+        row = {
+            "fuzzer_instance_id": self.fuzzer_id,
+            "bucket_start": self.bucket_start,
+            "samples": self.samples,
+        }
+
+        for field in METRIC_FIELDS:
+            weight = self._weight.get(field)
+            row[f"{field}_min"] = self._min.get(field)
+            row[f"{field}_max"] = self._max.get(field)
+            row[f"{field}_avg"] = self._sum[field] / weight if weight else None
+            row[f"{field}_last"] = self._last.get(field)
+
+        return row
+
+
+def _source_values(source, row):
+    if source is MetricSnapshot:
+        samples = 1
+        values = {}
+        for field in METRIC_FIELDS:
+            v = getattr(row, field)
+            values[field] = (v, v, v, v)
+        return row.timestamp, samples, values
+
+    values = {
+        field: (
+            getattr(row, f"{field}_min"),
+            getattr(row, f"{field}_max"),
+            getattr(row, f"{field}_avg"),
+            getattr(row, f"{field}_last"),
+        )
+        for field in METRIC_FIELDS
+    }
+    return row.bucket_start, row.samples or 1, values
+
+
+def _time_column(model):
+    if model is MetricSnapshot:
+        return MetricSnapshot.timestamp
+    return model.bucket_start
+
+
+# -------------------------------------------------
+# Rollup Job
+# -------------------------------------------------
+
+class MetricsRollup(threading.Thread):
+    """
+    Periodic compaction and retention job.
+
+    Every pass rolls each tier forward from its watermark to the
+    last fully closed bucket (minus a grace period for rows still
+    sitting in the writer queue), then expires rows that are both
+    past retention and already compacted into the next tier.
+    """
+
+    def __init__(self, interval: int = None):
+        super().__init__(daemon=True, name="metrics-rollup")
+
+        cfg = get_config().get("collectors", {}).get("rollups", {})
+
+        self.interval = interval or cfg.get("interval", 60)
+        self.grace = timedelta(seconds=cfg.get("grace_seconds", 30))
+        self.batch_size = cfg.get("batch_size", 1000)
+
+        self.retention = retention_config()
+
+        self._watermarks = {}
+        self._running = True
+
+    def run(self):
+        while self._running:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"[!] Metrics rollup error: {e}")
+
+            time.sleep(self.interval)
+
+    def stop(self):
+        self._running = False
+
+    def run_once(self, now: datetime = None):
+        now = now or datetime.utcnow()
+
+        for name, model, source in TIERS:
+            self._compact(name, model, source, now)
+
+        self._expire(now)
+
+    # -----------------------------------------
+    # Compaction
+    # -----------------------------------------
+
+    def _compact(self, name, model, source, now):
+        resolution = model.resolution_seconds
+        end = _floor(now - self.grace, resolution)
+        source_ts = _time_column(source)
+
+        db = SessionLocal()
+        try:
+            start = self._watermarks.get(name)
+
+            if start is None:
+                latest = db.execute(select(func.max(model.bucket_start))).scalar()
+                if latest is not None:
+                    start = latest + timedelta(seconds=resolution)
+                else:
+                    earliest = db.execute(select(func.min(source_ts))).scalar()
+                    if earliest is None:
+                        return
+                    start = _floor(earliest, resolution)
+
+            if start >= end:
+                return
+
+            rows = db.execute(
+                select(source)
+                .where(source_ts >= start, source_ts < end)
+                .order_by(source.fuzzer_instance_id, source_ts)
+                .execution_options(yield_per=self.batch_size)
+            ).scalars()
+
+            pending = []
+            bucket = None
+
+            for row in rows:
+                ts, samples, values = _source_values(source, row)
+                bucket_start = _floor(ts, resolution)
+
+                if (bucket is None
+                        or bucket.fuzzer_id != row.fuzzer_instance_id
+                        or bucket.bucket_start != bucket_start):
+                    if bucket is not None:
+                        pending.append(bucket.row())
+                    bucket = _Bucket(row.fuzzer_instance_id, bucket_start)
+
+                bucket.add(samples, values)
+
+                if len(pending) >= self.batch_size:
+                    db.execute(insert(model), pending)
+                    pending = []
+
+            if bucket is not None:
+                pending.append(bucket.row())
+            if pending:
+                db.execute(insert(model), pending)
+
+            # One transaction per tier pass keeps the watermark exact
+            db.commit()
+            self._watermarks[name] = end
+
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # -----------------------------------------
+    # Retention
+    # -----------------------------------------
+
+    def _expire(self, now):
+        db = SessionLocal()
+        try:
+            # Raw rows only go once the 1m tier has covered them
+            self._expire_model(db, MetricSnapshot, "raw", "1m", now)
+
+            for (name, model, _), (next_name, _, _) in zip(TIERS, TIERS[1:]):
+                self._expire_model(db, model, name, next_name, now)
+
+            name, model, _ = TIERS[-1]
+            self._expire_model(db, model, name, None, now)
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _expire_model(self, db, model, name, covered_by, now):
+        retention = self.retention.get(name)
+        if retention is None:
+            return
+
+        cutoff = now - retention
+
+        if covered_by is not None:
+            watermark = self._watermarks.get(covered_by)
+            if watermark is None:
+                return
+            cutoff = min(cutoff, watermark)
+
+        db.execute(delete(model).where(_time_column(model) < cutoff))
+
+
+def _hours(value):
+    return timedelta(hours=value) if value is not None else None
+
+
+def _days(value):
+    return timedelta(days=value) if value is not None else None
+
+
+def retention_config() -> dict:
+    """
+    Tier name -> timedelta (None keeps rows forever).
+    """
+    retention = (
+        get_config().get("collectors", {}).get("rollups", {}).get("retention", {})
+    )
+    return {
+        "raw": _hours(retention.get("raw_hours", 24)),
+        "1m": _days(retention.get("1m_days", 7)),
+        "15m": _days(retention.get("15m_days", 90)),
+        "1h": _days(retention.get("1h_days")),
+    }
+
+
+# -------------------------------------------------
+# History Queries
+# -------------------------------------------------
+
+def query_history(db, fuzzer_id: str, start: datetime, end: datetime,
+                  max_points: int = 500, now: datetime = None):
+    """
+    Return (resolution, points) for one fuzzer between start and end.
+
+    Tiers are tried finest first; a tier is skipped when its
+    retention no longer reaches back to `start` or when it would
+    return more than `max_points` buckets. The coarsest tier is
+    always the fallback.
+    """
+    retention = retention_config()
+    raw_interval = get_config().get("collectors", {}).get("metrics", {}).get("interval", 5)
+
+    now = now or datetime.utcnow()
+    span = max((end - start).total_seconds(), 0)
+
+    candidates = [("raw", MetricSnapshot, raw_interval, retention["raw"])]
+    for name, model, _ in TIERS:
+        candidates.append((name, model, model.resolution_seconds, retention[name]))
+
+    chosen = candidates[-1]
+    for candidate in candidates:
+        _, _, resolution, keep = candidate
+        if keep is not None and start < now - keep:
+            continue
+        if span / resolution > max_points:
+            continue
+        chosen = candidate
+        break
+
+    name, model, _, _ = chosen
+    ts_col = _time_column(model)
+
+    rows = db.execute(
+        select(model)
+        .where(
+            model.fuzzer_instance_id == fuzzer_id,
+            ts_col >= start,
+            ts_col < end,
+        )
+        .order_by(ts_col)
+    ).scalars()
+
+    points = []
+    for row in rows:
+        ts, samples, values = _source_values(model, row)
+        point = {"timestamp": ts.isoformat(), "samples": samples}
+        for field, (lo, hi, avg, last) in values.items():
+            point[field] = {"min": lo, "max": hi, "avg": avg, "last": last}
+        points.append(point)
+
+    return name, points
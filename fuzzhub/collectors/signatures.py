@@ -0,0 +1,245 @@
+"""
+File: fuzzhub/collectors/signatures.py
+
+Crash signature engine.
+
+Raw sanitizer and debugger output differs between two hits of the
+same bug (ASLR addresses, PIDs, thread ids, offsets, line numbers).
+A signature keeps only what identifies the bug: the crash type and
+the top N symbolized frames of the crashing stack, with addresses,
+offsets, arguments and source locations removed and sanitizer /
+runtime frames skipped.
+
+Understands ASan/MSan/TSan/LSan and UBSan reports, libFuzzer
+deadly-signal reports and gdb backtraces. Traces without
+recognizable frames fall back to their first line with numbers
+masked. Crashes reported with no trace at all (AFL until triage runs)
+are bucketed per input: their signature carries the input's SHA-256.
+"""
+
+import hashlib
+import os
+import re
+from typing import List, Optional
+
+from fuzzhub.utils.config import get_config
+
+
+_SIGNATURE_MAX = 1024
+
+# #3 0x55d0c1a2b3c4 in png_read_row /src/libpng/pngread.c:512:7
+# #4 0x7f1e2d3c4b5a  (/lib/x86_64-linux-gnu/libc.so.6+0x29d90)
+_SANITIZER_FRAME = re.compile(
+    r"^\s*#(\d+)\s+0x[0-9a-fA-F]+(?:\s+in\s+(.*?))?"
+    r"(?:\s+\(([^()\s]+?)(?:\+0x[0-9a-fA-F]+)?\))?\s*$"
+)
+
+# Trailing source location: /src/a.c:12:7, a.c:12, ../x/y.c
+_LOCATION = re.compile(r"\s+\S*(?:/|:\d+)\S*$")
+
+# #0  0x00007ffff7a42428 in __GI_raise (sig=sig@entry=6) at ../raise.c:54
+# #1  parse_header (buf=0x0) at src/parse.c:88
+# #2  0x000055555555513d in main ()
+_GDB_FRAME = re.compile(
+    r"^\s*#(\d+)\s+(?:0x[0-9a-fA-F]+\s+in\s+)?([^\s(]+)\s*\(.*?\)(?:\s+(?:at|from)\s+(\S+))?\s*$"
+)
+
+# ==1234==ERROR: AddressSanitizer: heap-buffer-overflow on address ...
+_SANITIZER_ERROR = re.compile(r"ERROR:\s*\w+Sanitizer:\s*([\w-]+)")
+_ACCESS = re.compile(r"^(READ|WRITE) of size \d+")
+
+# src/a.c:12:5: runtime error: signed integer overflow: ...
+_UBSAN = re.compile(r"(\S+?):\d+(?::\d+)?: runtime error: ([^:0-9]+)")
+
+# Sections after the crashing stack (allocation/free stacks, summary)
+_STACK_END = re.compile(
+    r"^(?:\s*$|freed by thread|previously allocated by|"
+    r"allocated by thread|SUMMARY:|Thread T\d+ created by|Shadow bytes)"
+)
+
+_NOISE_PREFIXES = (
+    "__asan", "__ubsan", "__msan", "__tsan", "__lsan", "__sanitizer",
+    "__interceptor_", "___interceptor_", "__hwasan", "fuzzer::",
+    "__gi_", "__libc_", "__pthread_", "__assert_fail", "_start",
+    "std::__terminate",
+)
+
+_NOISE_NAMES = {
+    "raise", "abort", "__abort", "pthread_kill", "gsignal",
+    "__restore_rt", "__kernel_vsyscall", "__cxa_throw", "__cxa_rethrow",
+    "__assert_rtn", "__assert", "malloc", "calloc", "realloc", "free",
+    "operator new", "operator new[]", "operator delete", "operator delete[]",
+}
+
+_HEX = re.compile(r"0x[0-9a-fA-F]+")
+_NUMBER = re.compile(r"\b\d+\b")
+
+
+# -------------------------------------------------
+# Frame Parsing
+# -------------------------------------------------
+
+def _clean_function(name: str) -> str:
+    name = _LOCATION.sub("", name.strip())
+    name = name.replace("(anonymous namespace)", "{anonymous}")
+    name = name.replace("operator()", "operator\0")
+
+    # Drop the parameter list: foo(int, char*) const -> foo
+    depth = 0
+    for i, ch in enumerate(name):
+        if ch == "<":
+            depth += 1
+        elif ch == ">":
+            depth = max(0, depth - 1)
+        elif ch == "(" and depth == 0:
+            name = name[:i]
+            break
+
+    name = name.replace("operator\0", "operator()")
+
+    # Compiler clones: foo.cold, foo.isra.0, foo.constprop.3
+    name = re.sub(r"\.(?:cold|isra|constprop|part|lto_priv)(?:\.\d+)?$", "", name)
+    return name.strip()
+
+
+def _module_name(module: Optional[str]) -> str:
+    if not module:
+        return "?"
+    return module.rsplit("/", 1)[-1] or "?"
+
+
+def _is_noise(function: str) -> bool:
+    lowered = function.lower()
+    return function in _NOISE_NAMES or lowered.startswith(_NOISE_PREFIXES)
+
+
+def extract_frames(stack_trace: str) -> List[str]:
+    """
+    Normalized frames of the first (crashing) stack in a trace.
+    """
+    frames = []
+    started = False
+    last_index = -1
+
+    for line in stack_trace.splitlines():
+        match = _SANITIZER_FRAME.match(line)
+        if match:
+            index, function, module = match.groups()
+        else:
+            match = _GDB_FRAME.match(line)
+            if not match:
+                if started and _STACK_END.match(line):
+                    break
+                continue
+            index, function, module = match.groups()
+
+        index = int(index)
+        if started and index <= last_index:
+            # Frame numbering restarted: a second stack begins
+            break
+        started = True
+        last_index = index
+
+        if function and function != "??":
+            function = _clean_function(function)
+            if _is_noise(function):
+                continue
+            frames.append(function)
+        else:
+            # Unsymbolized: only the module survives normalization
+            frames.append(f"?@{_module_name(module)}")
+
+    return frames
+
+
+# -------------------------------------------------
+# Signatures
+# -------------------------------------------------
+
+def crash_kind(crash_type: Optional[str], stack_trace: str) -> str:
+    """
+    Crash type, refined from the report where it says more.
+    """
+    kind = None
+
+    for line in stack_trace.splitlines():
+        if kind is None:
+            error = _SANITIZER_ERROR.search(line)
+            if error:
+                kind = error.group(1)
+                continue
+
+            ubsan = _UBSAN.search(line)
+            if ubsan:
+                return "ubsan:" + ubsan.group(2).strip().replace(" ", "-")
+        else:
+            # heap-buffer-overflow + READ/WRITE
+            access = _ACCESS.match(line.strip())
+            if access:
+                return f"{kind}-{access.group(1).lower()}"
+            if _SANITIZER_FRAME.match(line):
+                break
+
+    return kind or (crash_type or "unknown").strip()
+
+
+def crash_signature(crash_type: Optional[str], stack_trace: Optional[str],
+                    frames: int = None) -> str:
+    """
+    Normalized signature: "<type>|<frame>|<frame>|...".
+    """
+    if frames is None:
+        frames = (
+            get_config().get("collectors", {}).get("crashes", {}).get("signature_frames", 5)
+        )
+
+    stack_trace = stack_trace or ""
+    kind = crash_kind(crash_type, stack_trace)
+    top = extract_frames(stack_trace)[:frames]
+
+    if not top:
+        ubsan = _UBSAN.search(stack_trace)
+        if ubsan:
+            top = [_module_name(ubsan.group(1))]
+        else:
+            first = next((l.strip() for l in stack_trace.splitlines() if l.strip()), "")
+            if first:
+                top = [_NUMBER.sub("N", _HEX.sub("0x", first))]
+
+    return "|".join([kind] + top)[:_SIGNATURE_MAX]
+
+
+def _input_key(crash_data: dict) -> Optional[str]:
+    sha256 = crash_data.get("input_sha256")
+    if sha256:
+        return sha256
+
+    path = crash_data.get("input_path")
+    if not path:
+        return None
+
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        # Input gone: its file name (AFL's id:...) still tells it apart
+        return os.path.basename(path)
+    return digest.hexdigest()
+
+
+def bucket(crash_data: dict):
+    """
+    (signature, crash_hash) for a reported crash.
+    """
+    stack_trace = crash_data.get("stack_trace")
+    signature = crash_signature(crash_data.get("type"), stack_trace)
+
+    # The type alone (e.g. signal_11) would merge unrelated bugs
+    if not (stack_trace or "").strip():
+        key = _input_key(crash_data)
+        if key:
+            signature = f"{signature}|input:{key}"[:_SIGNATURE_MAX]
+
+    return signature, hashlib.sha256(signature.encode()).hexdigest()
@@ -0,0 +1,454 @@
+"""
+File: fuzzhub/core/allocator.py
+
+Adaptive core reallocation across campaigns.
+
+Every round the allocator samples each campaign's progress from the
+same sources the metric stream feeds: merged edge coverage from the
+CoverageAggregator (falling back to the best instance "coverage"
+metric) and unique corpus entries from CorpusSync (falling back to
+the largest instance corpus). Their growth over the last `window`
+seconds, divided by the campaign's instance count, is the reward of
+one core spent on that campaign.
+
+Campaigns are treated as arms of a discounted UCB bandit: a core-round
+is a pull, old rewards decay by `discount` per round, and campaigns
+running few instances get an exploration bonus because their estimate
+is noisier. Each round, within per-campaign min/max instance bounds:
+
+    grow    free cores go to the highest-scoring campaign
+    move    otherwise one instance of the lowest-scoring campaign is
+            stopped and one started for the highest-scoring campaign,
+            if the gap exceeds `margin`
+
+Campaigns that just changed size sit out `cooldown` seconds so the new
+instance has time to ramp up. Every action is emitted on the event
+bus as "allocator_decision" and kept in a bounded log for GET /allocator.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from fuzzhub.utils.config import get_config
+
+
+class _Arm:
+
+    def __init__(self):
+        # (time, edges, paths)
+        self.samples = deque()
+        self.source = None
+
+        # Discounted core-rounds and reward sum
+        self.pulls = 0.0
+        self.reward_sum = 0.0
+
+        self.last_reward = None
+        self.edges_per_hour = None
+        self.paths_per_hour = None
+        self.cooldown_until = 0.0
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.reward_sum / self.pulls if self.pulls else None
+
+
+class CoreAllocator(threading.Thread):
+    """
+    Bandit-driven instance rebalancing layered on CampaignManager.
+    """
+
+    def __init__(self, manager, event_bus):
+        super().__init__(daemon=True, name="core-allocator")
+
+        cfg = get_config().get("allocator", {})
+
+        self.manager = manager
+        self._bus = event_bus
+
+        self.enabled = cfg.get("enabled", False)
+        self.interval = cfg.get("interval", 300)
+        self.window = cfg.get("window", 1800)
+        self.cooldown = cfg.get("cooldown", 900)
+        self.min_instances = cfg.get("min_instances", 1)
+        self.max_instances = cfg.get("max_instances", 8)
+        self.limits = cfg.get("campaigns", {}) or {}
+
+        self.discount = cfg.get("discount", 0.8)
+        self.exploration = cfg.get("exploration", 0.5)
+        self.coverage_weight = cfg.get("coverage_weight", 0.7)
+        self.margin = cfg.get("margin", 0.25)
+        self.max_moves = cfg.get("max_moves", 1)
+        self.grow_into_free = cfg.get("grow_into_free", True)
+
+        self._lock = threading.Lock()
+        self._arms: Dict[str, _Arm] = {}
+        self._decisions = deque(maxlen=cfg.get("history", 200))
+
+        self._running = True
+        self._wake = threading.Event()
+
+        self._rounds = 0
+        self._actions = 0
+        self._errors = 0
+        self._last_round_at = None
+
+    # -----------------------------------------
+    # Loop
+    # -----------------------------------------
+
+    def run(self):
+        while self._running:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if not self._running:
+                break
+            if self.enabled:
+                try:
+                    self.step()
+                except Exception as e:
+                    self._errors += 1
+                    print(f"[!] Allocator round failed: {e}")
+
+    def stop(self, timeout: float = 5.0):
+        self._running = False
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run_now(self):
+        self._wake.set()
+
+    def step(self):
+        """
+        One round: sample progress, update the bandit, rebalance.
+        """
+        now = time.time()
+        campaigns = self._instances()
+
+        with self._lock:
+            for campaign_id in list(self._arms):
+                if campaign_id not in campaigns:
+                    del self._arms[campaign_id]
+
+            for campaign_id, entries in campaigns.items():
+                arm = self._arms.setdefault(campaign_id, _Arm())
+                self._sample(arm, campaign_id, entries, now)
+
+            self._update_rewards(campaigns)
+            scores = self._scores()
+
+            self._rounds += 1
+            self._last_round_at = now
+
+        self._rebalance(campaigns, scores, now)
+
+    # -----------------------------------------
+    # Progress Sampling
+    # -----------------------------------------
+
+    def _instances(self) -> Dict[str, List[dict]]:
+        campaigns = {}
+        for entry in self.manager.state.list():
+            if entry["campaign_id"] and entry["state"] in ("running", "queued"):
+                campaigns.setdefault(entry["campaign_id"], []).append(entry)
+        return campaigns
+
+    def _sample(self, arm: _Arm, campaign_id: str, entries: List[dict], now: float):
+        coverage = self.manager.campaign_coverage(campaign_id)
+        corpus = self.manager.campaign_corpus(campaign_id)
+
+        if coverage:
+            edges = coverage["unique_edges"]
+        else:
+            edges = max((e["coverage"] or 0 for e in entries), default=0)
+        if corpus:
+            paths = corpus["unique_entries"]
+        else:
+            paths = max((e["corpus_size"] or 0 for e in entries), default=0)
+
+        # Rates are only comparable within one source
+        source = (coverage is not None, corpus is not None)
+        if source != arm.source:
+            arm.samples.clear()
+            arm.source = source
+
+        arm.samples.append((now, edges, paths))
+        while len(arm.samples) > 2 and now - arm.samples[1][0] >= self.window:
+            arm.samples.popleft()
+
+        first, last = arm.samples[0], arm.samples[-1]
+        elapsed = last[0] - first[0]
+        if elapsed <= 0:
+            arm.edges_per_hour = arm.paths_per_hour = None
+            return
+
+        arm.edges_per_hour = max(0, last[1] - first[1]) * 3600.0 / elapsed
+        arm.paths_per_hour = max(0, last[2] - first[2]) * 3600.0 / elapsed
+
+    def _update_rewards(self, campaigns: Dict[str, List[dict]]):
+        measured = {
+            cid: arm for cid, arm in self._arms.items()
+            if arm.edges_per_hour is not None
+        }
+        if not measured:
+            return
+
+        def per_core(cid, rate):
+            return rate / max(1, len(campaigns[cid]))
+
+        top_edges = max(per_core(c, a.edges_per_hour) for c, a in measured.items())
+        top_paths = max(per_core(c, a.paths_per_hour) for c, a in measured.items())
+
+        for cid, arm in measured.items():
+            edges = per_core(cid, arm.edges_per_hour) / top_edges if top_edges else 0.0
+            paths = per_core(cid, arm.paths_per_hour) / top_paths if top_paths else 0.0
+            reward = self.coverage_weight * edges + (1 - self.coverage_weight) * paths
+
+            cores = len(campaigns[cid])
+            arm.pulls = self.discount * arm.pulls + cores
+            arm.reward_sum = self.discount * arm.reward_sum + reward * cores
+            arm.last_reward = reward
+
+    def _scores(self) -> Dict[str, float]:
+        total = sum(arm.pulls for arm in self._arms.values())
+        scores = {}
+        for cid, arm in self._arms.items():
+            if not arm.pulls:
+                continue
+            bonus = self.exploration * math.sqrt(math.log(max(total, 1.0)) / arm.pulls)
+            scores[cid] = arm.mean + bonus
+        return scores
+
+    # -----------------------------------------
+    # Rebalancing
+    # -----------------------------------------
+
+    def _bounds(self, campaign_id: str):
+        limits = self.limits.get(campaign_id, {})
+        return (
+            limits.get("min_instances", self.min_instances),
+            limits.get("max_instances", self.max_instances),
+        )
+
+    def _rebalance(self, campaigns: Dict[str, List[dict]], scores: Dict[str, float],
+                   now: float):
+        counts = {cid: len(entries) for cid, entries in campaigns.items()}
+        touched = set()
+        moves = 0
+
+        # Hard bounds first, regardless of scores
+        for cid, entries in campaigns.items():
+            low, high = self._bounds(cid)
+            while counts[cid] > high:
+                stopped = self._shrink(cid, entries, scores, "above max_instances")
+                if stopped is None:
+                    break
+                entries = [e for e in entries if e["id"] != stopped]
+                counts[cid] -= 1
+                touched.add(cid)
+            if counts[cid] < low and self._free_cores() > 0:
+                if self._grow(cid, entries, scores, "below min_instances"):
+                    counts[cid] += 1
+                    touched.add(cid)
+
+        with self._lock:
+            ready = {
+                cid for cid in campaigns
+                if cid in scores and cid not in touched
+                and self._arms[cid].cooldown_until <= now
+            }
+
+        recipients = sorted(
+            (cid for cid in ready if counts[cid] < self._bounds(cid)[1]),
+            key=lambda cid: -scores[cid],
+        )
+        donors = sorted(
+            (cid for cid in ready if counts[cid] > self._bounds(cid)[0]),
+            key=lambda cid: scores[cid],
+        )
+
+        for best in recipients:
+            if moves >= self.max_moves:
+                break
+
+            if self.grow_into_free and self._free_cores() > 0:
+                if self._grow(best, campaigns[best], scores, "free cores"):
+                    touched.add(best)
+                    moves += 1
+                continue
+
+            donor = next((d for d in donors if d != best and d not in touched), None)
+            if donor is None:
+                break
+            if scores[donor] >= scores[best] * (1 - self.margin):
+                break
+
+            stopped = self._shrink(
+                donor, campaigns[donor], scores, f"stagnant relative to {best}",
+                to_campaign=best,
+            )
+            if stopped is None:
+                continue
+            touched.add(donor)
+            if self._grow(best, campaigns[best], scores, f"productive relative to {donor}",
+                          from_campaign=donor):
+                touched.add(best)
+            moves += 1
+
+        with self._lock:
+            for cid in touched:
+                arm = self._arms.get(cid)
+                if arm:
+                    # Measure the new size from scratch once it has ramped up
+                    arm.samples.clear()
+                    arm.source = None
+                    arm.cooldown_until = now + self.cooldown
+
+    def _free_cores(self) -> int:
+        return self.manager.free_cores()
+
+    def _template(self, entries: List[dict]):
+        # The oldest live instance of the campaign that can be cloned
+        for entry in sorted(entries, key=lambda e: -self._uptime(e["id"])):
+            fuzzer = self.manager.live_fuzzer(entry["id"])
+            scale = getattr(fuzzer, "scale_config", None)
+            if scale is None:
+                continue
+            config = scale()
+            if config is not None:
+                return entry["fuzzer_type"], config
+        return None
+
+    def _uptime(self, fuzzer_id: str) -> float:
+        fuzzer = self.manager.live_fuzzer(fuzzer_id)
+        if fuzzer is None:
+            return 0.0
+        return fuzzer.status().get("uptime_seconds") or 0.0
+
+    def _victim(self, campaign_id: str, entries: List[dict]) -> Optional[str]:
+        # Queued starts first, then the instance adding the fewest edges
+        # nobody else has; never the campaign's oldest instance
+        queued = [e["id"] for e in entries if e["state"] == "queued"]
+        if queued:
+            return queued[-1]
+
+        running = sorted(entries, key=lambda e: -self._uptime(e["id"]))[1:]
+        if not running:
+            return None
+
+        coverage = self.manager.campaign_coverage(campaign_id) or {}
+        marginal = coverage.get("instances", {})
+        running.sort(key=lambda e: (
+            marginal.get(e["id"], {}).get("unique_edges", 0),
+            self._uptime(e["id"]),
+        ))
+        return running[0]["id"]
+
+    def _grow(self, campaign_id: str, entries: List[dict], scores: Dict[str, float],
+              reason: str, from_campaign: str = None) -> bool:
+        template = self._template(entries)
+        if template is None:
+            return False
+
+        fuzzer_type, config = template
+        decision = {
+            "action": "move" if from_campaign else "grow",
+            "campaign_id": campaign_id,
+            "from_campaign_id": from_campaign,
+            "fuzzer_type": fuzzer_type,
+            "reason": reason,
+        }
+        try:
+            decision["fuzzer_id"] = self.manager.start_fuzzer(campaign_id, fuzzer_type, config)
+        except Exception as e:
+            decision["error"] = str(e)
+
+        self._record(decision, scores)
+        return "error" not in decision
+
+    def _shrink(self, campaign_id: str, entries: List[dict], scores: Dict[str, float],
+                reason: str, to_campaign: str = None) -> Optional[str]:
+        victim = self._victim(campaign_id, entries)
+        if victim is None:
+            return None
+
+        decision = {
+            "action": "shrink",
+            "campaign_id": campaign_id,
+            "to_campaign_id": to_campaign,
+            "stopped_fuzzer_id": victim,
+            "reason": reason,
+        }
+        try:
+            self.manager.stop_fuzzer(victim)
+        except Exception as e:
+            decision["error"] = str(e)
+
+        self._record(decision, scores)
+        return None if "error" in decision else victim
+
+    def _record(self, decision: dict, scores: Dict[str, float]):
+        with self._lock:
+            decision["at"] = time.time()
+            decision["scores"] = {cid: round(s, 4) for cid, s in scores.items()}
+            decision["rewards"] = {
+                cid: round(arm.last_reward, 4)
+                for cid, arm in self._arms.items() if arm.last_reward is not None
+            }
+            self._decisions.append(decision)
+            self._actions += 1
+            if "error" in decision:
+                self._errors += 1
+
+        if "error" in decision:
+            print(f"[!] Allocator {decision['action']} on {decision['campaign_id']} "
+                  f"failed: {decision['error']}")
+        else:
+            print(f"[*] Allocator {decision['action']} {decision['campaign_id']}: "
+                  f"{decision['reason']}")
+
+        self._bus.emit("allocator_decision", {"type": "allocator_decision", **decision})
+
+    # -----------------------------------------
+    # Monitoring
+    # -----------------------------------------
+
+    def status(self) -> dict:
+        with self._lock:
+            scores = self._scores()
+            campaigns = {}
+            for cid, arm in self._arms.items():
+                low, high = self._bounds(cid)
+                campaigns[cid] = {
+                    "min_instances": low,
+                    "max_instances": high,
+                    "edges_per_hour": arm.edges_per_hour,
+                    "paths_per_hour": arm.paths_per_hour,
+                    "last_reward": arm.last_reward,
+                    "mean_reward": arm.mean,
+                    "score": scores.get(cid),
+                    "cooldown_until": arm.cooldown_until or None,
+                }
+            return {
+                **self._counters(),
+                "campaigns": campaigns,
+                "decisions": list(self._decisions),
+            }
+
+    def _counters(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "interval": self.interval,
+            "rounds": self._rounds,
+            "actions": self._actions,
+            "errors": self._errors,
+            "last_round_at": self._last_round_at,
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return self._counters()
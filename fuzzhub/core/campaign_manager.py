@@ -4,16 +4,31 @@ File: fuzzhub/core/campaign_manager.py
 Campaign and fuzzer orchestration logic with recovery support.
 """
 
+import os
 import threading
+import time
+from collections import deque
 from datetime import datetime
 from typing import Dict
 
+from sqlalchemy import bindparam, select, update
+
 from fuzzhub.fuzzers.registry import FuzzerRegistry
 from fuzzhub.database.session import SessionLocal
-from fuzzhub.database.models import FuzzerInstance
-from fuzzhub.collectors.metrics import MetricsCollector
-from fuzzhub.collectors.crashes import CrashCollector
-from fuzzhub.utils.process import pid_exists
+from fuzzhub.database.models import Campaign, FuzzerInstance
+from fuzzhub.collectors.metrics import MetricsCollector, MetricsWriter
+from fuzzhub.collectors.crashes import CrashCollector, CrashIndex, CrashRebucket
+from fuzzhub.collectors.coverage import CoverageAggregator, CoverageCollector
+from fuzzhub.collectors.inputs import CrashInputIngest, InputImport
+from fuzzhub.core.fuzzer_state import FuzzerStateTable
+from fuzzhub.core.allocator import CoreAllocator
+from fuzzhub.core.cmin import CorpusMinimizer, apply_seed_corpus, corpus_dir
+from fuzzhub.core.corpus_sync import CorpusSync
+from fuzzhub.core.scheduler import CollectionScheduler, CorePlacement, PlacementError
+from fuzzhub.core.triage import PRIORITY_MANUAL, PRIORITY_NEW, PRIORITY_NEW_CLUSTER, TriageService
+from fuzzhub.core.supervisor import EXIT_CLEAN, ProcessSupervisor
+from fuzzhub.utils.config import get_config
+from fuzzhub.utils.process import open_verified
 
 
 class CampaignManager:
@@ -24,32 +39,191 @@ class CampaignManager:
         self._bus = event_bus
         print("EVENT BUS (inside campaign manager init):", id(self._bus))
 
+        # Shared metrics ingest pipeline (one writer for all collectors)
+        self._metrics_writer = MetricsWriter()
+        self._metrics_writer.start()
+
+        # Crash directories -> content-addressed input store
+        self.inputs = CrashInputIngest()
+        self.inputs.start()
+        self._input_import = None
+
+        # Dedicated cores per instance; starts wait here when none are free
+        self.placement = CorePlacement()
+        self._start_queue = deque()
+
+        # Notices fuzzer exits via pidfds and restarts them with backoff
+        self.supervisor = ProcessSupervisor(self._on_process_exit, self._respawn)
+        self.supervisor.start()
+
+        # Re-runs new crashes on cores the fuzzers leave free
+        self.triage = TriageService(busy_cores=self._busy_cores)
+        self.triage.warm()
+        self.triage.start()
+
+        # Known crash hashes; repeats are counted in memory and flushed in batches
+        self._crash_index = CrashIndex(inputs=self.inputs, on_new=self._on_new_crash)
+        self._crash_index.warm()
+        self._crash_index.start()
+        self._rebucket = None
+
+        # One timer loop + small worker pool runs every collector
+        self._scheduler = CollectionScheduler()
+        self._scheduler.start()
+
+        # Campaign-wide edge coverage merged from instance bitmaps
+        self.coverage = CoverageAggregator()
+
+        # Shares new queue entries between a campaign's instances
+        self.corpus_sync = CorpusSync()
+        self.corpus_sync.start()
+
+        # campaign_id -> last corpus minimization job
+        self._cmin: Dict[str, CorpusMinimizer] = {}
+
+        # Latest metrics / crash counts per instance, served to the API
+        self.state = FuzzerStateTable()
+        self.state.warm()
+
+        # Moves instances from stagnant campaigns to productive ones
+        self.allocator = CoreAllocator(self, self._bus)
+        self.allocator.start()
+
+        self._heartbeat_stats = {
+            "ticks": 0,
+            "errors": 0,
+            "rows": 0,
+            "last_ms": None,
+            "max_ms": 0.0,
+            "last_lock_ms": None,
+            "last_db_ms": None,
+        }
+        self._scheduler.schedule(
+            "heartbeat",
+            self.heartbeat,
+            get_config().get("daemon", {}).get("heartbeat_interval", 10),
+        )
+
     # -----------------------------------------
     # Recovery Logic
     # -----------------------------------------
 
     def recover_running_fuzzers(self):
+        """
+        Reattach to instances that outlived the previous daemon.
+
+        All running and restarting rows are read with one query. Live
+        processes get their adapter rebuilt and reattached, with
+        collection resuming from the state saved by the last heartbeat.
+        Dead ones are marked crashed in one bulk UPDATE.
+        """
+        started = time.perf_counter()
+
+        # "restarting" rows are left by a daemon that died before the
+        # respawn; they hold no pid and are marked crashed below
         db = SessionLocal()
-        instances = db.query(FuzzerInstance).filter_by(state="running").all()
+        try:
+            rows = db.execute(
+                select(
+                    FuzzerInstance.id,
+                    FuzzerInstance.campaign_id,
+                    FuzzerInstance.fuzzer_type,
+                    FuzzerInstance.pid,
+                    FuzzerInstance.state,
+                    FuzzerInstance.config,
+                    FuzzerInstance.started_at,
+                    FuzzerInstance.collector_state,
+                ).where(FuzzerInstance.state.in_(("running", "restarting")))
+            ).all()
+        finally:
+            db.close()
 
-        for instance in instances:
-            if pid_exists(instance.pid):
-                print(f"[+] Recovered fuzzer {instance.id} (PID {instance.pid})")
-                self._fuzzers[instance.id] = self._create_placeholder(instance)
-            else:
-                print(f"[!] Stale fuzzer {instance.id} marked crashed")
-                instance.state = "crashed"
+        tolerance = get_config().get("supervisor", {}).get("start_tolerance", 5.0)
+        stale = []
+        reattached = 0
+
+        for row in rows:
+            # A bare PID may have been reused since; match its start time
+            alive, pidfd = open_verified(row.pid, row.started_at, tolerance)
+            if not alive:
+                stale.append(row.id)
+                continue
+
+            try:
+                if self._reattach(row, pidfd):
+                    reattached += 1
+                    continue
+            except Exception as e:
+                print(f"[!] Reattaching fuzzer {row.id} failed: {e}")
+
+            # No adapter to resume with: keep it signalable and supervised
+            self._fuzzers[row.id] = self._create_placeholder(row, pidfd)
+            self.supervisor.watch(
+                row.id, pid=row.pid,
+                pidfd=os.dup(pidfd) if pidfd is not None else None,
+            )
+            self._claim_cpus(row)
+
+        if stale:
+            table = FuzzerInstance.__table__
+            db = SessionLocal()
+            try:
+                db.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("b_id"))
+                    .values(state="crashed", pid=None),
+                    [{"b_id": fid} for fid in stale],
+                )
                 db.commit()
+            finally:
+                db.close()
 
-        db.close()
+            for fid in stale:
+                self.state.set_state(fid, "crashed", None)
+
+        elapsed = time.perf_counter() - started
+        print(
+            f"[*] Recovery: {reattached} reattached, "
+            f"{len(rows) - reattached - len(stale)} adopted without adapter, "
+            f"{len(stale)} stale ({elapsed:.2f}s)"
+        )
+
+    def _reattach(self, row, pidfd) -> bool:
+        fuzzer_cls = FuzzerRegistry.get(row.fuzzer_type)
+        if not fuzzer_cls.reattachable:
+            return False
+
+        fuzzer = fuzzer_cls(row.campaign_id, dict(row.config or {}), fuzzer_id=row.id)
+        fuzzer.setup()
+        fuzzer.reattach(row.pid, pidfd, row.collector_state)
+
+        self.supervisor.watch(
+            fuzzer.id, pid=row.pid,
+            pidfd=os.dup(pidfd) if pidfd is not None else None,
+        )
+        self._claim_cpus(row)
+        fuzzer.cpus = self.placement.cpus_of(fuzzer.id)
+
+        self._attach(fuzzer)
+        self.state.register(fuzzer.id, fuzzer.campaign_id, row.fuzzer_type, "running", row.pid)
+        return True
+
+    def _claim_cpus(self, row):
+        try:
+            cpus = sorted(os.sched_getaffinity(row.pid))
+        except OSError:
+            cpus = []
+        self.placement.claim(row.id, row.campaign_id, cpus)
 
-    def _create_placeholder(self, instance):
+    def _create_placeholder(self, instance, pidfd=None):
         class Placeholder:
-            def __init__(self, db_instance):
+            def __init__(self, db_instance, pidfd):
                 self.id = db_instance.id
                 self.campaign_id = db_instance.campaign_id
                 self._pid = db_instance.pid
                 self._state = db_instance.state
+                # Signals go through the pidfd, never to a recycled PID
+                self._pidfd = pidfd
 
             def status(self):
                 return {
@@ -59,15 +233,25 @@ class CampaignManager:
                     "pid": self._pid,
                 }
 
+            def process_exited(self, returncode):
+                self._state = "stopped" if returncode == 0 else "crashed"
+                self._pid = None
+
             def stop(self):
-                import os
                 import signal
                 try:
-                    os.kill(self._pid, signal.SIGTERM)
+                    if self._pidfd is not None:
+                        signal.pidfd_send_signal(self._pidfd, signal.SIGTERM)
+                    elif self._pid:
+                        os.kill(self._pid, signal.SIGTERM)
                 except ProcessLookupError:
                     pass
+                finally:
+                    if self._pidfd is not None:
+                        os.close(self._pidfd)
+                        self._pidfd = None
 
-        return Placeholder(instance)
+        return Placeholder(instance, pidfd)
 
     # -----------------------------------------
     # Campaign Control
@@ -76,63 +260,247 @@ class CampaignManager:
     def start_fuzzer(self, campaign_id: str, fuzzer_type: str, config: dict):
 
         fuzzer_cls = FuzzerRegistry.get(fuzzer_type)
+        config = apply_seed_corpus(fuzzer_type, config, campaign_id)
         fuzzer = fuzzer_cls(campaign_id, config)
 
         fuzzer.setup()
-        fuzzer.start()
 
-        metrics_thread = MetricsCollector(fuzzer)
-        crash_thread = CrashCollector(fuzzer)
+        cpus = self.placement.allocate(fuzzer.id, campaign_id, fuzzer.cores_needed())
+        if cpus is None:
+            if self.placement.on_full == "refuse":
+                raise PlacementError(
+                    f"No free cores for fuzzer needing {fuzzer.cores_needed()} CPU(s)"
+                )
+            if self.placement.on_full == "queue":
+                return self._queue_start(fuzzer, fuzzer_type)
+            # "share": run unpinned alongside the others
+        fuzzer.cpus = cpus or None
+
+        try:
+            self._launch(fuzzer, fuzzer_type)
+        except Exception:
+            self.placement.release(fuzzer.id)
+            raise
 
-        metrics_thread.start()
-        crash_thread.start()
+        return fuzzer.id
 
-        fuzzer._metrics_thread = metrics_thread
-        fuzzer._crash_thread = crash_thread
+    def _launch(self, fuzzer, fuzzer_type: str):
+        fuzzer.start()
+        if fuzzer.process() is not None:
+            self.supervisor.watch(fuzzer.id, proc=fuzzer.process())
 
-        with self._lock:
-            self._fuzzers[fuzzer.id] = fuzzer
+        self._attach(fuzzer)
 
         self._persist_instance(fuzzer, fuzzer_type)
 
+        status = fuzzer.status()
+        self.state.register(
+            fuzzer.id, fuzzer.campaign_id, fuzzer_type, status["state"], status["pid"]
+        )
+
         self._bus.emit("fuzzer_update", {
             "type": "fuzzer_update",
             "fuzzer": fuzzer.status()
         })
 
+    def _attach(self, fuzzer):
+        # Collection for a running (spawned or reattached) instance
+        self._schedule_collectors(fuzzer)
+        self.inputs.watch(fuzzer)
+        self.corpus_sync.add(fuzzer)
+
+        with self._lock:
+            self._fuzzers[fuzzer.id] = fuzzer
+
+    def _queue_start(self, fuzzer, fuzzer_type: str) -> str:
+        with self._lock:
+            self._start_queue.append((fuzzer, fuzzer_type))
+
+        print(f"[*] No free cores, fuzzer {fuzzer.id} queued")
+        self.state.register(fuzzer.id, fuzzer.campaign_id, fuzzer_type, "queued", None)
+        self._bus.emit("fuzzer_update", {
+            "type": "fuzzer_update",
+            "fuzzer": {
+                "id": fuzzer.id,
+                "campaign_id": fuzzer.campaign_id,
+                "state": "queued",
+                "pid": None,
+            },
+        })
         return fuzzer.id
 
+    def _drain_start_queue(self):
+        """
+        Start queued fuzzers, oldest first, while cores are free.
+        """
+        while True:
+            with self._lock:
+                if not self._start_queue:
+                    return
+                fuzzer, fuzzer_type = self._start_queue[0]
+                cpus = self.placement.allocate(
+                    fuzzer.id, fuzzer.campaign_id, fuzzer.cores_needed()
+                )
+                if cpus is None:
+                    return
+                self._start_queue.popleft()
+
+            fuzzer.cpus = cpus or None
+            try:
+                self._launch(fuzzer, fuzzer_type)
+            except Exception as e:
+                self.placement.release(fuzzer.id)
+                self.state.set_state(fuzzer.id, "error", None)
+                print(f"[!] Queued fuzzer {fuzzer.id} failed to start: {e}")
+
+    def _busy_cores(self) -> int:
+        if self.placement.enabled:
+            return self.placement.stats()["allocated_cpus"]
+        return len(self._fuzzers)
+
+    def free_cores(self) -> int:
+        if self.placement.enabled:
+            return self.placement.stats()["free_cpus"] - len(self._start_queue)
+        return (os.cpu_count() or 1) - len(self._fuzzers)
+
+    def live_fuzzer(self, fuzzer_id: str):
+        return self._fuzzers.get(fuzzer_id)
+
     def stop_fuzzer(self, fuzzer_id: str):
         print("EMITTING ON BUS:", id(self._bus))
         print("STOP CALLED:", fuzzer_id)
         print("KNOWN FUZZERS:", list(self._fuzzers.keys()))
+        if self._unqueue(fuzzer_id):
+            return
+
         with self._lock:
             if fuzzer_id in self._fuzzers:
                 fuzzer = self._fuzzers[fuzzer_id]
 
-                if hasattr(fuzzer, "_metrics_thread"):
-                    fuzzer._metrics_thread.stop()
-                if hasattr(fuzzer, "_crash_thread"):
-                    fuzzer._crash_thread.stop()
+                # An intentional stop is not an exit to recover from
+                self.supervisor.unwatch(fuzzer_id)
+                self._cancel_collectors(fuzzer_id)
 
                 fuzzer.stop()
-                self._mark_stopped_in_db(fuzzer_id)
-
-                # Update internal state before emit
-                status = {
-                    "id": fuzzer_id,
-                    "campaign_id": fuzzer.campaign_id,
-                    "state": "stopped",
-                    "pid": None,
-                }
+                self._retire(fuzzer, "stopped")
+
+        self._drain_start_queue()
+
+    def _retire(self, fuzzer, state: str):
+        """
+        Tear down everything attached to an instance whose process is
+        gone (lock held).
+        """
+        self._cancel_collectors(fuzzer.id)
+        self.inputs.unwatch(fuzzer.id)
+        self.corpus_sync.remove(fuzzer.id)
+        self._mark_stopped_in_db(fuzzer.id, state)
+        self.state.set_state(fuzzer.id, state, None)
+
+        # Update internal state before emit
+        status = {
+            "id": fuzzer.id,
+            "campaign_id": fuzzer.campaign_id,
+            "state": state,
+            "pid": None,
+        }
 
-                print("EMIT: fuzzer_update(stop)")
-                self._bus.emit("fuzzer_update", {
-                    "fuzzer": status
-                })
+        self._bus.emit("fuzzer_update", {
+            "fuzzer": status
+        })
 
+        del self._fuzzers[fuzzer.id]
+        self.placement.release(fuzzer.id)
 
-                del self._fuzzers[fuzzer_id]
+    # -----------------------------------------
+    # Supervision
+    # -----------------------------------------
+
+    def _on_process_exit(self, fuzzer_id: str, info: dict):
+        restarting = info["restart_in"] is not None
+
+        with self._lock:
+            fuzzer = self._fuzzers.get(fuzzer_id)
+            if fuzzer is None:
+                return
+
+            if hasattr(fuzzer, "process_exited"):
+                fuzzer.process_exited(info["returncode"])
+
+            if restarting:
+                state = "restarting"
+                self._update_db_state(fuzzer, state)
+                self.state.set_state(fuzzer_id, state, None)
+            else:
+                state = "stopped" if info["reason"] == EXIT_CLEAN else "crashed"
+                self._retire(fuzzer, state)
+
+        if info["gave_up"]:
+            print(f"[!] Fuzzer {fuzzer_id} keeps dying ({info['reason']}), not restarting")
+        elif restarting:
+            print(f"[!] Fuzzer {fuzzer_id} {info['reason']}, restarting in {info['restart_in']}s")
+        else:
+            print(f"[*] Fuzzer {fuzzer_id} {info['reason']}")
+
+        self._bus.emit("fuzzer_exit", {
+            "type": "fuzzer_exit",
+            "fuzzer_id": fuzzer_id,
+            "campaign_id": fuzzer.campaign_id,
+            "state": state,
+            **info,
+        })
+
+        if not restarting:
+            self._drain_start_queue()
+
+    def _respawn(self, fuzzer_id: str) -> bool:
+        with self._lock:
+            fuzzer = self._fuzzers.get(fuzzer_id)
+            if fuzzer is None:
+                return False
+
+            if not hasattr(fuzzer, "process"):
+                # Adopted after a daemon restart: no adapter object to
+                # start again, so relaunch from the stored config
+                handoff = True
+            else:
+                handoff = False
+                fuzzer.start()
+                self.supervisor.watch(fuzzer_id, proc=fuzzer.process())
+
+                status = fuzzer.status()
+                self._update_db_state(fuzzer, started=True)
+                self.state.set_state(fuzzer_id, status["state"], status["pid"])
+
+        if handoff:
+            return self.restart_fuzzer(fuzzer_id) is not None
+
+        print(f"[*] Restarted fuzzer {fuzzer_id} (PID {status['pid']})")
+        self._bus.emit("fuzzer_update", {
+            "type": "fuzzer_update",
+            "fuzzer": status,
+        })
+        return True
+
+    def _unqueue(self, fuzzer_id: str) -> bool:
+        with self._lock:
+            for entry in self._start_queue:
+                if entry[0].id == fuzzer_id:
+                    self._start_queue.remove(entry)
+                    break
+            else:
+                return False
+
+        self.state.set_state(fuzzer_id, "stopped", None)
+        self._bus.emit("fuzzer_update", {
+            "fuzzer": {
+                "id": fuzzer_id,
+                "campaign_id": entry[0].campaign_id,
+                "state": "stopped",
+                "pid": None,
+            }
+        })
+        return True
 
 
     def restart_fuzzer(self, fuzzer_id: str):
@@ -146,6 +514,7 @@ class CampaignManager:
 
         campaign_id = instance.campaign_id
         fuzzer_type = instance.fuzzer_type
+        config = dict(instance.config or {})
 
         db.close()
 
@@ -156,31 +525,358 @@ class CampaignManager:
         new_id = self.start_fuzzer(
             campaign_id=campaign_id,
             fuzzer_type=fuzzer_type,
-            config={}
+            config=config
         )
 
         return new_id
 
     def stop_all(self):
+        # Before stopping instances, so neither starts replacements
+        self.allocator.stop()
+        self.supervisor.stop()
+
         with self._lock:
+            for f, _ in self._start_queue:
+                self.state.set_state(f.id, "stopped", None)
+            self._start_queue.clear()
+
             for f in list(self._fuzzers.values()):
+                self._cancel_collectors(f.id)
                 f.stop()
+                self.inputs.unwatch(f.id)
+                self.corpus_sync.remove(f.id)
+                self.placement.release(f.id)
+                self.state.set_state(f.id, "stopped", None)
             self._fuzzers.clear()
 
+        self._scheduler.stop()
+        self._metrics_writer.stop()
+        self._crash_index.stop()
+        self.triage.stop()
+        self.inputs.stop()
+        self.corpus_sync.stop()
+
+    # -----------------------------------------
+    # Collection Jobs
+    # -----------------------------------------
+
+    def _schedule_collectors(self, fuzzer):
+        metrics = MetricsCollector(fuzzer, self._metrics_writer, self.state)
+        crashes = CrashCollector(fuzzer, self._crash_index, self.state)
+
+        self._scheduler.schedule(f"{fuzzer.id}:metrics", metrics.collect, metrics.interval)
+        self._scheduler.schedule(f"{fuzzer.id}:crashes", crashes.collect, crashes.interval)
+
+        if fuzzer.coverage_sources():
+            coverage = CoverageCollector(fuzzer, self.coverage)
+            self._scheduler.schedule(f"{fuzzer.id}:coverage", coverage.collect, coverage.interval)
+
+    def _cancel_collectors(self, fuzzer_id: str):
+        self._scheduler.cancel(f"{fuzzer_id}:metrics")
+        self._scheduler.cancel(f"{fuzzer_id}:crashes")
+        self._scheduler.cancel(f"{fuzzer_id}:coverage")
+
+    # -----------------------------------------
+    # State Queries (served from memory)
+    # -----------------------------------------
+
+    def _merge_live_status(self, entry: dict) -> dict:
+        fuzzer = self._fuzzers.get(entry["id"])
+
+        if fuzzer:
+            status = fuzzer.status()
+        else:
+            status = {
+                "id": entry["id"],
+                "campaign_id": entry["campaign_id"],
+                "state": entry["state"],
+                "pid": entry["pid"],
+                "uptime_seconds": None,
+                "started_at": None,
+            }
+
+        return {
+            **status,
+            "exec_per_sec": entry["exec_per_sec"],
+            "corpus_size": entry["corpus_size"],
+            "coverage": entry["coverage"],
+            "crash_count": entry["crash_count"],
+        }
+
+    def list_fuzzer_states(self):
+        return [self._merge_live_status(entry) for entry in self.state.list()]
+
+    def get_fuzzer_state(self, fuzzer_id: str):
+        entry = self.state.get(fuzzer_id)
+        if entry is None:
+            return None
+        return self._merge_live_status(entry)
+
+    def placement_info(self):
+        info = self.placement.describe()
+        with self._lock:
+            info["queued_starts"] = [f.id for f, _ in self._start_queue]
+        return info
+
+    def campaign_coverage(self, campaign_id: str):
+        return self.coverage.summary(campaign_id)
+
+    def campaign_corpus(self, campaign_id: str):
+        return self.corpus_sync.campaign_stats(campaign_id)
+
+    # -----------------------------------------
+    # Corpus Minimization
+    # -----------------------------------------
+
+    def minimize_corpus(self, campaign_id: str, target_binary: str = None,
+                        target_args: list = None, showmap_path: str = None,
+                        dirs: list = None):
+        """
+        Start a cmin run over the campaign's queues and its previous
+        minimized corpus (no-op while one is running).
+        """
+        with self._lock:
+            job = self._cmin.get(campaign_id)
+            if self._cmin_busy(job):
+                return job.status()
+
+            fuzzers = [f for f in self._fuzzers.values() if f.campaign_id == campaign_id]
+            input_dirs = [d for f in fuzzers if hasattr(f, "queue_dirs") for d in f.queue_dirs()]
+
+        input_dirs += list(dirs or []) + [corpus_dir(campaign_id)]
+
+        if not target_binary:
+            config = self._cmin_target_config(campaign_id, fuzzers)
+            target_binary = config.get("target_binary")
+            if target_args is None:
+                target_args = config.get("target_args")
+            if not showmap_path and config.get("afl_path"):
+                # afl-showmap ships next to afl-fuzz
+                showmap_path = os.path.join(os.path.dirname(config["afl_path"]), "afl-showmap")
+        else:
+            config = {}
+
+        if not target_binary:
+            return {"campaign_id": campaign_id, "state": "failed",
+                    "error": "no target binary for campaign"}
+
+        with self._lock:
+            # Another request may have registered a run meanwhile
+            job = self._cmin.get(campaign_id)
+            if self._cmin_busy(job):
+                return job.status()
+
+            job = CorpusMinimizer(
+                campaign_id, input_dirs, target_binary, target_args,
+                showmap_path=showmap_path, env=config.get("env"),
+            )
+            self._cmin[campaign_id] = job
+
+        job.start()
+        return job.status()
+
+    @staticmethod
+    def _cmin_busy(job) -> bool:
+        # Registered but not started yet counts as running
+        return job is not None and (job.is_alive() or job.ident is None)
+
+    def _cmin_target_config(self, campaign_id: str, fuzzers) -> dict:
+        # Prefer an AFL instance's target: it is built for afl-showmap
+        for f in fuzzers:
+            entry = self.state.get(f.id)
+            if entry and entry["fuzzer_type"] == "afl":
+                return f.config
+
+        db = SessionLocal()
+        try:
+            instance = (
+                db.query(FuzzerInstance)
+                .filter_by(campaign_id=campaign_id, fuzzer_type="afl")
+                .order_by(FuzzerInstance.started_at.desc())
+                .first()
+            )
+            if instance and instance.config:
+                return dict(instance.config)
+
+            campaign = db.query(Campaign).filter_by(id=campaign_id).first()
+            if campaign:
+                return {"target_binary": campaign.target_binary}
+        finally:
+            db.close()
+
+        return {}
+
+    def corpus_minimization_status(self, campaign_id: str):
+        job = self._cmin.get(campaign_id)
+        if job is None:
+            return {"campaign_id": campaign_id, "state": "idle",
+                    "corpus_dir": corpus_dir(campaign_id)}
+        return job.status()
+
+    # -----------------------------------------
+    # Crash Maintenance
+    # -----------------------------------------
+
+    def rebucket_crashes(self):
+        """
+        Start re-bucketing stored crashes (no-op while one is running).
+        """
+        with self._lock:
+            if self._rebucket is None or not self._rebucket.is_alive():
+                self._rebucket = CrashRebucket(
+                    self._crash_index.clusters, on_done=self._after_rebucket,
+                    index=self._crash_index,
+                )
+                self._rebucket.start()
+            return self._rebucket.status()
+
+    def rebucket_status(self):
+        if self._rebucket is None:
+            return {"state": "idle"}
+        return self._rebucket.status()
+
+    def _after_rebucket(self):
+        # Merged rows changed hashes and per-instance crash counts
+        self._crash_index.warm()
+        self.state.warm()
+
+    def _on_new_crash(self, crash_id: str, new_cluster: bool, crash: dict):
+        self.triage.enqueue(crash_id, PRIORITY_NEW_CLUSTER if new_cluster else PRIORITY_NEW)
+        self._bus.emit("crash_found", {
+            "campaign_id": crash["campaign_id"],
+            "fuzzer_id": crash["fuzzer_id"],
+            "crash": crash,
+        })
+
+    def triage_crash(self, crash_id: str) -> bool:
+        """
+        Queue a crash for (re-)triage ahead of everything else.
+        """
+        return self.triage.enqueue(crash_id, PRIORITY_MANUAL)
+
+    def import_inputs(self, dirs=None):
+        """
+        Start storing existing crash inputs (no-op while an import is
+        running): files under `dirs`, then crash rows without a hash.
+        """
+        with self._lock:
+            if self._input_import is None or not self._input_import.is_alive():
+                self._input_import = InputImport(self.inputs, dirs)
+                self._input_import.start()
+            return self._input_import.status()
+
+    def import_inputs_status(self):
+        if self._input_import is None:
+            return {"state": "idle"}
+        return self._input_import.status()
+
+    # -----------------------------------------
+    # Monitoring
+    # -----------------------------------------
+
+    def stats(self):
+        return {
+            "metrics_writer": self._metrics_writer.stats(),
+            "scheduler": self._scheduler.stats(),
+            "crash_index": self._crash_index.stats(),
+            "crash_clusters": self._crash_index.clusters.stats(),
+            "coverage": self.coverage.stats(),
+            "inputs": self.inputs.stats(),
+            "triage": self.triage.stats(),
+            "corpus_sync": self.corpus_sync.stats(),
+            "placement": {**self.placement.stats(), "queued_starts": len(self._start_queue)},
+            "allocator": self.allocator.stats(),
+            "supervisor": self.supervisor.stats(),
+            "heartbeat": dict(self._heartbeat_stats),
+            "event_bus": self._bus.stats(),
+        }
+
     # -----------------------------------------
     # Heartbeat & Monitoring
     # -----------------------------------------
 
     def heartbeat(self):
+        """
+        Persist every instance's state and last_heartbeat in one
+        executemany UPDATE. Statuses are snapshotted under the lock and
+        the write happens after it is released, so starts and stops
+        never wait on the database; the in-memory state and events are
+        then applied under the lock again, skipping instances that
+        were stopped in between.
+        """
+        started = time.perf_counter()
+
         with self._lock:
-            for fuzzer in self._fuzzers.values():
-                self._update_db_state(fuzzer)
+            fuzzers = list(self._fuzzers.values())
+            statuses = [fuzzer.status() for fuzzer in fuzzers]
+
+        locked = time.perf_counter()
+
+        now = datetime.utcnow()
+        rows = []
+        for fuzzer, s in zip(fuzzers, statuses):
+            export = getattr(fuzzer, "export_state", None)
+            rows.append({
+                "b_id": s["id"],
+                "b_state": s["state"],
+                "b_pid": s["pid"],
+                "b_seen": now,
+                "b_cstate": export() if export else None,
+            })
+
+        failed = False
+        if rows:
+            table = FuzzerInstance.__table__
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                # Stopped/retired after the snapshot: keep the final state
+                .where(table.c.state != "stopped", table.c.state != "crashed")
+                .values(
+                    state=bindparam("b_state"),
+                    pid=bindparam("b_pid"),
+                    last_heartbeat=bindparam("b_seen"),
+                    collector_state=bindparam("b_cstate"),
+                )
+            )
+
+            db = SessionLocal()
+            try:
+                db.execute(stmt, rows)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                failed = True
+                print(f"[!] Heartbeat write failed ({len(rows)} instances): {e}")
+            finally:
+                db.close()
+
+        written = time.perf_counter()
 
+        with self._lock:
+            for fuzzer, status in zip(fuzzers, statuses):
+                # Stopped or retired since the snapshot: its final state
+                # was already published and must not be overwritten
+                if self._fuzzers.get(status["id"]) is not fuzzer:
+                    continue
+                self.state.set_state(status["id"], status["state"], status["pid"])
                 self._bus.emit("fuzzer_update", {
                     "type": "fuzzer_update",
-                    "fuzzer": fuzzer.status()
+                    "fuzzer": status
                 })
 
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+        with self._lock:
+            hb = self._heartbeat_stats
+            hb["ticks"] += 1
+            hb["errors"] += int(failed)
+            hb["rows"] = len(rows)
+            hb["last_ms"] = elapsed_ms
+            hb["max_ms"] = max(hb["max_ms"], elapsed_ms)
+            hb["last_lock_ms"] = (locked - started) * 1000.0
+            hb["last_db_ms"] = (written - locked) * 1000.0
+
     # -----------------------------------------
     # Persistence
     # -----------------------------------------
@@ -193,6 +889,7 @@ class CampaignManager:
             id=fuzzer.id,
             campaign_id=fuzzer.campaign_id,
             fuzzer_type=fuzzer_type,
+            config=fuzzer.config,
             pid=fuzzer.status()["pid"],
             state=fuzzer.status()["state"],
             started_at=datetime.utcnow(),
@@ -203,21 +900,25 @@ class CampaignManager:
         db.commit()
         db.close()
 
-    def _update_db_state(self, fuzzer):
+    def _update_db_state(self, fuzzer, state: str = None, started: bool = False):
         db = SessionLocal()
         instance = db.query(FuzzerInstance).filter_by(id=fuzzer.id).first()
         if instance:
-            instance.state = fuzzer.status()["state"]
-            instance.pid = fuzzer.status()["pid"]
+            status = fuzzer.status()
+            instance.state = state or status["state"]
+            instance.pid = None if state else status["pid"]
             instance.last_heartbeat = datetime.utcnow()
+            if started:
+                # Recovery matches the PID against this start time
+                instance.started_at = datetime.utcnow()
             db.commit()
         db.close()
 
-    def _mark_stopped_in_db(self, fuzzer_id: str):
+    def _mark_stopped_in_db(self, fuzzer_id: str, state: str = "stopped"):
         db = SessionLocal()
         instance = db.query(FuzzerInstance).filter_by(id=fuzzer_id).first()
         if instance:
-            instance.state = "stopped"
+            instance.state = state
             instance.last_heartbeat = datetime.utcnow()
             db.commit()
         db.close()
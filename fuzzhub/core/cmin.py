@@ -0,0 +1,444 @@
+"""
+File: fuzzhub/core/cmin.py
+
+Corpus distillation (afl-cmin style) as a campaign operation.
+
+Every queue entry of a campaign's instances (plus its previous
+minimized corpus) is deduplicated by SHA-256 and traced with
+afl-showmap on a worker pool. Traces are cached per target binary in
+an append-only file keyed by input hash, so after a campaign grows
+only the new entries are traced. Only traces afl-showmap actually
+produced are cached; inputs whose run timed out or wrote no map are
+left out of the selection and traced again next time. The selection is afl-cmin's greedy
+pass: each (edge, hit bucket) tuple nominates the smallest input that
+hits it, then the rarest tuples pick their input first until every
+tuple is covered.
+
+The result replaces runtime/cmin/<campaign>/corpus and seeds later
+start_fuzzer/restart_fuzzer calls (see apply_seed_corpus).
+"""
+
+import hashlib
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fuzzhub.utils.config import get_config
+from fuzzhub.utils.files import file_signature
+
+
+_RECORD = struct.Struct("<32sI")
+
+_binary_hashes: Dict[str, tuple] = {}
+
+
+def _config() -> dict:
+    return get_config().get("cmin", {})
+
+
+def _root() -> str:
+    return os.path.abspath(_config().get("root", os.path.join("runtime", "cmin")))
+
+
+def corpus_dir(campaign_id: str) -> str:
+    return os.path.join(_root(), campaign_id, "corpus")
+
+
+def apply_seed_corpus(fuzzer_type: str, config: dict, campaign_id: str) -> dict:
+    """
+    Config for a new instance, seeded from the campaign's minimized
+    corpus if there is one (and the config does not opt out).
+    """
+    path = corpus_dir(campaign_id)
+    if not config.get("use_minimized_corpus", True) or not os.path.isdir(path):
+        return config
+
+    config = dict(config)
+    if fuzzer_type == "afl":
+        config["input_dir"] = path
+    elif fuzzer_type == "libfuzzer":
+        seeds = list(config.get("seed_dirs", []))
+        if path not in seeds:
+            config["seed_dirs"] = seeds + [path]
+    # honggfuzz writes new inputs into its input dir, so it keeps its own
+    return config
+
+
+def _sha256_file(path: str) -> Optional[str]:
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _binary_sha256(path: str) -> Optional[str]:
+    sig = file_signature(path)
+    cached = _binary_hashes.get(path)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+
+    sha256 = _sha256_file(path)
+    _binary_hashes[path] = (sig, sha256)
+    return sha256
+
+
+# -------------------------------------------------
+# Trace Cache
+# -------------------------------------------------
+
+class TraceCache:
+    """
+    Append-only (input sha256 -> tuples) records for one binary.
+
+    Record: 32-byte digest, uint32 count, count * uint32 tuples.
+    A torn last record (crash mid-append) is ignored on load.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.traces: Dict[str, tuple] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        offset = 0
+        while offset + _RECORD.size <= len(data):
+            digest, count = _RECORD.unpack_from(data, offset)
+            end = offset + _RECORD.size + count * 4
+            if end > len(data):
+                break
+            if count:
+                # Empty records were written by older versions for
+                # failed runs; leave those inputs to be traced again
+                self.traces[digest.hex()] = struct.unpack_from(
+                    f"<{count}I", data, offset + _RECORD.size
+                )
+            offset = end
+
+    def add(self, entries: Dict[str, tuple]):
+        if not entries:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "ab") as f:
+            for sha256, tuples in entries.items():
+                f.write(_RECORD.pack(bytes.fromhex(sha256), len(tuples)))
+                f.write(struct.pack(f"<{len(tuples)}I", *tuples))
+        self.traces.update(entries)
+
+
+def _parse_showmap(path: str) -> Optional[tuple]:
+    """
+    Tuples of one afl-showmap output file, or None if there is no
+    usable map (missing, empty or malformed).
+    """
+    tuples = set()
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                edge, _, count = line.strip().partition(b":")
+                if edge:
+                    # Bucketed hit count (1..128) rides in the low byte
+                    tuples.add((int(edge) << 8) | (int(count or 1) & 0xFF))
+    except (OSError, ValueError):
+        return None
+    return tuple(sorted(tuples)) or None
+
+
+def greedy_cover(traces: Dict[str, tuple], sizes: Dict[str, int]) -> List[str]:
+    """
+    afl-cmin selection over {sha256: tuples}; returns chosen hashes.
+    """
+    best = {}
+    hits = {}
+    for sha256 in sorted(traces, key=lambda s: (sizes[s], s)):
+        for t in traces[sha256]:
+            hits[t] = hits.get(t, 0) + 1
+            if t not in best:
+                best[t] = sha256
+
+    covered = set()
+    chosen = []
+    for t in sorted(best, key=lambda t: (hits[t], t)):
+        if t in covered:
+            continue
+        sha256 = best[t]
+        chosen.append(sha256)
+        covered.update(traces[sha256])
+
+    return chosen
+
+
+# -------------------------------------------------
+# Minimization Job
+# -------------------------------------------------
+
+class CorpusMinimizer(threading.Thread):
+    """
+    One cmin run for a campaign.
+    """
+
+    def __init__(self, campaign_id: str, input_dirs: List[str], target_binary: str,
+                 target_args: List[str] = None, showmap_path: str = None,
+                 env: Dict[str, str] = None):
+        super().__init__(daemon=True, name=f"cmin-{campaign_id[:8]}")
+
+        cfg = _config()
+
+        self.campaign_id = campaign_id
+        self.input_dirs = [os.path.abspath(d) for d in input_dirs]
+        self.target_binary = target_binary
+        self.target_args = list(target_args if target_args is not None else ["@@"])
+        self.showmap_path = showmap_path or cfg.get("showmap_path", "afl-showmap")
+        self.env = env
+
+        workers = cfg.get("workers", "auto")
+        self.workers = (os.cpu_count() or 1) if workers == "auto" else max(1, int(workers))
+        self.batch = cfg.get("batch", True)
+        self.chunk_size = cfg.get("chunk_size", 256)
+        self.timeout_ms = cfg.get("timeout_ms", 1000)
+        self.memory_mb = cfg.get("memory_mb", "none")
+        self.max_entry_size = cfg.get("max_entry_kb", 1024) * 1024
+
+        self._status = {
+            "campaign_id": campaign_id,
+            "state": "pending",
+            "phase": None,
+            "inputs": 0,
+            "unique_inputs": 0,
+            "cached": 0,
+            "traced": 0,
+            "untraced": 0,
+            "tuples": 0,
+            "selected": 0,
+            "bytes_before": 0,
+            "bytes_after": 0,
+            "corpus_dir": corpus_dir(campaign_id),
+            "started_at": None,
+            "finished_at": None,
+            "duration_seconds": None,
+            "error": None,
+        }
+        self._lock = threading.Lock()
+
+    def status(self) -> dict:
+        with self._lock:
+            return dict(self._status)
+
+    def _set(self, **fields):
+        with self._lock:
+            self._status.update(fields)
+
+    def _add(self, **counts):
+        with self._lock:
+            for key, value in counts.items():
+                self._status[key] += value
+
+    def run(self):
+        started = time.time()
+        self._set(state="running", started_at=datetime.utcnow().isoformat())
+
+        try:
+            self._minimize()
+        except Exception as e:
+            print(f"[!] cmin for campaign {self.campaign_id} failed: {e}")
+            self._set(state="failed", error=str(e))
+        else:
+            self._set(state="done")
+        finally:
+            self._set(
+                finished_at=datetime.utcnow().isoformat(),
+                duration_seconds=time.time() - started,
+            )
+
+    # -----------------------------------------
+    # Phases
+    # -----------------------------------------
+
+    def _minimize(self):
+        binary_sha = _binary_sha256(self.target_binary)
+        if binary_sha is None:
+            raise ValueError(f"target binary not readable: {self.target_binary}")
+
+        with ThreadPoolExecutor(max_workers=self.workers,
+                                thread_name_prefix="cmin") as pool:
+            self._set(phase="scanning")
+            inputs = self._scan(pool)
+
+            self._set(phase="tracing")
+            cache = TraceCache(os.path.join(_root(), "traces", f"{binary_sha}.bin"))
+            missing = [s for s in inputs if s not in cache.traces]
+            self._set(cached=len(inputs) - len(missing))
+            self._trace(pool, cache, missing, inputs)
+
+        self._set(phase="selecting")
+        # Untraced inputs have no tuples and are never selected
+        traces = {s: cache.traces.get(s, ()) for s in inputs}
+        sizes = {s: inputs[s][1] for s in inputs}
+        tuples = len({t for ts in traces.values() for t in ts})
+        if inputs and not tuples:
+            # Keep the previous corpus rather than seeding from nothing
+            raise RuntimeError("no coverage traced; is the target AFL-instrumented?")
+
+        chosen = greedy_cover(traces, sizes)
+        self._set(
+            tuples=tuples,
+            selected=len(chosen),
+            bytes_after=sum(sizes[s] for s in chosen),
+        )
+
+        self._set(phase="writing")
+        self._write(chosen, inputs)
+
+    def _scan(self, pool) -> Dict[str, tuple]:
+        """
+        sha256 -> (path, size) of unique corpus entries.
+        """
+        paths = []
+        for root in self.input_dirs:
+            try:
+                with os.scandir(root) as entries:
+                    for entry in entries:
+                        if entry.name.startswith(".") or entry.name == "README.txt":
+                            continue
+                        if entry.is_file() and entry.stat().st_size <= self.max_entry_size:
+                            paths.append((entry.path, entry.stat().st_size))
+            except OSError:
+                continue
+
+        inputs = {}
+        total = 0
+        for (path, size), sha256 in zip(paths, pool.map(_sha256_file, [p for p, _ in paths])):
+            if sha256 is None:
+                continue
+            total += size
+            if sha256 not in inputs:
+                inputs[sha256] = (path, size)
+
+        self._set(inputs=len(paths), unique_inputs=len(inputs), bytes_before=total)
+        return inputs
+
+    def _trace(self, pool, cache: TraceCache, missing: List[str], inputs: Dict[str, tuple]):
+        if not missing:
+            return
+
+        chunks = [missing[i:i + self.chunk_size] for i in range(0, len(missing), self.chunk_size)]
+        run = self._trace_batch if self.batch else self._trace_each
+
+        # Results are appended to the cache as chunks finish, so an
+        # interrupted run keeps its progress
+        for chunk, traces in zip(chunks, pool.map(lambda c: run(c, inputs), chunks)):
+            cache.add(traces)
+            self._add(traced=len(traces), untraced=len(chunk) - len(traces))
+
+    def _showmap_cmd(self, out: str, input_arg: str, batch: bool) -> List[str]:
+        cmd = [self.showmap_path, "-q", "-t", str(self.timeout_ms), "-m", str(self.memory_mb)]
+        cmd += ["-i", input_arg, "-o", out] if batch else ["-o", out]
+        cmd += ["--", self.target_binary]
+
+        for arg in self.target_args:
+            cmd.append(arg if batch else arg.replace("@@", input_arg))
+        return cmd
+
+    def _run_showmap(self, cmd: List[str], stdin_path: str = None,
+                     timeout: float = None) -> bool:
+        """
+        Run afl-showmap; False if it had to be killed.
+        """
+        env = dict(os.environ)
+        if self.env:
+            env.update({k: str(v) for k, v in self.env.items()})
+
+        stdin = open(stdin_path, "rb") if stdin_path else subprocess.DEVNULL
+        try:
+            subprocess.run(
+                cmd, stdin=stdin, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                env=env, timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return False
+        finally:
+            if stdin is not subprocess.DEVNULL:
+                stdin.close()
+        return True
+
+    def _trace_batch(self, chunk: List[str], inputs: Dict[str, tuple]) -> Dict[str, tuple]:
+        # AFL++ afl-showmap -i/-o traces a whole directory through one
+        # forkserver; output files are named after the input files
+        with tempfile.TemporaryDirectory(prefix="cmin-") as tmp:
+            in_dir = os.path.join(tmp, "in")
+            out_dir = os.path.join(tmp, "out")
+            os.makedirs(in_dir)
+
+            for sha256 in chunk:
+                os.symlink(inputs[sha256][0], os.path.join(in_dir, sha256))
+
+            limit = max(60.0, len(chunk) * self.timeout_ms / 1000.0 * 2)
+            if not self._run_showmap(self._showmap_cmd(out_dir, in_dir, True), timeout=limit):
+                # The map being written when it was killed may be torn
+                return {}
+
+            if not os.path.isdir(out_dir):
+                raise RuntimeError(
+                    "afl-showmap wrote no output directory; set cmin.batch: false "
+                    "for afl-showmap builds without -i support"
+                )
+
+            traces = {s: _parse_showmap(os.path.join(out_dir, s)) for s in chunk}
+            return {s: t for s, t in traces.items() if t is not None}
+
+    def _trace_each(self, chunk: List[str], inputs: Dict[str, tuple]) -> Dict[str, tuple]:
+        traces = {}
+        stdin = "@@" not in " ".join(self.target_args)
+
+        with tempfile.TemporaryDirectory(prefix="cmin-") as tmp:
+            out = os.path.join(tmp, "map")
+            for sha256 in chunk:
+                path = inputs[sha256][0]
+                if os.path.exists(out):
+                    os.unlink(out)
+                finished = self._run_showmap(
+                    self._showmap_cmd(out, path, False),
+                    stdin_path=path if stdin else None,
+                    timeout=max(10.0, self.timeout_ms / 1000.0 * 5),
+                )
+                tuples = _parse_showmap(out) if finished else None
+                if tuples is not None:
+                    traces[sha256] = tuples
+
+        return traces
+
+    def _write(self, chosen: List[str], inputs: Dict[str, tuple]):
+        target = corpus_dir(self.campaign_id)
+        parent = os.path.dirname(target)
+        os.makedirs(parent, exist_ok=True)
+
+        staging = tempfile.mkdtemp(prefix=".corpus-", dir=parent)
+        for sha256 in chosen:
+            shutil.copyfile(inputs[sha256][0], os.path.join(staging, sha256))
+
+        # The old corpus may be one of our inputs, so swap only at the end
+        old = None
+        if os.path.isdir(target):
+            old = tempfile.mkdtemp(prefix=".old-", dir=parent)
+            os.rmdir(old)
+            os.rename(target, old)
+        os.rename(staging, target)
+        if old:
+            shutil.rmtree(old, ignore_errors=True)
@@ -0,0 +1,367 @@
+"""
+File: fuzzhub/core/corpus_sync.py
+
+Cross-instance corpus synchronization.
+
+Every instance's queue directories (BaseFuzzer.queue_dirs) are
+watched through one DirectoryWatcher, so each sync round only sees
+entries written since the last one. New entries are hashed and
+checked against a per-campaign set of known SHA-256 digests; unseen
+ones are copied to the import target of every other instance of the
+campaign (BaseFuzzer.corpus_import):
+
+    afl        <output_dir>/fuzzhub/queue/id:NNNNNN,sync:fuzzhub
+               (read by -M/-S instances like any other sync peer)
+    libfuzzer  <corpus_dir>/fuzzhub-<sha256>, picked up by -reload
+
+Instances that share a target (AFL instances in one output directory
+already sync natively) never receive their own entries back. The
+index lives in memory; after a restart the first round re-hashes the
+existing queues once, and each target skips entries it already holds
+(delivered names carry the SHA-256). Entries modified within the
+last settle seconds may still be growing and wait for a later round.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from fuzzhub.utils.config import get_config
+from fuzzhub.utils.files import file_signature
+from fuzzhub.utils.inotify import DirectoryWatcher
+
+
+_AFL_ID = re.compile(r"^id[:_](\d+)")
+_DELIVERED_SHA = re.compile(r"(?:sha:|^fuzzhub-)([0-9a-f]{64})$")
+
+_SYNC_NAME = "fuzzhub"
+
+
+def _is_entry(name: str) -> bool:
+    # Skip dotfiles (AFL .state), README and our own deliveries
+    return not (
+        name.startswith(".")
+        or name.startswith(_SYNC_NAME + "-")
+        or f"sync:{_SYNC_NAME}" in name
+        or name == "README.txt"
+    )
+
+
+class _Target:
+    """
+    One import destination (shared by instances that name the same one).
+    """
+
+    def __init__(self, style: str, path: str):
+        self.style = style
+        self.path = os.path.abspath(path)
+        self.dir = (
+            os.path.join(self.path, _SYNC_NAME, "queue") if style == "afl" else self.path
+        )
+        self._next_id = None
+        self._held: Optional[Set[str]] = None
+        self.delivered = 0
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.style, self.path
+
+    def _load(self):
+        # Entries delivered before a restart, and (AFL) the next id:
+        # AFL remembers the last id it imported from each peer, so ids
+        # must keep increasing
+        self._held = set()
+        highest = -1
+
+        if os.path.isdir(self.dir):
+            for name in os.listdir(self.dir):
+                held = _DELIVERED_SHA.search(name)
+                if held:
+                    self._held.add(held.group(1))
+                match = _AFL_ID.match(name)
+                if match:
+                    highest = max(highest, int(match.group(1)))
+
+        self._next_id = highest + 1
+
+    def _name(self, sha256: str) -> str:
+        if self.style != "afl":
+            return f"{_SYNC_NAME}-{sha256}"
+
+        name = f"id:{self._next_id:06d},sync:{_SYNC_NAME},sha:{sha256}"
+        self._next_id += 1
+        return name
+
+    def deliver(self, sha256: str, data: bytes) -> bool:
+        if self._held is None:
+            self._load()
+        if sha256 in self._held:
+            return False
+
+        os.makedirs(self.dir, exist_ok=True)
+        name = self._name(sha256)
+        tmp = os.path.join(os.path.dirname(self.dir), f".{_SYNC_NAME}-{sha256}.tmp")
+
+        with open(tmp, "wb") as f:
+            f.write(data)
+        # Fuzzers must never see a partially written entry
+        os.replace(tmp, os.path.join(self.dir, name))
+        self._held.add(sha256)
+        self.delivered += 1
+        return True
+
+
+class _Campaign:
+
+    def __init__(self):
+        self.hashes: Set[bytes] = set()
+        # fuzzer_id -> (queue dirs, import target key or None)
+        self.instances: Dict[str, Tuple[List[str], Optional[Tuple[str, str]]]] = {}
+        self.targets: Dict[Tuple[str, str], _Target] = {}
+
+        self.collected = 0
+        self.duplicates = 0
+        self.delivered = 0
+        self.skipped_large = 0
+        self.last_sync_at = None
+
+
+class CorpusSync(threading.Thread):
+    """
+    Periodic content-deduplicated corpus exchange between instances.
+    """
+
+    def __init__(self, interval: float = None, max_entry_size: int = None,
+                 force_polling: bool = None, settle: float = None):
+        super().__init__(daemon=True, name="corpus-sync")
+
+        cfg = get_config().get("corpus_sync", {})
+
+        self.enabled = cfg.get("enabled", True)
+        self.interval = interval or cfg.get("interval", 30)
+        self.max_entry_size = max_entry_size or cfg.get("max_entry_kb", 1024) * 1024
+        self.settle = settle if settle is not None else cfg.get("settle_seconds", 2.0)
+        if force_polling is None:
+            force_polling = cfg.get("force_polling", False)
+
+        self._watcher = DirectoryWatcher(force_polling=force_polling)
+        self._lock = threading.Lock()
+        # One round at a time; file I/O happens outside _lock
+        self._sync_lock = threading.Lock()
+        self._campaigns: Dict[str, _Campaign] = {}
+        # New entries still being written, retried next round
+        self._deferred: List[str] = []
+
+        # queue dir -> (campaign_id, fuzzer_id)
+        self._owners: Dict[str, Tuple[str, str]] = {}
+
+        self._running = True
+        self._wake = threading.Event()
+
+        self._rounds = 0
+        self._errors = 0
+        self._last_round_ms = None
+
+    # -----------------------------------------
+    # Membership
+    # -----------------------------------------
+
+    def add(self, fuzzer):
+        queue_dirs = [os.path.abspath(d) for d in fuzzer.queue_dirs()]
+        target = fuzzer.corpus_import()
+
+        if not queue_dirs and target is None:
+            return
+
+        with self._lock:
+            campaign = self._campaigns.setdefault(fuzzer.campaign_id, _Campaign())
+
+            key = None
+            if target is not None:
+                t = _Target(*target)
+                key = t.key
+                campaign.targets.setdefault(key, t)
+
+            campaign.instances[fuzzer.id] = (queue_dirs, key)
+
+            for path in queue_dirs:
+                self._owners[path] = (fuzzer.campaign_id, fuzzer.id)
+                self._watcher.add(path)
+
+    def remove(self, fuzzer_id: str):
+        """
+        Stop syncing an instance. What it contributed stays indexed.
+        """
+        with self._lock:
+            for campaign_id, campaign in self._campaigns.items():
+                entry = campaign.instances.pop(fuzzer_id, None)
+                if entry is None:
+                    continue
+
+                queue_dirs, key = entry
+                for path in queue_dirs:
+                    if self._owners.get(path, (None, None))[1] != fuzzer_id:
+                        continue
+
+                    # Hand a shared queue dir over to an instance still using it
+                    heir = next(
+                        (fid for fid, (dirs, _) in campaign.instances.items() if path in dirs),
+                        None,
+                    )
+                    if heir is not None:
+                        self._owners[path] = (campaign_id, heir)
+                    else:
+                        del self._owners[path]
+                        self._watcher.remove(path)
+
+                if key and not any(k == key for _, k in campaign.instances.values()):
+                    campaign.targets.pop(key, None)
+                return
+
+    # -----------------------------------------
+    # Sync Loop
+    # -----------------------------------------
+
+    def run(self):
+        while self._running:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if not self._running:
+                break
+            if self.enabled:
+                self.sync()
+
+    def stop(self, timeout: float = 5.0):
+        self._running = False
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout)
+        with self._lock:
+            self._watcher.close()
+
+    def sync_now(self):
+        self._wake.set()
+
+    def sync(self):
+        """
+        One round: collect new queue entries, deliver unseen ones.
+        """
+        with self._sync_lock:
+            started = time.perf_counter()
+            work = []
+
+            with self._lock:
+                for path in self._settled(self._watcher.poll()):
+                    owner = self._owners.get(os.path.dirname(path))
+                    if owner is None or not _is_entry(os.path.basename(path)):
+                        continue
+
+                    campaign = self._campaigns.get(owner[0])
+                    if campaign is None:
+                        continue
+
+                    source = campaign.instances.get(owner[1], ((), None))[1]
+                    targets = [t for k, t in campaign.targets.items() if k != source]
+                    work.append((campaign, targets, path))
+
+            for campaign, targets, path in work:
+                try:
+                    self._collect(campaign, targets, path)
+                except OSError as e:
+                    self._errors += 1
+                    print(f"[!] Corpus sync failed for {path}: {e}")
+
+            with self._lock:
+                now = time.time()
+                for campaign in self._campaigns.values():
+                    campaign.last_sync_at = now
+
+                self._rounds += 1
+                self._last_round_ms = (time.perf_counter() - started) * 1000.0
+
+    def _settled(self, paths: List[str]) -> List[str]:
+        # Files listed by a scan (first watch, polling fallback, queue
+        # overflow) rather than reported by IN_CLOSE_WRITE may still be
+        # growing; only take files not modified for the settle time
+        ready = []
+        waiting = []
+        cutoff = time.time_ns() - int(self.settle * 1e9)
+
+        for path in self._deferred + paths:
+            sig = file_signature(path)
+            if sig is None:
+                continue
+            if sig[0] > cutoff:
+                waiting.append(path)
+            else:
+                ready.append(path)
+
+        self._deferred = waiting
+        return ready
+
+    def _collect(self, campaign: _Campaign, targets: List[_Target], path: str):
+        try:
+            if os.path.getsize(path) > self.max_entry_size:
+                campaign.skipped_large += 1
+                return
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            # Trimmed or removed by the fuzzer before we got to it
+            return
+
+        digest = hashlib.sha256(data).digest()
+        campaign.collected += 1
+
+        if digest in campaign.hashes:
+            campaign.duplicates += 1
+            return
+        campaign.hashes.add(digest)
+
+        sha256 = digest.hex()
+        for target in targets:
+            if target.deliver(sha256, data):
+                campaign.delivered += 1
+
+    # -----------------------------------------
+    # Monitoring
+    # -----------------------------------------
+
+    def campaign_stats(self, campaign_id: str) -> Optional[dict]:
+        with self._lock:
+            campaign = self._campaigns.get(campaign_id)
+            if campaign is None:
+                return None
+
+            return {
+                "campaign_id": campaign_id,
+                "instances": len(campaign.instances),
+                "unique_entries": len(campaign.hashes),
+                "collected": campaign.collected,
+                "duplicates": campaign.duplicates,
+                "delivered": campaign.delivered,
+                "skipped_large": campaign.skipped_large,
+                "last_sync_at": campaign.last_sync_at,
+                "targets": [
+                    {"style": t.style, "dir": t.dir, "delivered": t.delivered}
+                    for t in campaign.targets.values()
+                ],
+            }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "uses_inotify": self._watcher.uses_inotify,
+                "campaigns": len(self._campaigns),
+                "watched_dirs": len(self._owners),
+                "deferred": len(self._deferred),
+                "unique_entries": sum(len(c.hashes) for c in self._campaigns.values()),
+                "delivered": sum(c.delivered for c in self._campaigns.values()),
+                "rounds": self._rounds,
+                "errors": self._errors,
+                "last_round_ms": self._last_round_ms,
+            }
@@ -5,6 +5,7 @@ File: fuzzhub/core/daemon.py
 import uvicorn
 
 from fuzzhub.database.init_db import init_database
+from fuzzhub.collectors.rollups import MetricsRollup
 from fuzzhub.core.event_bus import EventBus
 from fuzzhub.core.campaign_manager import CampaignManager
 from fuzzhub.api.app import create_api
@@ -16,6 +17,7 @@ class FuzzHubDaemon:
 
     Responsibilities:
     - Initialize database
+    - Start metric rollup / retention job
     - Create shared EventBus
     - Create CampaignManager
     - Create FastAPI app
@@ -32,6 +34,13 @@ class FuzzHubDaemon:
 
         init_database()
 
+        # -----------------------------------------
+        # Metric rollups and retention
+        # -----------------------------------------
+
+        self.metrics_rollup = MetricsRollup()
+        self.metrics_rollup.start()
+
         # -----------------------------------------
         # Shared EventBus (single instance)
         # -----------------------------------------
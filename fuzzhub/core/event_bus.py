@@ -3,34 +3,256 @@ File: fuzzhub/core/event_bus.py
 
 Thread-safe internal event bus with structured events
 and optional wildcard + async handler support.
+
+In "async" mode emit() only enqueues: every subscriber has its own
+bounded queue drained by a delivery thread, so a slow subscriber
+never stalls the emitting thread (or the others). What happens when a
+queue is full is the subscriber's backpressure policy:
+
+    drop_oldest   discard the oldest queued event
+    block         wait up to block_timeout for room, then drop the new event
+    coalesce      like drop_oldest, but an event with the same coalescing
+                  key as one still queued replaces it in place
+                  (e.g. successive fuzzer_update events for one instance)
+
+An async handler runs on its event loop, and the delivery thread
+waits for it to finish (up to handler_timeout, after which it is
+cancelled) before taking the next event, so the queue and its policy
+also bound work piling up on the loop.
+
+"sync" mode keeps the original behaviour of calling every handler on
+the emitting thread.
 """
 
 import threading
 import asyncio
-from typing import Callable, Dict, List, Any
+import concurrent.futures
+from collections import deque
+from typing import Callable, Dict, List, Any, Optional
 from datetime import datetime
 
+from fuzzhub.utils.config import get_config
+
+
+POLICIES = ("drop_oldest", "block", "coalesce")
+
+
+def _lookup(payload: Dict[str, Any], path: str):
+    value = payload
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+class _Subscriber:
+    """
+    One handler's bounded queue and delivery thread.
+    """
+
+    def __init__(self, handler: Callable, loop, policy: str, maxsize: int,
+                 block_timeout: float, coalesce_keys: Dict[str, str],
+                 handler_timeout: float = 5.0):
+        self.handler = handler
+        self.loop = loop
+        self.policy = policy
+        self.maxsize = maxsize
+        self.block_timeout = block_timeout
+        self.handler_timeout = handler_timeout
+        self.coalesce_keys = coalesce_keys
+        self.is_async = asyncio.iscoroutinefunction(handler)
+
+        # Entries are [key, event]; coalescing swaps the event in place
+        self._queue = deque()
+        self._keyed: Dict[tuple, list] = {}
+        self._cond = threading.Condition()
+        self._running = True
+
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.no_loop = 0
+        self.max_depth = 0
+
+        self._thread = threading.Thread(
+            target=self._run, name=f"event-bus-{getattr(handler, '__name__', 'handler')}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    # -----------------------------------------
+    # Producer side
+    # -----------------------------------------
+
+    def offer(self, event: Dict[str, Any]):
+        key = None
+        if self.policy == "coalesce":
+            path = self.coalesce_keys.get(event["type"])
+            if path:
+                value = _lookup(event["payload"], path)
+                if value is not None:
+                    key = (event["type"], value)
+
+        with self._cond:
+            if not self._running:
+                return
+
+            if key is not None:
+                entry = self._keyed.get(key)
+                if entry is not None:
+                    entry[1] = event
+                    self.coalesced += 1
+                    return
+
+            if len(self._queue) >= self.maxsize:
+                if self.policy == "block":
+                    self._cond.wait_for(
+                        lambda: len(self._queue) < self.maxsize or not self._running,
+                        timeout=self.block_timeout,
+                    )
+                    if len(self._queue) >= self.maxsize or not self._running:
+                        self.dropped += 1
+                        return
+                else:
+                    self._forget(self._queue.popleft())
+                    self.dropped += 1
+
+            entry = [key, event]
+            self._queue.append(entry)
+            if key is not None:
+                self._keyed[key] = entry
+            self.max_depth = max(self.max_depth, len(self._queue))
+            self._cond.notify_all()
+
+    def _forget(self, entry: list):
+        key = entry[0]
+        if key is not None and self._keyed.get(key) is entry:
+            del self._keyed[key]
+
+    # -----------------------------------------
+    # Delivery thread
+    # -----------------------------------------
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and self._running:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                entry = self._queue.popleft()
+                self._forget(entry)
+                # Room for a blocked producer
+                self._cond.notify_all()
+
+            self._deliver(entry[1])
+
+    def _deliver(self, event: Dict[str, Any]):
+        try:
+            if self.is_async:
+                if self.loop is None or self.loop.is_closed():
+                    self.no_loop += 1
+                    return
+                future = asyncio.run_coroutine_threadsafe(self.handler(event), self.loop)
+                try:
+                    # One handler call in flight at a time
+                    future.result(self.handler_timeout)
+                except concurrent.futures.TimeoutError:
+                    future.cancel()
+                    self.timeouts += 1
+                    return
+            else:
+                self.handler(event)
+            self.delivered += 1
+        except Exception:
+            # Never let one subscriber break others
+            self.errors += 1
+
+    def close(self, timeout: float = 1.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "handler": getattr(self.handler, "__qualname__", repr(self.handler)),
+            "policy": self.policy,
+            "depth": len(self._queue),
+            "max_depth": self.max_depth,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "no_loop": self.no_loop,
+        }
+
 
 class EventBus:
-    def __init__(self):
+    def __init__(self, mode: Optional[str] = None):
+        cfg = get_config().get("event_bus", {})
+
+        self.mode = mode or cfg.get("mode", "async")
+        if self.mode not in ("sync", "async"):
+            raise ValueError(f"Unknown event bus mode: {self.mode}")
+
+        self.policy = cfg.get("policy", "coalesce")
+        self.queue_size = max(1, int(cfg.get("queue_size", 10000)))
+        self.block_timeout = float(cfg.get("block_timeout", 1.0))
+        self.handler_timeout = float(cfg.get("handler_timeout", 5.0))
+        self.coalesce_keys = dict(cfg.get("coalesce", {"fuzzer_update": "fuzzer.id"}))
+
         # event_type -> list[handler]
         self._subscribers: Dict[str, List[Callable]] = {}
+        # (event_type, handler) -> _Subscriber (async mode)
+        self._queues: Dict[tuple, _Subscriber] = {}
+        # handler -> loop it was subscribed from (async handlers)
+        self._loops: Dict[Callable, Any] = {}
         self._lock = threading.Lock()
 
+        self.emitted = 0
+
     # --------------------------------------------------
     # Subscription Management
     # --------------------------------------------------
 
-    def subscribe(self, event_type: str, handler: Callable):
+    def subscribe(self, event_type: str, handler: Callable,
+                  policy: Optional[str] = None, maxsize: Optional[int] = None):
         """
         Subscribe to a specific event type.
 
-        Use "*" to subscribe to all events.
+        Use "*" to subscribe to all events. policy / maxsize override
+        the configured backpressure for this subscription (async mode).
+        Async handlers run on the event loop they were subscribed from.
         """
+        policy = policy or self.policy
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
         with self._lock:
             self._subscribers.setdefault(event_type, [])
-            if handler not in self._subscribers[event_type]:
-                self._subscribers[event_type].append(handler)
+            if handler in self._subscribers[event_type]:
+                return
+            self._subscribers[event_type].append(handler)
+
+            if loop is not None:
+                self._loops[handler] = loop
+
+            if self.mode == "async":
+                self._queues[(event_type, handler)] = _Subscriber(
+                    handler, loop, policy, maxsize or self.queue_size,
+                    self.block_timeout, self.coalesce_keys, self.handler_timeout,
+                )
 
     def unsubscribe(self, event_type: str, handler: Callable):
         with self._lock:
@@ -41,6 +263,25 @@ class EventBus:
                 if not self._subscribers[event_type]:
                     del self._subscribers[event_type]
 
+            subscriber = self._queues.pop((event_type, handler), None)
+
+            if not any(handler in hs for hs in self._subscribers.values()):
+                self._loops.pop(handler, None)
+
+        if subscriber is not None:
+            subscriber.close()
+
+    def close(self):
+        """
+        Stop all delivery threads (events still queued are discarded).
+        """
+        with self._lock:
+            subscribers = list(self._queues.values())
+            self._queues.clear()
+
+        for subscriber in subscribers:
+            subscriber.close()
+
     # --------------------------------------------------
     # Event Emission
     # --------------------------------------------------
@@ -55,6 +296,10 @@ class EventBus:
             "timestamp": str (UTC ISO),
             "payload": dict
         }
+
+        In async mode this never runs a handler; it returns as soon as
+        the event is queued for every subscriber (only the "block"
+        policy can make it wait).
         """
 
         event = {
@@ -63,6 +308,20 @@ class EventBus:
             "payload": payload,
         }
 
+        self.emitted += 1
+
+        if self.mode == "async":
+            with self._lock:
+                subscribers = [
+                    self._queues[(key, handler)]
+                    for key in (event_type, "*")
+                    for handler in self._subscribers.get(key, [])
+                ]
+
+            for subscriber in subscribers:
+                subscriber.offer(event)
+            return
+
         with self._lock:
             specific_handlers = list(self._subscribers.get(event_type, []))
             wildcard_handlers = list(self._subscribers.get("*", []))
@@ -74,13 +333,33 @@ class EventBus:
                 # If handler is async, schedule it
                 if asyncio.iscoroutinefunction(handler):
                     try:
-                        asyncio.create_task(handler(event))
+                        asyncio.get_running_loop().create_task(handler(event))
                     except RuntimeError:
-                        # No running loop (e.g. non-async context)
-                        pass
+                        # Not on a loop: hand it to the one it subscribed from
+                        loop = self._loops.get(handler)
+                        if loop is not None and not loop.is_closed():
+                            asyncio.run_coroutine_threadsafe(handler(event), loop)
                 else:
                     handler(event)
 
             except Exception:
                 # Never let one subscriber break others
                 pass
+
+    # --------------------------------------------------
+    # Introspection
+    # --------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            subscribers = [
+                {"event_type": key[0], **s.stats()} for key, s in self._queues.items()
+            ]
+
+        return {
+            "mode": self.mode,
+            "emitted": self.emitted,
+            "dropped": sum(s["dropped"] for s in subscribers),
+            "coalesced": sum(s["coalesced"] for s in subscribers),
+            "subscribers": subscribers,
+        }
@@ -0,0 +1,111 @@
+"""
+File: fuzzhub/core/fuzzer_state.py
+
+Authoritative in-memory table of the latest known state, metrics
+and crash count for every fuzzer instance.
+
+Collectors push updates into the table as they observe them; API
+listings read from it without touching the database.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+from fuzzhub.database.session import SessionLocal
+from fuzzhub.database.queries import fuzzer_rows
+
+
+METRIC_KEYS = ("exec_per_sec", "corpus_size", "coverage")
+
+
+def _empty_entry(fuzzer_id: str) -> dict:
+    return {
+        "id": fuzzer_id,
+        "campaign_id": None,
+        "fuzzer_type": None,
+        "state": "stopped",
+        "pid": None,
+        "exec_per_sec": None,
+        "corpus_size": None,
+        "coverage": None,
+        "crash_count": 0,
+    }
+
+
+class FuzzerStateTable:
+
+    def __init__(self):
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    # -----------------------------------------
+    # Startup
+    # -----------------------------------------
+
+    def warm(self):
+        """
+        Load every known instance with its latest metrics and crash
+        count in one set-based query.
+        """
+        db = SessionLocal()
+        try:
+            rows, _ = fuzzer_rows(db)
+        finally:
+            db.close()
+
+        entries = {}
+
+        for row in rows:
+            entry = _empty_entry(row["id"])
+            entry.update({key: row[key] for key in entry})
+            entries[row["id"]] = entry
+
+        with self._lock:
+            self._entries = entries
+
+        print(f"[*] Fuzzer state table warmed ({len(entries)} instances)")
+
+    # -----------------------------------------
+    # Updates
+    # -----------------------------------------
+
+    def register(self, fuzzer_id: str, campaign_id: str, fuzzer_type: str,
+                 state: str, pid: Optional[int]):
+        with self._lock:
+            entry = self._entries.setdefault(fuzzer_id, _empty_entry(fuzzer_id))
+            entry.update(
+                campaign_id=campaign_id,
+                fuzzer_type=fuzzer_type,
+                state=state,
+                pid=pid,
+            )
+
+    def set_state(self, fuzzer_id: str, state: str, pid: Optional[int]):
+        with self._lock:
+            entry = self._entries.setdefault(fuzzer_id, _empty_entry(fuzzer_id))
+            entry["state"] = state
+            entry["pid"] = pid
+
+    def update_metrics(self, fuzzer_id: str, metrics: dict):
+        with self._lock:
+            entry = self._entries.setdefault(fuzzer_id, _empty_entry(fuzzer_id))
+            for key in METRIC_KEYS:
+                entry[key] = metrics.get(key)
+
+    def add_crashes(self, fuzzer_id: str, count: int = 1):
+        with self._lock:
+            entry = self._entries.setdefault(fuzzer_id, _empty_entry(fuzzer_id))
+            entry["crash_count"] += count
+
+    # -----------------------------------------
+    # Reads
+    # -----------------------------------------
+
+    def get(self, fuzzer_id: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(fuzzer_id)
+            return dict(entry) if entry else None
+
+    def list(self) -> List[dict]:
+        with self._lock:
+            return [dict(entry) for entry in self._entries.values()]
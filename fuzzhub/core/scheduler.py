@@ -0,0 +1,457 @@
+"""
+File: fuzzhub/core/scheduler.py
+
+Central scheduler for periodic per-fuzzer collection jobs, and CPU
+placement for fuzzer processes.
+
+A single timer thread keeps a heap of due times and hands due jobs
+to a small worker pool, replacing one sleeping thread per collector.
+
+CorePlacement gives every new fuzzer dedicated CPUs from the topology
+in /sys: whole physical cores before SMT siblings, and a campaign's
+instances on one NUMA node. BaseFuzzer.start launches the fuzzer
+through a taskset (or python helper) prefix that sets the mask and
+then execs it (utils/process.py:pinned_command), so every thread the
+fuzzer creates inherits it.
+"""
+
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set
+
+from fuzzhub.utils.config import get_config
+
+
+class _Job:
+
+    __slots__ = ("job_id", "fn", "interval", "due", "running", "cancelled")
+
+    def __init__(self, job_id: str, fn: Callable, interval: float, due: float):
+        self.job_id = job_id
+        self.fn = fn
+        self.interval = interval
+        self.due = due
+        self.running = False
+        self.cancelled = False
+
+
+class CollectionScheduler(threading.Thread):
+    """
+    Heap-based periodic job runner.
+
+    - schedule() places a job at a random offset within its first
+      interval so jobs added together do not fire together.
+    - Every subsequent run is jittered by +/- `jitter` * interval.
+    - A job never overlaps itself; if it is still running when due,
+      that tick is skipped and counted as an overrun.
+    - cancel() is O(1): the job is dropped from the index and its
+      heap entry is discarded lazily when it surfaces.
+    """
+
+    def __init__(self, workers: int = None, jitter: float = None):
+        super().__init__(daemon=True, name="collection-scheduler")
+
+        cfg = get_config().get("scheduler", {})
+
+        self.workers = workers or cfg.get("workers", 8)
+        self.jitter = jitter if jitter is not None else cfg.get("jitter", 0.1)
+
+        self._heap = []
+        self._jobs: Dict[str, _Job] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="collector",
+        )
+        self._running = True
+
+        self._dispatched = 0
+        self._overruns = 0
+        self._errors = 0
+        self._max_lag_ms = 0.0
+
+    # -----------------------------------------
+    # Job Management
+    # -----------------------------------------
+
+    def schedule(self, job_id: str, fn: Callable, interval: float,
+                 initial_delay: float = None) -> str:
+        if initial_delay is None:
+            initial_delay = random.uniform(0, interval)
+
+        with self._cond:
+            old = self._jobs.pop(job_id, None)
+            if old:
+                old.cancelled = True
+
+            job = _Job(job_id, fn, interval, time.monotonic() + initial_delay)
+            self._jobs[job_id] = job
+            heapq.heappush(self._heap, (job.due, next(self._seq), job))
+            self._cond.notify()
+
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        with self._cond:
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                return False
+            job.cancelled = True
+
+            # Keep the heap from filling up with dead entries under churn
+            if len(self._heap) > 2 * len(self._jobs) + 64:
+                self._heap = [e for e in self._heap if not e[2].cancelled]
+                heapq.heapify(self._heap)
+
+        return True
+
+    # -----------------------------------------
+    # Timer Loop
+    # -----------------------------------------
+
+    def run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+
+                    delay = self._heap[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+
+                if not self._running:
+                    break
+
+                due, _, job = heapq.heappop(self._heap)
+
+                if job.cancelled:
+                    continue
+
+                now = time.monotonic()
+                self._max_lag_ms = max(self._max_lag_ms, (now - due) * 1000.0)
+
+                if job.running:
+                    self._overruns += 1
+                else:
+                    job.running = True
+                    self._dispatched += 1
+                    try:
+                        self._pool.submit(self._execute, job)
+                    except RuntimeError:
+                        # Pool shut down (daemon or interpreter exiting)
+                        self._running = False
+                        break
+
+                spread = job.interval * self.jitter
+                job.due = max(now, due + job.interval) + random.uniform(-spread, spread)
+                heapq.heappush(self._heap, (job.due, next(self._seq), job))
+
+    def _execute(self, job: _Job):
+        try:
+            job.fn()
+        except Exception as e:
+            self._errors += 1
+            print(f"[!] Scheduled job {job.job_id} failed: {e}")
+        finally:
+            job.running = False
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._jobs.clear()
+            self._cond.notify()
+        self._pool.shutdown(wait=False)
+
+    # -----------------------------------------
+    # Monitoring
+    # -----------------------------------------
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "jobs": len(self._jobs),
+                "heap_size": len(self._heap),
+                "workers": self.workers,
+                "dispatched": self._dispatched,
+                "overruns": self._overruns,
+                "errors": self._errors,
+                "max_lag_ms": self._max_lag_ms,
+            }
+
+
+# -------------------------------------------------
+# CPU Topology
+# -------------------------------------------------
+
+def _parse_cpulist(text: str) -> List[int]:
+    """
+    "0-3,8,10-11" -> [0, 1, 2, 3, 8, 10, 11]
+    """
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        if "-" in part:
+            low, high = part.split("-", 1)
+            cpus.extend(range(int(low), int(high) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+class CpuTopology:
+    """
+    Online CPUs usable by the daemon, grouped into physical cores and
+    NUMA nodes.
+    """
+
+    def __init__(self, cpus: Dict[int, tuple], nodes: Dict[int, int]):
+        # cpu -> physical core key (package, core_id); cpu -> node
+        self.core_of = cpus
+        self.node_of = nodes
+
+    @classmethod
+    def discover(cls, sys_root: str = "/sys") -> "CpuTopology":
+        cpu_root = os.path.join(sys_root, "devices", "system", "cpu")
+
+        online = _read(os.path.join(cpu_root, "online"))
+        cpus = _parse_cpulist(online) if online else list(range(os.cpu_count() or 1))
+
+        # cgroup cpusets / taskset on the daemon limit what we may hand out
+        if sys_root == "/sys" and hasattr(os, "sched_getaffinity"):
+            allowed = os.sched_getaffinity(0)
+            cpus = [c for c in cpus if c in allowed]
+
+        core_of = {}
+        for cpu in cpus:
+            topo = os.path.join(cpu_root, f"cpu{cpu}", "topology")
+            core_id = _read(os.path.join(topo, "core_id"))
+            package = _read(os.path.join(topo, "physical_package_id"))
+            if core_id is None:
+                # No topology exported: treat every CPU as its own core
+                core_of[cpu] = (0, cpu)
+            else:
+                core_of[cpu] = (int(package or 0), int(core_id))
+
+        node_of = {cpu: 0 for cpu in cpus}
+        node_root = os.path.join(sys_root, "devices", "system", "node")
+        try:
+            names = os.listdir(node_root)
+        except OSError:
+            names = []
+        for name in names:
+            if not (name.startswith("node") and name[4:].isdigit()):
+                continue
+            cpulist = _read(os.path.join(node_root, name, "cpulist"))
+            for cpu in _parse_cpulist(cpulist or ""):
+                if cpu in node_of:
+                    node_of[cpu] = int(name[4:])
+
+        return cls(core_of, node_of)
+
+    @property
+    def cpus(self) -> List[int]:
+        return sorted(self.core_of)
+
+    def nodes(self) -> List[int]:
+        return sorted(set(self.node_of.values()))
+
+    def describe(self) -> dict:
+        nodes = {}
+        for cpu in self.cpus:
+            node = nodes.setdefault(self.node_of[cpu], {"cpus": [], "cores": set()})
+            node["cpus"].append(cpu)
+            node["cores"].add(self.core_of[cpu])
+
+        return {
+            "cpus": len(self.core_of),
+            "physical_cores": len(set(self.core_of.values())),
+            "nodes": {
+                str(n): {"cpus": v["cpus"], "physical_cores": len(v["cores"])}
+                for n, v in sorted(nodes.items())
+            },
+        }
+
+
+# -------------------------------------------------
+# Core Placement
+# -------------------------------------------------
+
+class PlacementError(RuntimeError):
+    pass
+
+
+class CorePlacement:
+    """
+    Dedicated-core allocator for fuzzer processes.
+
+    allocate() returns the CPUs for a new instance, or None when the
+    request cannot be met; what happens then (refuse, queue, or run
+    unpinned) is the on_full policy applied by CampaignManager.
+    """
+
+    def __init__(self, topology: CpuTopology = None):
+        cfg = get_config().get("placement", {})
+
+        self.enabled = cfg.get("enabled", True)
+        self.allow_smt = cfg.get("allow_smt", True)
+        self.strict_numa = cfg.get("strict_numa", False)
+        self.on_full = cfg.get("on_full", "queue")
+        if self.on_full not in ("refuse", "queue", "share"):
+            raise ValueError("placement.on_full must be refuse, queue or share")
+
+        self.topology = topology or CpuTopology.discover()
+        reserved = set(cfg.get("reserved_cpus", []))
+        self._usable = [c for c in self.topology.cpus if c not in reserved]
+
+        self._lock = threading.Lock()
+        # fuzzer_id -> (campaign_id, cpus)
+        self._allocations: Dict[str, tuple] = {}
+        self._taken: Set[int] = set()
+
+        self._refused = 0
+
+    # -----------------------------------------
+    # Allocation
+    # -----------------------------------------
+
+    def allocate(self, fuzzer_id: str, campaign_id: str, count: int = 1) -> Optional[List[int]]:
+        if not self.enabled or count <= 0:
+            return []
+
+        with self._lock:
+            home = self._campaign_node(campaign_id)
+
+            nodes = self._node_order(home)
+            if self.strict_numa and home is not None:
+                nodes = [home]
+
+            for node in nodes:
+                cpus = self._pick(node, count)
+                if cpus:
+                    self._allocations[fuzzer_id] = (campaign_id, cpus)
+                    self._taken.update(cpus)
+                    return cpus
+
+            self._refused += 1
+            return None
+
+    def claim(self, fuzzer_id: str, campaign_id: str, cpus: List[int]):
+        """
+        Record CPUs already held by a process (e.g. after recovery).
+        """
+        cpus = [c for c in cpus if c in self.topology.core_of]
+        if not self.enabled or not cpus or len(cpus) >= len(self._usable):
+            return
+        with self._lock:
+            self._allocations[fuzzer_id] = (campaign_id, cpus)
+            self._taken.update(cpus)
+
+    def release(self, fuzzer_id: str):
+        with self._lock:
+            entry = self._allocations.pop(fuzzer_id, None)
+            if entry:
+                self._taken.difference_update(entry[1])
+
+    def cpus_of(self, fuzzer_id: str) -> Optional[List[int]]:
+        with self._lock:
+            entry = self._allocations.get(fuzzer_id)
+            return list(entry[1]) if entry else None
+
+    def _campaign_node(self, campaign_id: str) -> Optional[int]:
+        counts = {}
+        for owner, cpus in self._allocations.values():
+            if owner == campaign_id:
+                for cpu in cpus:
+                    node = self.topology.node_of[cpu]
+                    counts[node] = counts.get(node, 0) + 1
+        if not counts:
+            return None
+        return max(counts, key=lambda n: (counts[n], -n))
+
+    def _node_order(self, home: Optional[int]) -> List[int]:
+        core_of = self.topology.core_of
+        busy_cores = {core_of[c] for c in self._taken}
+
+        free_cores = {}
+        for cpu in self._usable:
+            if core_of[cpu] in busy_cores:
+                continue
+            node = self.topology.node_of[cpu]
+            free_cores.setdefault(node, set()).add(core_of[cpu])
+
+        # Home node first, then the node with the most idle physical cores
+        others = sorted(
+            (n for n in self.topology.nodes() if n != home),
+            key=lambda n: (-len(free_cores.get(n, ())), n),
+        )
+        return ([home] if home is not None else []) + others
+
+    def _pick(self, node: int, count: int) -> Optional[List[int]]:
+        core_of = self.topology.core_of
+        busy_cores = {core_of[c] for c in self._taken}
+
+        idle = []
+        siblings = []
+        seen_cores = set()
+
+        for cpu in self._usable:
+            if cpu in self._taken or self.topology.node_of[cpu] != node:
+                continue
+            core = core_of[cpu]
+            if core in busy_cores or core in seen_cores:
+                siblings.append(cpu)
+            else:
+                # First free thread of an idle physical core
+                seen_cores.add(core)
+                idle.append(cpu)
+
+        candidates = idle + (siblings if self.allow_smt else [])
+        if len(candidates) < count:
+            return None
+        return sorted(candidates[:count])
+
+    # -----------------------------------------
+    # Monitoring
+    # -----------------------------------------
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "on_full": self.on_full,
+                "usable_cpus": len(self._usable),
+                "allocated_cpus": len(self._taken),
+                "free_cpus": len(self._usable) - len(self._taken & set(self._usable)),
+                "instances": len(self._allocations),
+                "refused": self._refused,
+            }
+
+    def describe(self) -> dict:
+        with self._lock:
+            allocations = {
+                fid: {"campaign_id": cid, "cpus": cpus}
+                for fid, (cid, cpus) in self._allocations.items()
+            }
+        return {
+            "topology": self.topology.describe(),
+            "allocations": allocations,
+            **self.stats(),
+        }
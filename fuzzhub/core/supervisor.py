@@ -0,0 +1,416 @@
+"""
+File: fuzzhub/core/supervisor.py
+
+Event-driven supervisor for fuzzer processes.
+
+Every supervised process is represented by a pidfd registered with one
+epoll instance, so a single thread notices each exit as soon as the
+kernel reports it, with no per-process threads or PID polling. Own
+children are reaped through their Popen (which also records the exit
+status); processes adopted after a daemon restart are not our children
+and exit with status "lost". Without pidfd support (Linux < 5.3) the
+same loop falls back to polling every watched process each
+fallback_poll_interval.
+
+Exits are classified as:
+
+    exited    return code 0
+    failed    non-zero return code
+    signaled  terminated by a signal
+    killed    SIGKILL (usually the OOM killer or a memory limit)
+    lost      exit status unavailable (adopted process)
+
+Unexpected exits are restarted through the respawn callback after a
+per-instance exponential backoff (initial * factor^(n-1), capped at
+max, with jitter). The failure count resets once an instance has
+stayed up for reset_after seconds; after max_restarts restarts within
+restart_window seconds the supervisor gives up on the instance.
+"""
+
+import heapq
+import os
+import random
+import select
+import signal
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from fuzzhub.utils.config import get_config
+from fuzzhub.utils.process import open_pidfd, process_start_time
+
+
+EXIT_CLEAN = "exited"
+EXIT_FAILED = "failed"
+EXIT_SIGNALED = "signaled"
+EXIT_KILLED = "killed"
+EXIT_LOST = "lost"
+SPAWN_FAILED = "spawn_failed"
+
+
+def classify_exit(returncode: Optional[int]) -> dict:
+    if returncode is None:
+        return {"reason": EXIT_LOST, "returncode": None, "signal": None}
+    if returncode == 0:
+        return {"reason": EXIT_CLEAN, "returncode": 0, "signal": None}
+    if returncode > 0:
+        return {"reason": EXIT_FAILED, "returncode": returncode, "signal": None}
+
+    signum = -returncode
+    try:
+        name = signal.Signals(signum).name
+    except ValueError:
+        name = str(signum)
+
+    return {
+        "reason": EXIT_KILLED if signum == signal.SIGKILL else EXIT_SIGNALED,
+        "returncode": returncode,
+        "signal": name,
+    }
+
+
+class _Watch:
+
+    def __init__(self, fuzzer_id: str, pid: int, proc=None, pidfd: int = None,
+                 create_time: float = None):
+        self.fuzzer_id = fuzzer_id
+        self.pid = pid
+        self.proc = proc
+        self.pidfd = pidfd
+        # Identifies the process in polling mode
+        self.create_time = create_time
+        self.started = time.monotonic()
+
+
+class _Backoff:
+
+    def __init__(self):
+        self.failures = 0
+        self.restarts = deque()
+
+
+class ProcessSupervisor(threading.Thread):
+    """
+    Watches fuzzer processes and restarts them when they die.
+
+    on_exit(fuzzer_id, info) is called for every unexpected exit, with
+    the classified exit plus "uptime_seconds", "restart_in" (seconds,
+    or None if no restart follows) and "gave_up". respawn(fuzzer_id)
+    must start the instance again and watch() the new process; it
+    returns False when the instance can no longer be restarted.
+    """
+
+    def __init__(self, on_exit: Callable[[str, dict], None],
+                 respawn: Callable[[str], bool]):
+        super().__init__(daemon=True, name="process-supervisor")
+
+        cfg = get_config().get("supervisor", {})
+
+        self.restart = cfg.get("restart", True)
+        self.restart_on_clean_exit = cfg.get("restart_on_clean_exit", False)
+        self.backoff_initial = cfg.get("backoff_initial", 1.0)
+        self.backoff_factor = cfg.get("backoff_factor", 2.0)
+        self.backoff_max = cfg.get("backoff_max", 300.0)
+        self.jitter = cfg.get("jitter", 0.1)
+        self.reset_after = cfg.get("reset_after", 600)
+        self.max_restarts = cfg.get("max_restarts", 10)
+        self.restart_window = cfg.get("restart_window", 3600)
+        self.poll_interval = cfg.get("fallback_poll_interval", 0.5)
+
+        self._on_exit = on_exit
+        self._respawn = respawn
+
+        self._lock = threading.Lock()
+        self._watches: Dict[str, _Watch] = {}
+        self._by_fd: Dict[int, _Watch] = {}
+        self._backoff: Dict[str, _Backoff] = {}
+
+        # (due monotonic, seq, fuzzer_id); entries not in _pending are stale
+        self._due = []
+        self._pending: Dict[str, int] = {}
+        self._seq = 0
+
+        self._epoll = select.epoll() if hasattr(select, "epoll") else None
+        self.uses_pidfd = self._epoll is not None and hasattr(os, "pidfd_open")
+
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        if self._epoll is not None:
+            self._epoll.register(self._wake_r, select.EPOLLIN)
+
+        self._running = True
+
+        self._exits: Dict[str, int] = {}
+        self._restarts = 0
+        self._spawn_failures = 0
+        self._gave_up = 0
+        self._last_handle_ms = None
+
+    # -----------------------------------------
+    # Watch API
+    # -----------------------------------------
+
+    def watch(self, fuzzer_id: str, proc=None, pid: int = None,
+              pidfd: int = None) -> bool:
+        """
+        Supervise a Popen (own child) or a bare pid / pidfd (adopted).
+        Returns False if the process is already gone.
+        """
+        pid = proc.pid if proc is not None else pid
+
+        if self.uses_pidfd and pidfd is None:
+            pidfd = open_pidfd(pid)
+            if pidfd is None:
+                return False
+
+        create_time = None if self.uses_pidfd else process_start_time(pid)
+        watch = _Watch(fuzzer_id, pid, proc, pidfd, create_time)
+
+        with self._lock:
+            self._drop(self._watches.pop(fuzzer_id, None))
+            self._watches[fuzzer_id] = watch
+            if pidfd is not None:
+                self._by_fd[pidfd] = watch
+                self._epoll.register(pidfd, select.EPOLLIN)
+
+        self._wake()
+        return True
+
+    def unwatch(self, fuzzer_id: str):
+        """
+        Stop supervising an instance (before an intentional stop) and
+        cancel any pending restart.
+        """
+        with self._lock:
+            self._drop(self._watches.pop(fuzzer_id, None))
+            self._pending.pop(fuzzer_id, None)
+            self._backoff.pop(fuzzer_id, None)
+
+    def _drop(self, watch: Optional[_Watch]):
+        if watch is None or watch.pidfd is None:
+            return
+        self._by_fd.pop(watch.pidfd, None)
+        try:
+            self._epoll.unregister(watch.pidfd)
+        except (OSError, ValueError):
+            pass
+        os.close(watch.pidfd)
+        watch.pidfd = None
+
+    def _wake(self):
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass
+
+    # -----------------------------------------
+    # Event Loop
+    # -----------------------------------------
+
+    def run(self):
+        while self._running:
+            timeout = self._next_timeout()
+
+            if self.uses_pidfd:
+                try:
+                    events = self._epoll.poll(-1 if timeout is None else timeout)
+                except InterruptedError:
+                    continue
+                detected = time.perf_counter()
+
+                for fd, _ in events:
+                    if fd == self._wake_r:
+                        self._drain_wake()
+                        continue
+                    with self._lock:
+                        watch = self._by_fd.get(fd)
+                    if watch is not None:
+                        self._reap(watch, detected)
+            else:
+                timeout = self.poll_interval if timeout is None else min(timeout, self.poll_interval)
+                time.sleep(timeout)
+                self._poll_fallback()
+
+            self._run_due()
+
+    def stop(self, timeout: float = 5.0):
+        self._running = False
+        self._wake()
+        if self.is_alive():
+            self.join(timeout)
+
+        with self._lock:
+            for watch in list(self._watches.values()):
+                self._drop(watch)
+            self._watches.clear()
+            self._pending.clear()
+
+    def _drain_wake(self):
+        try:
+            while os.read(self._wake_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _next_timeout(self) -> Optional[float]:
+        with self._lock:
+            while self._due and self._pending.get(self._due[0][2]) != self._due[0][1]:
+                heapq.heappop(self._due)
+            if not self._due:
+                return None
+            return max(0.0, self._due[0][0] - time.monotonic())
+
+    def _poll_fallback(self):
+        with self._lock:
+            watches = list(self._watches.values())
+
+        for watch in watches:
+            if watch.proc is not None:
+                alive = watch.proc.poll() is None
+            else:
+                alive = process_start_time(watch.pid) == watch.create_time
+            if not alive:
+                self._reap(watch, time.perf_counter())
+
+    # -----------------------------------------
+    # Exits
+    # -----------------------------------------
+
+    def _reap(self, watch: _Watch, detected: float):
+        returncode = None
+        if watch.proc is not None:
+            try:
+                returncode = watch.proc.wait(timeout=1.0)
+            except Exception:
+                returncode = watch.proc.returncode
+
+        with self._lock:
+            # Unwatched (intentional stop) or replaced in the meantime
+            if self._watches.get(watch.fuzzer_id) is not watch:
+                self._drop(watch)
+                return
+            del self._watches[watch.fuzzer_id]
+            self._drop(watch)
+
+            info = classify_exit(returncode)
+            info["pid"] = watch.pid
+            info["uptime_seconds"] = round(time.monotonic() - watch.started, 3)
+            self._schedule(watch.fuzzer_id, info)
+
+            self._exits[info["reason"]] = self._exits.get(info["reason"], 0) + 1
+            self._last_handle_ms = (time.perf_counter() - detected) * 1000.0
+
+        self._notify(watch.fuzzer_id, info)
+
+    def _schedule(self, fuzzer_id: str, info: dict):
+        """
+        Decide on a restart (lock held); fills restart_in / gave_up.
+        """
+        info["restart_in"] = None
+        info["gave_up"] = False
+
+        if not self.restart:
+            return
+        if info["reason"] == EXIT_CLEAN and not self.restart_on_clean_exit:
+            return
+
+        backoff = self._backoff.setdefault(fuzzer_id, _Backoff())
+        if info.get("uptime_seconds", 0) >= self.reset_after:
+            backoff.failures = 0
+        backoff.failures += 1
+
+        now = time.monotonic()
+        while backoff.restarts and now - backoff.restarts[0] > self.restart_window:
+            backoff.restarts.popleft()
+        if len(backoff.restarts) >= self.max_restarts:
+            self._backoff.pop(fuzzer_id, None)
+            self._gave_up += 1
+            info["gave_up"] = True
+            return
+
+        delay = min(
+            self.backoff_max,
+            self.backoff_initial * self.backoff_factor ** (backoff.failures - 1),
+        )
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)
+
+        self._seq += 1
+        self._pending[fuzzer_id] = self._seq
+        heapq.heappush(self._due, (now + delay, self._seq, fuzzer_id))
+        info["restart_in"] = round(delay, 3)
+
+    def _notify(self, fuzzer_id: str, info: dict):
+        try:
+            self._on_exit(fuzzer_id, info)
+        except Exception as e:
+            print(f"[!] Supervisor exit handler failed for {fuzzer_id}: {e}")
+
+    # -----------------------------------------
+    # Restarts
+    # -----------------------------------------
+
+    def _run_due(self):
+        now = time.monotonic()
+        due = []
+
+        with self._lock:
+            while self._due and self._due[0][0] <= now:
+                _, seq, fuzzer_id = heapq.heappop(self._due)
+                if self._pending.get(fuzzer_id) == seq:
+                    del self._pending[fuzzer_id]
+                    backoff = self._backoff.get(fuzzer_id)
+                    if backoff is not None:
+                        backoff.restarts.append(now)
+                    due.append(fuzzer_id)
+
+        for fuzzer_id in due:
+            try:
+                restarted = self._respawn(fuzzer_id)
+            except Exception as e:
+                print(f"[!] Restart of {fuzzer_id} failed: {e}")
+                info = {"reason": SPAWN_FAILED, "returncode": None, "signal": None,
+                        "pid": None, "uptime_seconds": 0.0, "error": str(e)}
+                with self._lock:
+                    if fuzzer_id not in self._backoff:
+                        # Unwatched while we were spawning
+                        continue
+                    self._spawn_failures += 1
+                    self._schedule(fuzzer_id, info)
+                self._notify(fuzzer_id, info)
+                continue
+
+            with self._lock:
+                if restarted:
+                    self._restarts += 1
+                else:
+                    self._backoff.pop(fuzzer_id, None)
+
+    # -----------------------------------------
+    # Monitoring
+    # -----------------------------------------
+
+    def backoff_state(self, fuzzer_id: str) -> Optional[dict]:
+        with self._lock:
+            backoff = self._backoff.get(fuzzer_id)
+            if backoff is None:
+                return None
+            return {
+                "failures": backoff.failures,
+                "recent_restarts": len(backoff.restarts),
+                "restart_pending": fuzzer_id in self._pending,
+            }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "uses_pidfd": self.uses_pidfd,
+                "watched": len(self._watches),
+                "pending_restarts": len(self._pending),
+                "exits": dict(self._exits),
+                "restarts": self._restarts,
+                "spawn_failures": self._spawn_failures,
+                "gave_up": self._gave_up,
+                "last_handle_ms": self._last_handle_ms,
+            }
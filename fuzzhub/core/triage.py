@@ -0,0 +1,462 @@
+"""
+File: fuzzhub/core/triage.py
+
+Crash reproduction and triage.
+
+Unverified crashes wait in a priority queue (manual requests, then
+crashes that opened a new cluster, then other new crashes, then the
+backlog found at startup). A dispatcher re-runs each input against
+the target several times, never running more reproductions at once
+than there are cores left over by running fuzzers. Every run gets a
+timeout, its own process group and resource limits. The verdict,
+reproduction rate and sanitizer output are written back to the crash
+row.
+"""
+
+import heapq
+import itertools
+import os
+import re
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import select, update
+
+from fuzzhub.database.session import SessionLocal
+from fuzzhub.database.models import Campaign, Crash, FuzzerInstance
+from fuzzhub.utils.config import get_config
+from fuzzhub.utils.files import file_signature
+from fuzzhub.utils.input_store import get_input_store
+from fuzzhub.utils.process import limited_command
+
+
+PRIORITY_MANUAL = 0
+PRIORITY_NEW_CLUSTER = 1
+PRIORITY_NEW = 2
+PRIORITY_BACKLOG = 3
+
+VERDICT_REPRODUCIBLE = "reproducible"
+VERDICT_FLAKY = "flaky"
+VERDICT_NOT_REPRODUCIBLE = "not_reproducible"
+VERDICT_TIMEOUT = "timeout"
+VERDICT_UNSUPPORTED = "unsupported"
+VERDICT_ERROR = "error"
+
+# Sanitizer, UBSan and libFuzzer crash reports
+_CRASH_REPORT = re.compile(
+    rb"ERROR: \w+Sanitizer:|runtime error:|ERROR: libFuzzer: deadly signal"
+)
+
+_SANITIZER_MARKERS = (b"__asan_init", b"__msan_init", b"__tsan_init", b"__hwasan_init")
+
+# Input file placeholders in target_args (AFL, honggfuzz)
+_PLACEHOLDERS = ("@@", "___FILE___")
+
+
+def _config() -> dict:
+    return get_config().get("triage", {})
+
+
+# -------------------------------------------------
+# Repro Commands
+# -------------------------------------------------
+
+def repro_command(fuzzer_type: str, config: dict, target_binary: str,
+                  input_path: str):
+    """
+    (argv, stdin_path) that runs the target once on an input, or
+    None if the fuzzer type cannot be replayed locally.
+    """
+    if fuzzer_type == "boofuzz" or not target_binary:
+        return None
+
+    if fuzzer_type == "libfuzzer":
+        # A file argument makes a libFuzzer binary execute it once
+        return [target_binary, input_path], None
+
+    args = list(config.get("target_args", ["@@"] if fuzzer_type == "afl" else []))
+    if any(p in arg for arg in args for p in _PLACEHOLDERS):
+        argv = [target_binary]
+        for arg in args:
+            for placeholder in _PLACEHOLDERS:
+                arg = arg.replace(placeholder, input_path)
+            argv.append(arg)
+        return argv, None
+
+    return [target_binary] + args, input_path
+
+
+_instrumented: Dict[str, tuple] = {}
+
+
+def _is_sanitized(binary: str) -> bool:
+    # ASan/MSan reserve terabytes of shadow memory, so an address-space
+    # limit would kill them at startup; cache the scan per binary version
+    sig = file_signature(binary)
+    cached = _instrumented.get(binary)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+
+    found = False
+    try:
+        with open(binary, "rb") as f:
+            tail = b""
+            while not found:
+                chunk = f.read(1024 * 1024)
+                if not chunk:
+                    break
+                data = tail + chunk
+                found = any(marker in data for marker in _SANITIZER_MARKERS)
+                tail = chunk[-32:]
+    except OSError:
+        pass
+
+    _instrumented[binary] = (sig, found)
+    return found
+
+
+class TriageService(threading.Thread):
+    """
+    Priority queue + bounded reproduction pool.
+    """
+
+    def __init__(self, busy_cores: Callable[[], int] = None):
+        super().__init__(daemon=True, name="triage")
+
+        cfg = _config()
+
+        self.enabled = cfg.get("enabled", True)
+        self.runs = max(1, int(cfg.get("runs", 3)))
+        self.timeout = cfg.get("timeout", 10)
+        self.memory_mb = cfg.get("memory_mb", 2048)
+        self.max_output = int(cfg.get("max_output_kb", 64)) * 1024
+        self.queue_size = cfg.get("queue_size", 10000)
+        self.sanitizer_options = cfg.get("sanitizer_options", "symbolize=1:detect_leaks=0")
+
+        workers = cfg.get("workers", "auto")
+        self._auto = workers == "auto"
+        self.max_workers = (os.cpu_count() or 1) if self._auto else max(1, int(workers))
+        self._busy_cores = busy_cores or (lambda: 0)
+
+        self._heap = []
+        self._queued: Dict[str, float] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._active = 0
+        self._running = True
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="triage"
+        )
+
+        # (finished_at, queue_latency_s, runs) of recent jobs
+        self._recent = deque(maxlen=1000)
+        self._completed = 0
+        self._executions = 0
+        self._dropped = 0
+        self._verdicts: Dict[str, int] = {}
+
+    # -----------------------------------------
+    # Queue
+    # -----------------------------------------
+
+    def warm(self, limit: int = None):
+        """
+        Queue stored crashes that were never triaged.
+        """
+        if not self.enabled:
+            return
+
+        db = SessionLocal()
+        try:
+            ids = db.execute(
+                select(Crash.id)
+                .where(Crash.verdict.is_(None))
+                .order_by(Crash.first_seen)
+                .limit(limit or self.queue_size)
+            ).scalars().all()
+        finally:
+            db.close()
+
+        for crash_id in ids:
+            self.enqueue(crash_id, PRIORITY_BACKLOG)
+
+        print(f"[*] Triage queue warmed ({len(ids)} unverified crashes)")
+
+    def enqueue(self, crash_id: str, priority: int = PRIORITY_NEW) -> bool:
+        if not self.enabled:
+            return False
+
+        with self._cond:
+            if crash_id in self._queued and priority != PRIORITY_MANUAL:
+                return False
+            if len(self._queued) >= self.queue_size and priority != PRIORITY_MANUAL:
+                self._dropped += 1
+                return False
+
+            # A manual request for a queued crash adds a higher-priority
+            # entry; the stale one is skipped when popped
+            enqueued_at = time.time()
+            self._queued[crash_id] = enqueued_at
+            heapq.heappush(self._heap, (priority, next(self._seq), crash_id, enqueued_at))
+            self._cond.notify()
+        return True
+
+    def _capacity(self) -> int:
+        if not self._auto:
+            return self.max_workers
+        try:
+            busy = int(self._busy_cores())
+        except Exception:
+            busy = 0
+        return max(1, min(self.max_workers, self.max_workers - busy))
+
+    # -----------------------------------------
+    # Dispatch
+    # -----------------------------------------
+
+    def run(self):
+        while True:
+            with self._cond:
+                while self._running and (
+                    not self._heap or self._active >= self._capacity()
+                ):
+                    # Re-check capacity now and then: fuzzers come and go
+                    self._cond.wait(1.0)
+
+                if not self._running:
+                    return
+
+                _, _, crash_id, enqueued_at = heapq.heappop(self._heap)
+                if self._queued.get(crash_id) != enqueued_at:
+                    continue
+                del self._queued[crash_id]
+                self._active += 1
+
+            self._pool.submit(self._job, crash_id, enqueued_at)
+
+    def stop(self, timeout: float = 5.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self.is_alive():
+            self.join(timeout)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _job(self, crash_id: str, enqueued_at: float):
+        started = time.time()
+        executions = 0
+        try:
+            executions = self._triage(crash_id)
+        except Exception as e:
+            print(f"[!] Triage of crash {crash_id} failed: {e}")
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._completed += 1
+                self._executions += executions
+                self._recent.append((time.time(), started - enqueued_at, executions))
+                self._cond.notify()
+
+    # -----------------------------------------
+    # Reproduction
+    # -----------------------------------------
+
+    def _load(self, crash_id: str) -> Optional[dict]:
+        db = SessionLocal()
+        try:
+            row = db.execute(
+                select(
+                    Crash.input_path, Crash.input_sha256,
+                    FuzzerInstance.fuzzer_type, FuzzerInstance.config,
+                    Campaign.target_binary,
+                )
+                .select_from(Crash)
+                .outerjoin(FuzzerInstance, FuzzerInstance.id == Crash.fuzzer_instance_id)
+                .outerjoin(Campaign, Campaign.id == Crash.campaign_id)
+                .where(Crash.id == crash_id)
+            ).first()
+        finally:
+            db.close()
+
+        if row is None:
+            return None
+
+        config = row.config or {}
+        input_path = row.input_path
+        if row.input_sha256:
+            stored = get_input_store().path_for(row.input_sha256)
+            if os.path.exists(stored):
+                input_path = stored
+
+        return {
+            "fuzzer_type": row.fuzzer_type,
+            "config": config,
+            "target_binary": config.get("target_binary") or row.target_binary,
+            "input_path": input_path,
+        }
+
+    def _triage(self, crash_id: str) -> int:
+        info = self._load(crash_id)
+        if info is None:
+            return 0
+
+        input_path = info["input_path"]
+        if not input_path or not os.path.exists(input_path):
+            self._write(crash_id, VERDICT_ERROR, None, 0, "input file not found")
+            return 0
+
+        command = repro_command(
+            info["fuzzer_type"], info["config"], info["target_binary"], input_path
+        )
+        if command is None:
+            self._write(crash_id, VERDICT_UNSUPPORTED, None, 0, None)
+            return 0
+
+        argv, stdin_path = command
+        env = self._env(info["config"])
+        limit_memory = not _is_sanitized(argv[0])
+
+        reproduced = 0
+        timeouts = 0
+        output = None
+
+        for _ in range(self.runs):
+            outcome, report = self._run_once(argv, stdin_path, env, limit_memory)
+            if outcome == "crash":
+                reproduced += 1
+                if output is None:
+                    output = report
+            elif outcome == "timeout":
+                timeouts += 1
+
+        rate = reproduced / self.runs
+        if reproduced == self.runs:
+            verdict = VERDICT_REPRODUCIBLE
+        elif reproduced:
+            verdict = VERDICT_FLAKY
+        elif timeouts == self.runs:
+            verdict = VERDICT_TIMEOUT
+        else:
+            verdict = VERDICT_NOT_REPRODUCIBLE
+
+        self._write(crash_id, verdict, rate, self.runs, output)
+        return self.runs
+
+    def _env(self, config: dict) -> dict:
+        env = dict(os.environ)
+        env.update({k: str(v) for k, v in config.get("env", {}).items()})
+
+        options = self.sanitizer_options
+        if self.memory_mb:
+            options += f":hard_rss_limit_mb={self.memory_mb}"
+        for name in ("ASAN_OPTIONS", "UBSAN_OPTIONS", "MSAN_OPTIONS"):
+            env.setdefault(name, options)
+        return env
+
+    def _limits(self, limit_memory: bool) -> dict:
+        limits = {"core": (0, 0)}
+        if self.memory_mb and limit_memory:
+            memory = self.memory_mb * 1024 * 1024
+            limits["as"] = (memory, memory)
+        if self.timeout:
+            cpu = int(self.timeout) + 1
+            limits["cpu"] = (cpu, cpu + 1)
+        return limits
+
+    def _run_once(self, argv, stdin_path, env, limit_memory):
+        """
+        One execution: ("crash" | "timeout" | "clean", output tail).
+        """
+        stdin = open(stdin_path, "rb") if stdin_path else subprocess.DEVNULL
+
+        try:
+            with tempfile.TemporaryFile() as stderr:
+                proc = subprocess.Popen(
+                    limited_command(argv, self._limits(limit_memory)),
+                    stdin=stdin,
+                    stdout=subprocess.DEVNULL,
+                    stderr=stderr,
+                    env=env,
+                    cwd=os.path.dirname(os.path.abspath(argv[0])),
+                    start_new_session=True,
+                )
+
+                try:
+                    code = proc.wait(self.timeout)
+                except subprocess.TimeoutExpired:
+                    try:
+                        os.killpg(proc.pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                    proc.wait()
+                    return "timeout", None
+
+                size = stderr.tell()
+                stderr.seek(max(0, size - self.max_output))
+                report = stderr.read()
+        finally:
+            if stdin is not subprocess.DEVNULL:
+                stdin.close()
+
+        crashed = code < 0 or bool(_CRASH_REPORT.search(report))
+        return ("crash" if crashed else "clean"), report.decode("utf-8", errors="replace")
+
+    def _write(self, crash_id: str, verdict: str, rate, runs: int, output):
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(Crash)
+                .where(Crash.id == crash_id)
+                .values(
+                    verdict=verdict,
+                    repro_rate=rate,
+                    repro_runs=runs,
+                    sanitizer_output=output,
+                    triaged_at=datetime.utcnow(),
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+        with self._cond:
+            self._verdicts[verdict] = self._verdicts.get(verdict, 0) + 1
+
+    # -----------------------------------------
+    # Monitoring
+    # -----------------------------------------
+
+    def stats(self, window: float = 60.0) -> dict:
+        now = time.time()
+
+        with self._cond:
+            recent = [r for r in self._recent if now - r[0] <= window]
+            latencies = sorted(r[1] for r in self._recent)
+
+            return {
+                "enabled": self.enabled,
+                "queued": len(self._queued),
+                "active": self._active,
+                "capacity": self._capacity(),
+                "completed": self._completed,
+                "executions": self._executions,
+                "dropped": self._dropped,
+                "verdicts": dict(self._verdicts),
+                "triaged_per_sec": len(recent) / window,
+                "repros_per_sec": sum(r[2] for r in recent) / window,
+                "queue_latency_ms_avg": (
+                    sum(latencies) / len(latencies) * 1000.0 if latencies else None
+                ),
+                "queue_latency_ms_p95": (
+                    latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000.0
+                    if latencies else None
+                ),
+            }
@@ -2,6 +2,8 @@
 File: fuzzhub/database/init_db.py
 """
 
+from sqlalchemy import inspect, text
+
 from fuzzhub.database.session import engine
 from fuzzhub.database.models import Base
 
@@ -12,3 +14,29 @@ def init_database():
     Safe to call multiple times.
     """
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+
+
+def _add_missing_columns():
+    """
+    Bring tables created by older versions up to date.
+
+    create_all() never alters existing tables, so nullable columns
+    added to a model since are appended here, and indexes added
+    since (on new or existing columns) are created.
+    """
+    inspector = inspect(engine)
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            missing = [c for c in table.columns if c.name not in existing]
+
+            for column in missing:
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"
+                ))
+
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
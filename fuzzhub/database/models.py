@@ -13,6 +13,10 @@ from sqlalchemy import (
     Float,
     ForeignKey,
     Boolean,
+    JSON,
+    Index,
+    LargeBinary,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -58,9 +62,15 @@ class FuzzerInstance(Base):
     pid = Column(Integer, nullable=True)
     state = Column(String(50), nullable=False)
 
+    # Adapter config used to (re)start this instance
+    config = Column(JSON, nullable=True)
+
     started_at = Column(DateTime, nullable=True)
     last_heartbeat = Column(DateTime, nullable=True)
 
+    # Adapter collection progress (BaseFuzzer.export_state) for reattach
+    collector_state = Column(JSON, nullable=True)
+
     campaign = relationship("Campaign", back_populates="fuzzers")
 
 
@@ -79,9 +89,25 @@ class Crash(Base):
     crash_hash = Column(String(128), index=True)
     crash_type = Column(String(255), nullable=True)
 
+    # Normalized "<type>|<frame>|..." bucket (crash_hash is its sha256)
+    signature = Column(String(1024), nullable=True, index=True)
+
+    # MinHash sketch of the stack and the near-duplicate cluster it joined
+    minhash = Column(LargeBinary, nullable=True)
+    cluster_id = Column(String(36), nullable=True, index=True)
+
     input_path = Column(Text, nullable=True)
+    # SHA-256 of the input in the content-addressed store (utils/input_store.py)
+    input_sha256 = Column(String(64), nullable=True, index=True)
     stack_trace = Column(Text, nullable=True)
 
+    # Reproduction verdict (see core/triage.py); NULL until triaged
+    verdict = Column(String(32), nullable=True, index=True)
+    repro_rate = Column(Float, nullable=True)
+    repro_runs = Column(Integer, nullable=True)
+    sanitizer_output = Column(Text, nullable=True)
+    triaged_at = Column(DateTime, nullable=True)
+
     first_seen = Column(DateTime, default=datetime.utcnow)
     last_seen = Column(DateTime, default=datetime.utcnow)
     occurrences = Column(Integer, default=1)
@@ -89,6 +115,23 @@ class Crash(Base):
     campaign = relationship("Campaign", back_populates="crashes")
 
 
+class CrashCluster(Base):
+    """
+    Family of near-duplicate crashes (see collectors/clusters.py).
+    """
+    __tablename__ = "crash_clusters"
+
+    id = Column(String(36), primary_key=True, default=gen_uuid)
+
+    # First member: its signature labels the cluster, its sketch is
+    # what new crashes are compared against
+    representative_crash_id = Column(String(36), nullable=True)
+    signature = Column(String(1024), nullable=True)
+    minhash = Column(LargeBinary, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 # -------------------------------------------------
 # Metrics (Time-Series)
 # -------------------------------------------------
@@ -106,6 +149,78 @@ class MetricSnapshot(Base):
 
     timestamp = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_metric_snapshots_fuzzer_ts", "fuzzer_instance_id", "timestamp"),
+    )
+
+
+# -------------------------------------------------
+# Metric Rollups (Downsampled Time-Series)
+# -------------------------------------------------
+
+class MetricRollupMixin:
+    """
+    Shared columns for the aggregate tiers.
+
+    Each row summarizes one fuzzer over one bucket of
+    `resolution_seconds`, starting at `bucket_start`.
+    """
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    fuzzer_instance_id = Column(String(36), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    samples = Column(Integer, nullable=False, default=0)
+
+    exec_per_sec_min = Column(Float, nullable=True)
+    exec_per_sec_max = Column(Float, nullable=True)
+    exec_per_sec_avg = Column(Float, nullable=True)
+    exec_per_sec_last = Column(Float, nullable=True)
+
+    corpus_size_min = Column(Integer, nullable=True)
+    corpus_size_max = Column(Integer, nullable=True)
+    corpus_size_avg = Column(Float, nullable=True)
+    corpus_size_last = Column(Integer, nullable=True)
+
+    coverage_min = Column(Float, nullable=True)
+    coverage_max = Column(Float, nullable=True)
+    coverage_avg = Column(Float, nullable=True)
+    coverage_last = Column(Float, nullable=True)
+
+    crashes_found_min = Column(Integer, nullable=True)
+    crashes_found_max = Column(Integer, nullable=True)
+    crashes_found_avg = Column(Float, nullable=True)
+    crashes_found_last = Column(Integer, nullable=True)
+
+
+class MetricRollup1m(MetricRollupMixin, Base):
+    __tablename__ = "metric_rollups_1m"
+    resolution_seconds = 60
+
+    __table_args__ = (
+        UniqueConstraint("fuzzer_instance_id", "bucket_start"),
+        Index("ix_metric_rollups_1m_bucket", "bucket_start"),
+    )
+
+
+class MetricRollup15m(MetricRollupMixin, Base):
+    __tablename__ = "metric_rollups_15m"
+    resolution_seconds = 15 * 60
+
+    __table_args__ = (
+        UniqueConstraint("fuzzer_instance_id", "bucket_start"),
+        Index("ix_metric_rollups_15m_bucket", "bucket_start"),
+    )
+
+
+class MetricRollup1h(MetricRollupMixin, Base):
+    __tablename__ = "metric_rollups_1h"
+    resolution_seconds = 60 * 60
+
+    __table_args__ = (
+        UniqueConstraint("fuzzer_instance_id", "bucket_start"),
+        Index("ix_metric_rollups_1h_bucket", "bucket_start"),
+    )
+
 
 # -------------------------------------------------
 # Worker Node (Future Distributed Mode)
@@ -0,0 +1,328 @@
+"""
+File: fuzzhub/database/queries.py
+
+Set-based listing queries.
+
+Every listing is a single statement whatever the number of rows:
+instances are joined to their latest metric snapshot (ROW_NUMBER()
+over each instance's snapshots) and to grouped crash counts, so an
+instance without metric rows is still listed. Pages are keyed on id
+(cursor = opaque form of the last id returned), never OFFSET.
+"""
+
+import base64
+import hashlib
+import json
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, func, literal, select
+
+from fuzzhub.database.models import Campaign, Crash, FuzzerInstance, MetricSnapshot
+
+
+MAX_PAGE = 1000
+
+
+# -----------------------------------------
+# Cursors / ETags
+# -----------------------------------------
+
+def encode_cursor(last_id: str) -> str:
+    return base64.urlsafe_b64encode(last_id.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    if not cursor:
+        return None
+    try:
+        last_id = base64.b64decode(
+            cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True
+        ).decode()
+    except ValueError:
+        last_id = None
+    if not last_id:
+        raise ValueError("Invalid cursor")
+    return last_id
+
+
+def listing_etag(payload) -> str:
+    """
+    Weak ETag over the JSON form of a listing.
+    """
+    body = json.dumps(payload, sort_keys=True, default=str).encode()
+    return 'W/"' + hashlib.sha1(body).hexdigest()[:24] + '"'
+
+
+def page(items: Iterable[dict], limit: Optional[int] = None,
+         cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    """
+    Keyset page over rows already in memory, with the same ordering and
+    cursors as the queries below. Without a limit everything is returned.
+    """
+    items = sorted(items, key=lambda item: item["id"])
+
+    after = decode_cursor(cursor)
+    if after is not None:
+        items = [item for item in items if item["id"] > after]
+
+    if limit is None:
+        return items, None
+
+    limit = min(max(1, limit), MAX_PAGE)
+    if len(items) <= limit:
+        return items, None
+    return items[:limit], encode_cursor(items[limit - 1]["id"])
+
+
+def _limit(limit: Optional[int]) -> Optional[int]:
+    return None if limit is None else min(max(1, limit), MAX_PAGE)
+
+
+def _finish(rows: list, limit: Optional[int]) -> Tuple[list, Optional[str]]:
+    # One extra row was fetched to tell whether another page exists
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1]["id"])
+
+
+# -----------------------------------------
+# Building blocks
+# -----------------------------------------
+
+def latest_metrics(fuzzer_ids=None):
+    """
+    Subquery: the newest snapshot of each instance (fid, exec_per_sec,
+    corpus_size, coverage, timestamp).
+    """
+    ranked = select(
+        MetricSnapshot.fuzzer_instance_id.label("fid"),
+        MetricSnapshot.exec_per_sec,
+        MetricSnapshot.corpus_size,
+        MetricSnapshot.coverage,
+        MetricSnapshot.timestamp,
+        func.row_number().over(
+            partition_by=MetricSnapshot.fuzzer_instance_id,
+            order_by=(MetricSnapshot.timestamp.desc(), MetricSnapshot.id.desc()),
+        ).label("rn"),
+    )
+    if fuzzer_ids is not None:
+        ranked = ranked.where(MetricSnapshot.fuzzer_instance_id.in_(fuzzer_ids))
+    ranked = ranked.subquery()
+
+    return (
+        select(
+            ranked.c.fid,
+            ranked.c.exec_per_sec,
+            ranked.c.corpus_size,
+            ranked.c.coverage,
+            ranked.c.timestamp,
+        )
+        .where(ranked.c.rn == 1)
+        .subquery()
+    )
+
+
+def crash_counts(fuzzer_ids=None):
+    """
+    Subquery: crashes per instance (fid, crash_count).
+    """
+    query = (
+        select(
+            Crash.fuzzer_instance_id.label("fid"),
+            func.count(Crash.id).label("crash_count"),
+        )
+        .where(Crash.fuzzer_instance_id.isnot(None))
+        .group_by(Crash.fuzzer_instance_id)
+    )
+    if fuzzer_ids is not None:
+        query = query.where(Crash.fuzzer_instance_id.in_(fuzzer_ids))
+    return query.subquery()
+
+
+# -----------------------------------------
+# Fuzzer instances
+# -----------------------------------------
+
+def fuzzer_rows(db, campaign_id: Optional[str] = None, state: Optional[str] = None,
+                limit: Optional[int] = None, cursor: Optional[str] = None,
+                fuzzer_id: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    """
+    One page of instances with their latest metrics and crash count,
+    ordered by id, in one statement. Returns (rows, next_cursor).
+    """
+    limit = _limit(limit)
+
+    ids = select(FuzzerInstance.id)
+    if fuzzer_id is not None:
+        ids = ids.where(FuzzerInstance.id == fuzzer_id)
+    if campaign_id is not None:
+        ids = ids.where(FuzzerInstance.campaign_id == campaign_id)
+    if state is not None:
+        ids = ids.where(FuzzerInstance.state == state)
+    after = decode_cursor(cursor)
+    if after is not None:
+        ids = ids.where(FuzzerInstance.id > after)
+    ids = ids.order_by(FuzzerInstance.id)
+    if limit is not None:
+        ids = ids.limit(limit + 1)
+    ids = ids.subquery()
+
+    # Metrics and crashes are only aggregated for the page's instances
+    page_ids = select(ids.c.id)
+    metrics = latest_metrics(page_ids)
+    crashes = crash_counts(page_ids)
+
+    rows = db.execute(
+        select(
+            FuzzerInstance.id,
+            FuzzerInstance.campaign_id,
+            FuzzerInstance.fuzzer_type,
+            FuzzerInstance.state,
+            FuzzerInstance.pid,
+            FuzzerInstance.started_at,
+            FuzzerInstance.last_heartbeat,
+            metrics.c.exec_per_sec,
+            metrics.c.corpus_size,
+            metrics.c.coverage,
+            metrics.c.timestamp.label("metrics_at"),
+            func.coalesce(crashes.c.crash_count, 0).label("crash_count"),
+        )
+        .join(ids, ids.c.id == FuzzerInstance.id)
+        .outerjoin(metrics, metrics.c.fid == FuzzerInstance.id)
+        .outerjoin(crashes, crashes.c.fid == FuzzerInstance.id)
+        .order_by(FuzzerInstance.id)
+    ).all()
+
+    return _finish([
+        {
+            "id": row.id,
+            "campaign_id": row.campaign_id,
+            "fuzzer_type": row.fuzzer_type,
+            "state": row.state,
+            "pid": row.pid if row.state == "running" else None,
+            "started_at": row.started_at,
+            "last_heartbeat": row.last_heartbeat,
+            "exec_per_sec": row.exec_per_sec,
+            "corpus_size": row.corpus_size,
+            "coverage": row.coverage,
+            "metrics_at": row.metrics_at,
+            "crash_count": row.crash_count,
+        }
+        for row in rows
+    ], limit)
+
+
+# -----------------------------------------
+# Campaigns
+# -----------------------------------------
+
+def campaign_rows(db, limit: Optional[int] = None,
+                  cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    """
+    One page of campaigns with instance counts per state, crash count
+    and the summed latest exec/s of running instances, in one
+    statement. Campaign ids only referenced by instances are listed too.
+    """
+    limit = _limit(limit)
+
+    known = select(Campaign.id.label("id")).union(
+        select(FuzzerInstance.campaign_id.label("id"))
+        .where(FuzzerInstance.campaign_id.isnot(None))
+    ).subquery()
+
+    ids = select(known.c.id)
+    after = decode_cursor(cursor)
+    if after is not None:
+        ids = ids.where(known.c.id > after)
+    ids = ids.order_by(known.c.id)
+    if limit is not None:
+        ids = ids.limit(limit + 1)
+    ids = ids.subquery()
+
+    page_ids = select(ids.c.id)
+    metrics = latest_metrics(
+        select(FuzzerInstance.id).where(FuzzerInstance.campaign_id.in_(page_ids))
+    )
+
+    def _count(state):
+        return func.coalesce(func.sum(case((FuzzerInstance.state == state, 1), else_=0)), 0)
+
+    instances = (
+        select(
+            FuzzerInstance.campaign_id.label("cid"),
+            func.count(FuzzerInstance.id).label("instances"),
+            _count("running").label("running"),
+            _count("queued").label("queued"),
+            _count("stopped").label("stopped"),
+            _count("finished").label("finished"),
+            _count("crashed").label("crashed"),
+            func.sum(
+                case((FuzzerInstance.state == "running", metrics.c.exec_per_sec), else_=literal(0.0))
+            ).label("exec_per_sec"),
+            func.max(metrics.c.coverage).label("max_coverage"),
+        )
+        .outerjoin(metrics, metrics.c.fid == FuzzerInstance.id)
+        .where(FuzzerInstance.campaign_id.in_(page_ids))
+        .group_by(FuzzerInstance.campaign_id)
+        .subquery()
+    )
+
+    crashes = (
+        select(
+            Crash.campaign_id.label("cid"),
+            func.count(Crash.id).label("crash_count"),
+            func.count(func.distinct(Crash.cluster_id)).label("cluster_count"),
+        )
+        .where(Crash.campaign_id.in_(page_ids))
+        .group_by(Crash.campaign_id)
+        .subquery()
+    )
+
+    rows = db.execute(
+        select(
+            ids.c.id,
+            Campaign.name,
+            Campaign.target_binary,
+            Campaign.active,
+            Campaign.created_at,
+            func.coalesce(instances.c.instances, 0).label("instances"),
+            func.coalesce(instances.c.running, 0).label("running"),
+            func.coalesce(instances.c.queued, 0).label("queued"),
+            func.coalesce(instances.c.stopped, 0).label("stopped"),
+            func.coalesce(instances.c.finished, 0).label("finished"),
+            func.coalesce(instances.c.crashed, 0).label("crashed"),
+            instances.c.exec_per_sec,
+            instances.c.max_coverage,
+            func.coalesce(crashes.c.crash_count, 0).label("crash_count"),
+            func.coalesce(crashes.c.cluster_count, 0).label("cluster_count"),
+        )
+        .select_from(ids)
+        .outerjoin(Campaign, Campaign.id == ids.c.id)
+        .outerjoin(instances, instances.c.cid == ids.c.id)
+        .outerjoin(crashes, crashes.c.cid == ids.c.id)
+        .order_by(ids.c.id)
+    ).all()
+
+    return _finish([
+        {
+            "id": row.id,
+            "name": row.name,
+            "target_binary": row.target_binary,
+            "active": row.active,
+            "created_at": row.created_at,
+            "instances": {
+                "total": row.instances,
+                "running": row.running,
+                "queued": row.queued,
+                "stopped": row.stopped,
+                "finished": row.finished,
+                "crashed": row.crashed,
+            },
+            "exec_per_sec": row.exec_per_sec,
+            "max_coverage": row.max_coverage,
+            "crash_count": row.crash_count,
+            "cluster_count": row.cluster_count,
+        }
+        for row in rows
+    ], limit)
@@ -0,0 +1,309 @@
+"""
+File: fuzzhub/fuzzers/afl.py
+
+AFL++ fuzzer adapter.
+
+Metrics and crashes are read incrementally from the instance
+output directory so that polling cost does not grow with the size
+of the queue or crash directories:
+
+- fuzzer_stats is re-parsed only when its mtime/size changes
+- plot_data is tailed from the last byte offset
+- new files in crashes/ come from the shared directory watcher
+  (inotify on Linux), checked only when the saved-crash counter
+  moves, and only ids past the last seen one are reported
+
+The plot_data offset and crash id are exported with each heartbeat,
+so a restarted daemon reattaches and continues from them.
+"""
+
+import os
+import re
+from typing import Any, Dict
+
+from fuzzhub.fuzzers.base import BaseFuzzer
+from fuzzhub.utils.files import FileTail, file_signature
+from fuzzhub.utils.inotify import get_shared_watcher
+
+
+# AFL / AFL++ column and key names -> FuzzHub metric names
+_METRIC_ALIASES = {
+    "execs_per_sec": "exec_per_sec",
+    "corpus_count": "corpus_size",
+    "paths_total": "corpus_size",
+    "bitmap_cvg": "coverage",
+    "map_size": "coverage",
+    "saved_crashes": "crashes_found",
+    "unique_crashes": "crashes_found",
+    "edges_found": "edges_found",
+    "execs_done": "total_execs",
+    "total_execs": "total_execs",
+}
+
+_CRASH_NAME = re.compile(r"^id[:_](\d+)(?:,sig[:_](\d+))?")
+
+
+def _parse_value(value: str):
+    value = value.strip().rstrip("%")
+    try:
+        if "." in value:
+            return float(value)
+        return int(value)
+    except ValueError:
+        return None
+
+
+class AflFuzzer(BaseFuzzer):
+    """
+    Config keys:
+        target_binary   (required) path to the instrumented target
+        target_args     argv after the binary, "@@" marks the input file
+                        (default ["@@"])
+        afl_path        afl-fuzz executable (default "afl-fuzz")
+        input_dir       seed directory (default: one generated seed)
+        output_dir      -o sync directory shared by a campaign's instances
+                        (default runtime/afl/<campaign_id>)
+        role            "main" (-M) or "secondary" (-S, default)
+        instance_name   name inside output_dir (default fh_<id prefix>)
+        timeout_ms      -t
+        memory_limit    -m
+        dictionary      -x
+        extra_args      additional afl-fuzz arguments
+        env             extra environment variables
+    """
+
+    def __init__(self, campaign_id: str, config: Dict[str, Any], fuzzer_id: str = None):
+        super().__init__(campaign_id, config, fuzzer_id)
+
+        self.output_dir = os.path.abspath(
+            config.get("output_dir")
+            or os.path.join("runtime", "afl", str(campaign_id))
+        )
+        self.instance_name = config.get("instance_name") or f"fh_{self.id[:8]}"
+        self.instance_dir = os.path.join(self.output_dir, self.instance_name)
+        self.input_dir = config.get("input_dir")
+
+        self._stats_path = os.path.join(self.instance_dir, "fuzzer_stats")
+        self._crash_dir = os.path.join(self.instance_dir, "crashes")
+
+        self._stats_sig = None
+        self._stats: Dict[str, Any] = {}
+        self._plot = FileTail(os.path.join(self.instance_dir, "plot_data"))
+        self._plot_columns = None
+        self._plot_row: Dict[str, Any] = {}
+
+        self._crash_watch = None
+        self._crash_next_id = 0
+        self._crashes_reported = 0
+
+    # -----------------------------------------
+    # Setup / Command
+    # -----------------------------------------
+
+    def setup(self):
+        if not self.config.get("target_binary"):
+            raise ValueError("AFL fuzzer requires 'target_binary' in config")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        if not self.input_dir:
+            self.input_dir = os.path.join(self.output_dir, "_seeds")
+            os.makedirs(self.input_dir, exist_ok=True)
+            seed = os.path.join(self.input_dir, "seed")
+            if not os.path.exists(seed):
+                with open(seed, "wb") as f:
+                    f.write(b"FUZZ")
+
+        # crashes/ appears once afl-fuzz starts; the watcher retries it
+        self._crash_watch = get_shared_watcher().watch([self._crash_dir])
+
+    def build_command(self):
+        cfg = self.config
+
+        cmd = [
+            cfg.get("afl_path", "afl-fuzz"),
+            "-i", self.input_dir,
+            "-o", self.output_dir,
+        ]
+
+        if cfg.get("role") == "main":
+            cmd += ["-M", self.instance_name]
+        else:
+            cmd += ["-S", self.instance_name]
+
+        if cfg.get("timeout_ms"):
+            cmd += ["-t", str(cfg["timeout_ms"])]
+        if cfg.get("memory_limit"):
+            cmd += ["-m", str(cfg["memory_limit"])]
+        if cfg.get("dictionary"):
+            cmd += ["-x", cfg["dictionary"]]
+
+        cmd += list(cfg.get("extra_args", []))
+        cmd += ["--", cfg["target_binary"]]
+        cmd += list(cfg.get("target_args", ["@@"]))
+
+        return cmd
+
+    def build_env(self):
+        env = dict(os.environ)
+        env.update({
+            "AFL_NO_UI": "1",
+            "AFL_AUTORESUME": "1",
+            "AFL_SKIP_CPUFREQ": "1",
+        })
+        if self.cpus:
+            # Pinned by CorePlacement; keep afl-fuzz from binding elsewhere
+            env["AFL_NO_AFFINITY"] = "1"
+        env.update({k: str(v) for k, v in self.config.get("env", {}).items()})
+        return env
+
+    def output_streams(self):
+        # afl-fuzz keeps writing to stdout; never leave it on a pipe
+        log = open(os.path.join(self.output_dir, f"{self.instance_name}.log"), "ab")
+        return log, log
+
+    def coverage_sources(self):
+        bitmap = ("afl_bitmap", os.path.join(self.instance_dir, "fuzz_bitmap"))
+        return [bitmap] + super().coverage_sources()
+
+    def crash_dirs(self):
+        return [self._crash_dir]
+
+    def queue_dirs(self):
+        return [os.path.join(self.instance_dir, "queue")]
+
+    def corpus_import(self):
+        return "afl", self.output_dir
+
+    def export_state(self):
+        return {
+            "plot": self._plot.position(),
+            # The header line is behind the saved offset
+            "plot_columns": self._plot_columns,
+            "crash_next_id": self._crash_next_id,
+            "crashes_reported": self._crashes_reported,
+        }
+
+    def restore_state(self, state):
+        self._plot.seek(state.get("plot"))
+        self._plot_columns = state.get("plot_columns")
+        self._crash_next_id = state.get("crash_next_id", 0)
+        self._crashes_reported = state.get("crashes_reported", 0)
+
+    def stop(self):
+        super().stop()
+        if self._crash_watch:
+            self._crash_watch.close()
+
+    def scale_config(self):
+        # Extra instances join the same sync dir as new secondaries
+        config = dict(self.config)
+        config.pop("instance_name", None)
+        config["role"] = "secondary"
+        return config
+
+    # -----------------------------------------
+    # Metrics
+    # -----------------------------------------
+
+    def collect_metrics(self):
+        self._refresh_stats()
+        self._refresh_plot()
+
+        merged = dict(self._stats)
+        merged.update(self._plot_row)
+
+        if not merged:
+            return None
+
+        return {
+            "exec_per_sec": merged.get("exec_per_sec"),
+            "corpus_size": merged.get("corpus_size"),
+            "coverage": merged.get("coverage"),
+            "crashes_found": merged.get("crashes_found"),
+            "edges_found": merged.get("edges_found"),
+            "total_execs": merged.get("total_execs"),
+        }
+
+    def _refresh_stats(self):
+        sig = file_signature(self._stats_path)
+        if sig is None or sig == self._stats_sig:
+            return
+
+        stats = {}
+        with open(self._stats_path, "r", errors="replace") as f:
+            for line in f:
+                key, sep, value = line.partition(":")
+                if not sep:
+                    continue
+                name = _METRIC_ALIASES.get(key.strip())
+                if name:
+                    stats[name] = _parse_value(value)
+
+        self._stats_sig = sig
+        self._stats = stats
+
+    def _refresh_plot(self):
+        last = None
+
+        for line in self._plot.read_lines():
+            if line.startswith("#"):
+                self._plot_columns = [
+                    _METRIC_ALIASES.get(col.strip())
+                    for col in line.lstrip("#").split(",")
+                ]
+                continue
+            if line.strip():
+                last = line
+
+        if last is None or not self._plot_columns:
+            return
+
+        row = {}
+        for name, value in zip(self._plot_columns, last.split(",")):
+            if name:
+                row[name] = _parse_value(value)
+        self._plot_row = row
+
+    # -----------------------------------------
+    # Crashes
+    # -----------------------------------------
+
+    def collect_crashes(self):
+        found = self._stats.get("crashes_found")
+        if self._plot_row.get("crashes_found") is not None:
+            found = self._plot_row["crashes_found"]
+
+        # Cheap gate first: files stay queued until the counter moves
+        if self._crash_watch is None:
+            return []
+        if found is not None and found <= self._crashes_reported:
+            return []
+
+        # The first poll lists the files already there (e.g. after a
+        # daemon restart); ids below the saved one were reported before
+        new = []
+        for path in self._crash_watch.poll():
+            match = _CRASH_NAME.match(os.path.basename(path))
+            if not match:
+                continue
+
+            crash_id = int(match.group(1))
+            if crash_id < self._crash_next_id:
+                continue
+
+            new.append((crash_id, path, match.group(2)))
+
+        new.sort()
+        crashes = []
+
+        for crash_id, path, signal in new:
+            crashes.append({
+                "type": f"signal_{int(signal)}" if signal else "crash",
+                "input_path": path,
+                "stack_trace": "",
+            })
+            self._crash_next_id = crash_id + 1
+
+        self._crashes_reported += len(crashes)
+        return crashes
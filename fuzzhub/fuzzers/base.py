@@ -11,6 +11,8 @@ import subprocess
 import uuid
 import time
 
+from fuzzhub.utils.process import AdoptedProcess, pinned_command, process_start_time
+
 
 class FuzzerState:
     STOPPED = "stopped"
@@ -19,12 +21,18 @@ class FuzzerState:
     PAUSED = "paused"
     CRASHED = "crashed"
     ERROR = "error"
+    # Ran to completion on its own (e.g. a finite boofuzz session)
+    FINISHED = "finished"
 
 
 class BaseFuzzer(ABC):
 
-    def __init__(self, campaign_id: str, config: Dict[str, Any]):
-        self.id = str(uuid.uuid4())
+    # Whether reattach() can adopt a process left by a previous daemon
+    reattachable = True
+
+    def __init__(self, campaign_id: str, config: Dict[str, Any], fuzzer_id: str = None):
+        # fuzzer_id is only passed when rebuilding a persisted instance
+        self.id = fuzzer_id or str(uuid.uuid4())
         self.campaign_id = campaign_id
         self.config = config
 
@@ -33,6 +41,9 @@ class BaseFuzzer(ABC):
         self._lock = threading.Lock()
         self._started_at: Optional[float] = None
 
+        # CPUs the process is pinned to (set by CorePlacement before start)
+        self.cpus: Optional[list] = None
+
     # -----------------------------------------
     # Required Overrides
     # -----------------------------------------
@@ -53,6 +64,98 @@ class BaseFuzzer(ABC):
     def collect_crashes(self) -> list:
         pass
 
+    # -----------------------------------------
+    # Optional Overrides
+    # -----------------------------------------
+
+    def build_env(self) -> Optional[Dict[str, str]]:
+        """
+        Environment for the fuzzer process (None inherits ours).
+        """
+        return None
+
+    def output_streams(self):
+        """
+        (stdout, stderr) targets for the fuzzer process.
+
+        File objects returned here are closed in the daemon once the
+        child has inherited them. Adapters that return PIPE must
+        drain it (see fuzzhub.utils.streams); an unread pipe stalls
+        the fuzzer once its buffer fills.
+        """
+        return subprocess.DEVNULL, subprocess.DEVNULL
+
+    def working_dir(self) -> Optional[str]:
+        """
+        Working directory for the fuzzer process (None keeps ours).
+        """
+        return None
+
+    def coverage_sources(self) -> list:
+        """
+        (format, path) pairs of edge coverage files for this instance
+        (see fuzzhub.collectors.coverage for formats). Extra sources,
+        e.g. afl-showmap output, can be listed in config as
+        "coverage_sources": [{"format": ..., "path": ...}].
+        """
+        return [
+            (source["format"], source["path"])
+            for source in self.config.get("coverage_sources", [])
+        ]
+
+    def crash_dirs(self) -> list:
+        """
+        Directories the fuzzer writes crashing inputs to. New files
+        there are copied into the content-addressed input store.
+        """
+        return []
+
+    def cores_needed(self) -> int:
+        """
+        Dedicated CPUs to reserve for this instance (0 = not pinned).
+        """
+        return 1
+
+    def queue_dirs(self) -> list:
+        """
+        Directories the fuzzer adds new corpus entries to; shared with
+        the campaign's other instances by CorpusSync.
+        """
+        return []
+
+    def corpus_import(self):
+        """
+        (style, path) where entries from other instances are delivered
+        ("afl": sync directory under an AFL output dir, "libfuzzer":
+        a corpus dir), or None if the fuzzer cannot take them.
+        """
+        return None
+
+    def scale_config(self) -> Optional[Dict[str, Any]]:
+        """
+        Config for one more instance of this campaign, used by the core
+        allocator to grow it (None if the fuzzer cannot be scaled out).
+        """
+        return dict(self.config)
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Collection progress (file positions, counters), JSON-serializable.
+        Persisted with every heartbeat and handed back to restore_state()
+        when a new daemon reattaches to the process.
+        """
+        return {}
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        pass
+
+    def on_started(self) -> None:
+        """
+        Called with the lock held right after the process is spawned
+        or reattached.
+        """
+        pass
+
     # -----------------------------------------
     # Lifecycle
     # -----------------------------------------
@@ -63,17 +166,44 @@ class BaseFuzzer(ABC):
                 return
 
             self._state = FuzzerState.STARTING
-            cmd = self.build_command()
-
-            self._process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
+            cmd = pinned_command(self.build_command(), self.cpus)
+            stdout, stderr = self.output_streams()
+
+            try:
+                self._process = subprocess.Popen(
+                    cmd,
+                    stdout=stdout,
+                    stderr=stderr,
+                    env=self.build_env(),
+                    cwd=self.working_dir(),
+                    text=True,
+                )
+            except Exception:
+                self._state = FuzzerState.ERROR
+                raise
+            finally:
+                for stream in (stdout, stderr):
+                    if hasattr(stream, "close"):
+                        stream.close()
 
             self._started_at = time.time()
             self._state = FuzzerState.RUNNING
+            self.on_started()
+
+    def reattach(self, pid: int, pidfd: Optional[int] = None,
+                 state: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Adopt a live process started by a previous daemon instead of
+        spawning one; collection resumes from the exported state.
+        Call after setup().
+        """
+        self.restore_state(state or {})
+
+        with self._lock:
+            self._process = AdoptedProcess(pid, pidfd)
+            self._started_at = process_start_time(pid) or time.time()
+            self._state = FuzzerState.RUNNING
+            self.on_started()
 
     def stop(self) -> None:
         with self._lock:
@@ -82,6 +212,20 @@ class BaseFuzzer(ABC):
                 self._process.wait()
             self._state = FuzzerState.STOPPED
 
+    def process(self) -> Optional[subprocess.Popen]:
+        """
+        The spawned process, watched by the supervisor (None if the
+        adapter does not run one of its own).
+        """
+        return self._process
+
+    def process_exited(self, returncode: Optional[int]) -> None:
+        """
+        Called by the supervisor once the process has been reaped.
+        """
+        with self._lock:
+            self._state = FuzzerState.STOPPED if returncode == 0 else FuzzerState.CRASHED
+
     # -----------------------------------------
     # Monitoring
     # -----------------------------------------
@@ -98,4 +242,5 @@ class BaseFuzzer(ABC):
                 "state": self._state,
                 "pid": self._process.pid if self._process else None,
                 "uptime_seconds": uptime,
+                "started_at": self._started_at,
             }
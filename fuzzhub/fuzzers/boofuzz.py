@@ -0,0 +1,623 @@
+"""
+File: fuzzhub/fuzzers/boofuzz.py
+
+boofuzz network protocol fuzzing adapter.
+
+Sessions do not get a process of their own. A small pool of
+long-lived worker processes (started once, with boofuzz already
+imported) runs them, and a single dispatcher thread in the daemon
+routes their progress and failure reports back to the owning
+adapter. Each worker is this module run with "python -m" and talks
+to the daemon over its own socketpair:
+
+    daemon -> worker   ("run", session_id, spec)
+                       ("stop", session_id)
+    worker -> daemon   ("stats", session_id, dict)
+                       ("crash", session_id, dict)
+                       ("done", session_id, error or None)
+"""
+
+import collections
+import importlib
+import importlib.util
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Connection, wait
+from typing import Any, Dict, Optional
+
+from fuzzhub.fuzzers.base import BaseFuzzer, FuzzerState
+from fuzzhub.utils.config import get_config
+
+_STATS_INTERVAL = 0.5
+_CONTROL_INTERVAL = 0.2
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# -------------------------------------------------
+# Worker Process Side
+# -------------------------------------------------
+
+class _SessionStopped(BaseException):
+    # BaseException so boofuzz's own `except Exception` handlers let it through
+    pass
+
+
+def _make_logger(conn, session_id: str, crash_dir: str):
+    import boofuzz
+
+    class PipeLogger(boofuzz.IFuzzLogger):
+
+        def __init__(self):
+            self.session = None
+            self.cases = 0
+            self.failures = 0
+            self.errors = 0
+            self.index = 0
+            self.name = None
+            self.fatal = None
+            self._last_sent = b""
+            self._last_stats = 0.0
+            self._last_control = 0.0
+
+        # Progress / control, once per test case
+
+        def open_test_case(self, test_case_id, name, index, *args, **kwargs):
+            self.cases += 1
+            self.index = index
+            self.name = name
+            self._last_sent = b""
+
+            now = time.monotonic()
+
+            if now - self._last_control >= _CONTROL_INTERVAL:
+                self._last_control = now
+                while conn.poll():
+                    msg = conn.recv()
+                    if msg[0] == "stop" and msg[1] == session_id:
+                        raise _SessionStopped()
+
+            if now - self._last_stats >= _STATS_INTERVAL:
+                self._last_stats = now
+                self.send_stats()
+
+        def send_stats(self):
+            conn.send(("stats", session_id, {
+                "test_cases": self.cases,
+                "mutation_index": self.index,
+                "total_mutations": getattr(self.session, "total_num_mutations", None),
+                "failures": self.failures,
+                "errors": self.errors,
+            }))
+
+        def log_send(self, data):
+            self._last_sent += bytes(data)
+
+        def log_fail(self, description="", *args, **kwargs):
+            self.failures += 1
+
+            path = os.path.join(crash_dir, f"{self.index:08d}-{self.failures}.bin")
+            with open(path, "wb") as f:
+                f.write(self._last_sent)
+
+            conn.send(("crash", session_id, {
+                "type": "boofuzz_failure",
+                "input_path": path,
+                "stack_trace": f"{self.name}\n{description}",
+            }))
+
+        def log_error(self, description="", *args, **kwargs):
+            self.errors += 1
+
+        def open_test_step(self, description, *args, **kwargs):
+            pass
+
+        def log_check(self, description, *args, **kwargs):
+            pass
+
+        def log_recv(self, data, *args, **kwargs):
+            pass
+
+        def log_info(self, description, *args, **kwargs):
+            # boofuzz ends the run quietly when the target stays down
+            if description.startswith("Unable to reconnect to target"):
+                self.fatal = description
+
+        def log_pass(self, description="", *args, **kwargs):
+            pass
+
+        def close_test_case(self, *args, **kwargs):
+            pass
+
+        def close_test(self, *args, **kwargs):
+            pass
+
+    return PipeLogger()
+
+
+def _run_session(conn, session_id: str, spec: dict):
+    import boofuzz
+
+    crash_dir = os.path.join(spec["workdir"], "crashes")
+    os.makedirs(crash_dir, exist_ok=True)
+
+    if spec.get("proto", "tcp") == "udp":
+        connection = boofuzz.UDPSocketConnection(
+            spec["host"], spec["port"], recv_timeout=spec.get("recv_timeout", 1.0)
+        )
+    else:
+        connection = boofuzz.TCPSocketConnection(
+            spec["host"], spec["port"], recv_timeout=spec.get("recv_timeout", 1.0)
+        )
+
+    # fuzz() swallows connection failures, so check reachability up front
+    connection.open()
+    connection.close()
+
+    logger = _make_logger(conn, session_id, crash_dir)
+
+    session = boofuzz.Session(
+        target=boofuzz.Target(connection=connection),
+        fuzz_loggers=[logger],
+        db_filename=os.path.join(spec["workdir"], "boofuzz.db"),
+        fuzz_db_keep_only_n_pass_cases=50,
+        web_port=None,
+        keep_web_open=False,
+        sleep_time=spec.get("sleep_time", 0.0),
+        restart_sleep_time=spec.get("restart_sleep_time", 1),
+        restart_timeout=spec.get("restart_timeout", 30),
+        index_end=spec.get("max_cases"),
+        crash_threshold_request=spec.get("crash_threshold_request", 12),
+        crash_threshold_element=spec.get("crash_threshold_element", 3),
+        receive_data_after_fuzz=True,
+        check_data_received_each_request=spec.get("check_response", True),
+        reuse_target_connection=spec.get("reuse_connection", True),
+    )
+    logger.session = session
+
+    if spec.get("protocol"):
+        # "package.module:function" receives the session and connects requests
+        module_name, _, func_name = spec["protocol"].partition(":")
+        getattr(importlib.import_module(module_name), func_name)(session)
+    else:
+        request = boofuzz.Request("fuzzhub", children=(
+            boofuzz.String(name="data", default_value=spec.get("seed", "FUZZ")),
+        ))
+        session.connect(request)
+
+    try:
+        session.fuzz(max_depth=spec.get("max_depth"))
+    finally:
+        logger.send_stats()
+
+    if logger.fatal:
+        raise RuntimeError(logger.fatal)
+
+
+def _worker_main(conn):
+    # Pay the boofuzz import once per worker, not once per session
+    import boofuzz
+
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+
+        if msg[0] != "run":
+            continue
+
+        _, session_id, spec = msg
+        error = None
+
+        try:
+            _run_session(conn, session_id, spec)
+        except _SessionStopped:
+            pass
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        conn.send(("done", session_id, error))
+
+
+# -------------------------------------------------
+# Daemon Side: Worker Pool
+# -------------------------------------------------
+
+class _Worker:
+
+    def __init__(self, log_path: str):
+        parent, child = socket.socketpair()
+
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (_PROJECT_ROOT, env.get("PYTHONPATH")) if p
+        )
+
+        with open(log_path, "ab") as log:
+            self.process = subprocess.Popen(
+                [sys.executable, "-m", "fuzzhub.fuzzers.boofuzz", str(child.fileno())],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=log,
+                env=env,
+                pass_fds=(child.fileno(),),
+            )
+
+        child.close()
+        self.conn = Connection(parent.detach())
+        self.started_at = time.monotonic()
+        self.session_id: Optional[str] = None
+
+
+class BoofuzzWorkerPool:
+    """
+    Long-lived worker processes shared by all boofuzz adapters.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+
+        self.log_path = os.path.abspath(os.path.join("runtime", "boofuzz", "workers.log"))
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._workers = [_Worker(self.log_path) for _ in range(size)]
+        self._sessions: Dict[str, "BoofuzzFuzzer"] = {}
+        self._pending = collections.deque()
+        self._wake_r, self._wake_w = multiprocessing.Pipe(duplex=False)
+
+        self._thread = threading.Thread(
+            target=self._dispatch, daemon=True, name="boofuzz-dispatch"
+        )
+        self._thread.start()
+
+    # -----------------------------------------
+    # Session Control
+    # -----------------------------------------
+
+    def submit(self, fuzzer: "BoofuzzFuzzer"):
+        with self._lock:
+            self._sessions[fuzzer.id] = fuzzer
+            self._pending.append(fuzzer.id)
+            self._assign()
+
+    def stop_session(self, session_id: str):
+        with self._lock:
+            if session_id in self._pending:
+                self._pending.remove(session_id)
+                self._sessions.pop(session_id, None)
+                return None
+
+            for worker in self._workers:
+                if worker.session_id == session_id:
+                    worker.conn.send(("stop", session_id))
+                    return worker
+
+        return None
+
+    def kill_worker(self, worker: _Worker):
+        """
+        Last resort for a session that ignores stop (e.g. stuck in I/O).
+        """
+        worker.process.kill()
+        self._wake_w.send(None)
+
+    def worker_pid(self, session_id: str) -> Optional[int]:
+        with self._lock:
+            for worker in self._workers:
+                if worker.session_id == session_id:
+                    return worker.process.pid
+        return None
+
+    def _assign(self):
+        for worker in self._workers:
+            if not self._pending:
+                return
+            if worker.session_id is None:
+                session_id = self._pending.popleft()
+                fuzzer = self._sessions.get(session_id)
+                if fuzzer is None:
+                    continue
+                worker.session_id = session_id
+                worker.conn.send(("run", session_id, fuzzer.session_spec()))
+
+    # -----------------------------------------
+    # Dispatcher Thread
+    # -----------------------------------------
+
+    def _dispatch(self):
+        while True:
+            with self._lock:
+                conns = {w.conn: w for w in self._workers}
+
+            ready = wait(list(conns) + [self._wake_r], timeout=1.0)
+
+            for conn in ready:
+                if conn is self._wake_r:
+                    self._wake_r.recv()
+                    continue
+
+                worker = conns[conn]
+                try:
+                    msg = conn.recv()
+                except (EOFError, OSError):
+                    self._replace_worker(worker)
+                    continue
+
+                self._route(worker, msg)
+
+    def _route(self, worker: _Worker, msg):
+        kind, session_id, data = msg
+
+        with self._lock:
+            fuzzer = self._sessions.get(session_id)
+
+        if fuzzer is not None:
+            if kind == "stats":
+                fuzzer._on_stats(data)
+            elif kind == "crash":
+                fuzzer._on_crash(data)
+            elif kind == "done":
+                fuzzer._on_done(data)
+
+        if kind == "done":
+            with self._lock:
+                self._sessions.pop(session_id, None)
+                if worker.session_id == session_id:
+                    worker.session_id = None
+                self._assign()
+
+    def _replace_worker(self, worker: _Worker):
+        worker.conn.close()
+        try:
+            code = worker.process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            worker.process.kill()
+            code = worker.process.wait()
+
+        print(f"[!] boofuzz worker {worker.process.pid} exited with code {code}")
+
+        # Don't spin if workers die on startup (see the worker log)
+        if time.monotonic() - worker.started_at < 1.0:
+            time.sleep(1.0)
+
+        with self._lock:
+            session_id = worker.session_id
+            fuzzer = self._sessions.pop(session_id, None) if session_id else None
+            self._workers[self._workers.index(worker)] = _Worker(self.log_path)
+            self._assign()
+
+        if fuzzer is not None:
+            fuzzer._on_done(f"worker process exited with code {code}")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> BoofuzzWorkerPool:
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            cfg = get_config().get("fuzzers", {}).get("boofuzz", {})
+            _pool = BoofuzzWorkerPool(cfg.get("workers", 4))
+        return _pool
+
+
+# -------------------------------------------------
+# Adapter
+# -------------------------------------------------
+
+class BoofuzzFuzzer(BaseFuzzer):
+    """
+    Config keys:
+        host, port      (required) target address
+        proto           "tcp" (default) or "udp"
+        protocol        "package.module:function" that defines requests
+                        on the session (default: one fuzzed string)
+        seed            default value for the built-in request
+        reuse_connection  keep one target connection across test cases
+                        (default true)
+        check_response  treat a reset while reading the response as a
+                        failure (default true; without process monitors
+                        this is the only crash signal)
+        max_cases       stop after this many test cases
+        max_depth       combinatorial depth (1 gives a finite, counted run)
+        crash_threshold_request  failures before boofuzz skips the rest
+                        of a request (default fuzzers.boofuzz setting)
+        crash_threshold_element  failures before boofuzz skips the rest
+                        of an element (default fuzzers.boofuzz setting)
+        restart_timeout seconds to keep reconnecting to a down target
+        sleep_time      seconds between test cases
+        recv_timeout    socket receive timeout in seconds
+        workdir         default runtime/boofuzz/<campaign>/<id prefix>
+    """
+
+    # Sessions live in the daemon's worker pool and die with it
+    reattachable = False
+
+    def __init__(self, campaign_id: str, config: Dict[str, Any], fuzzer_id: str = None):
+        super().__init__(campaign_id, config, fuzzer_id)
+
+        self.workdir = os.path.abspath(
+            config.get("workdir")
+            or os.path.join("runtime", "boofuzz", str(campaign_id), self.id[:8])
+        )
+
+        self._stats: Dict[str, Any] = {}
+        self._crashes = collections.deque()
+        self._done = threading.Event()
+        self._error: Optional[str] = None
+        self._stopping = False
+        self._rate_mark = None
+        self._rate = None
+
+    # -----------------------------------------
+    # Setup
+    # -----------------------------------------
+
+    def setup(self):
+        if not self.config.get("host") or not self.config.get("port"):
+            raise ValueError("boofuzz fuzzer requires 'host' and 'port' in config")
+
+        if importlib.util.find_spec("boofuzz") is None:
+            raise RuntimeError("boofuzz is not installed")
+
+        os.makedirs(self.workdir, exist_ok=True)
+
+    def build_command(self):
+        # Sessions run inside the shared worker pool, not as a command
+        return []
+
+    def session_spec(self) -> dict:
+        cfg = self.config
+        defaults = get_config().get("fuzzers", {}).get("boofuzz", {})
+        return {
+            "host": cfg["host"],
+            "port": int(cfg["port"]),
+            "proto": cfg.get("proto", "tcp"),
+            "protocol": cfg.get("protocol"),
+            "seed": cfg.get("seed", "FUZZ"),
+            "reuse_connection": cfg.get("reuse_connection", True),
+            "check_response": cfg.get("check_response", True),
+            "max_cases": cfg.get("max_cases"),
+            "max_depth": cfg.get("max_depth"),
+            "crash_threshold_request": cfg.get(
+                "crash_threshold_request", defaults.get("crash_threshold_request", 12)
+            ),
+            "crash_threshold_element": cfg.get(
+                "crash_threshold_element", defaults.get("crash_threshold_element", 3)
+            ),
+            "restart_timeout": cfg.get("restart_timeout", 30),
+            "sleep_time": cfg.get("sleep_time", 0.0),
+            "recv_timeout": cfg.get("recv_timeout", 1.0),
+            "workdir": self.workdir,
+        }
+
+    # -----------------------------------------
+    # Lifecycle
+    # -----------------------------------------
+
+    def start(self) -> None:
+        with self._lock:
+            if self._state == FuzzerState.RUNNING:
+                return
+
+            self._done.clear()
+            self._error = None
+            self._stopping = False
+            self._started_at = time.time()
+            self._state = FuzzerState.RUNNING
+
+        get_worker_pool().submit(self)
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopping = True
+
+        pool = get_worker_pool()
+        worker = pool.stop_session(self.id)
+
+        if worker is not None:
+            timeout = get_config().get("fuzzers", {}).get("boofuzz", {}).get("stop_timeout", 5)
+            if not self._done.wait(timeout):
+                pool.kill_worker(worker)
+                self._done.wait(timeout)
+
+        with self._lock:
+            self._state = FuzzerState.STOPPED
+
+    def status(self) -> Dict[str, Any]:
+        status = super().status()
+        # The worker is shared by later sessions, so it is not this
+        # instance's process (nothing to signal or reattach to)
+        status["pid"] = None
+        status["worker_pid"] = get_worker_pool().worker_pid(self.id)
+        return status
+
+    def cores_needed(self):
+        # Sessions run in the shared worker pool, not a process of our own
+        return 0
+
+    def crash_dirs(self):
+        return [os.path.join(self.workdir, "crashes")]
+
+    def scale_config(self):
+        # One session per network target; a second would fight over it
+        return None
+
+    # -----------------------------------------
+    # Pool Callbacks (dispatcher thread)
+    # -----------------------------------------
+
+    def _on_stats(self, stats: dict):
+        self._stats = stats
+
+    def _on_crash(self, crash: dict):
+        self._crashes.append(crash)
+
+    def _on_done(self, error: Optional[str]):
+        self._error = error
+
+        with self._lock:
+            if self._state == FuzzerState.RUNNING:
+                if error:
+                    self._state = FuzzerState.CRASHED
+                elif self._stopping:
+                    self._state = FuzzerState.STOPPED
+                else:
+                    # fuzz() returned: max_cases/max_depth reached or
+                    # every element exhausted by the crash thresholds
+                    self._state = FuzzerState.FINISHED
+
+        if error:
+            print(f"[!] boofuzz session {self.id} ended: {error}")
+        elif not self._stopping:
+            print(f"[*] boofuzz session {self.id} finished ({self._stats.get('test_cases', 0)} test cases)")
+
+        self._done.set()
+
+    # -----------------------------------------
+    # Metrics / Crashes
+    # -----------------------------------------
+
+    def collect_metrics(self):
+        stats = self._stats
+        if not stats:
+            return None
+
+        now = time.monotonic()
+        cases = stats.get("test_cases", 0)
+
+        if self._rate_mark is not None:
+            last_time, last_cases = self._rate_mark
+            if now > last_time:
+                self._rate = (cases - last_cases) / (now - last_time)
+        self._rate_mark = (now, cases)
+
+        return {
+            "exec_per_sec": self._rate,
+            "corpus_size": None,
+            "coverage": None,
+            "crashes_found": stats.get("failures"),
+            "test_cases": cases,
+            "mutation_index": stats.get("mutation_index"),
+            "total_mutations": stats.get("total_mutations"),
+        }
+
+    def collect_crashes(self):
+        crashes = []
+        while self._crashes:
+            crashes.append(self._crashes.popleft())
+        return crashes
+
+
+if __name__ == "__main__":
+    _worker_main(Connection(int(sys.argv[1])))
@@ -0,0 +1,250 @@
+"""
+File: fuzzhub/fuzzers/honggfuzz.py
+
+honggfuzz adapter.
+
+Statistics come from the --statsfile CSV, tailed from the last byte
+offset. New crash files are discovered through directory change
+notifications (one inotify watcher shared by all instances on Linux)
+instead of listing the crash directory on every poll. After a daemon restart the directory is
+listed once and only crashes written since the previous daemon's last
+check are reported.
+"""
+
+import os
+import re
+import time
+from typing import Any, Dict
+
+from fuzzhub.fuzzers.base import BaseFuzzer
+from fuzzhub.utils.files import FileTail
+from fuzzhub.utils.inotify import get_shared_watcher
+
+
+# --statsfile columns -> FuzzHub metric names
+_STATS_COLUMNS = {
+    "exec_per_sec": "exec_per_sec",
+    "total_exec": "total_execs",
+    "unique_crashes": "crashes_found",
+    "edge_cov": "coverage",
+    "block_cov": "block_coverage",
+    "hangs": "hangs",
+}
+
+_DEFAULT_COLUMNS = [
+    "unix_time", "last_cov_update", "total_exec", "exec_per_sec",
+    "crashes", "unique_crashes", "hangs", "edge_cov", "block_cov",
+]
+
+_STACK_HASH = re.compile(r"\.STACK\.([0-9a-fA-F]+)\.")
+
+
+def _parse_number(value: str):
+    value = value.strip()
+    try:
+        return float(value) if "." in value else int(value)
+    except ValueError:
+        return None
+
+
+class HonggfuzzFuzzer(BaseFuzzer):
+    """
+    Config keys:
+        target_binary   (required) path to the instrumented target
+        target_args     argv after the binary, "___FILE___" marks the
+                        input file (default: input on stdin / persistent)
+        honggfuzz_path  honggfuzz executable (default "honggfuzz")
+        input_dir       seed directory (default: one generated seed)
+        workdir         per-instance workspace
+                        (default runtime/honggfuzz/<campaign>/<id prefix>)
+        threads         -n (default 1)
+        timeout         -t (seconds)
+        dictionary      -w
+        extra_args      additional honggfuzz arguments
+        env             extra environment variables
+    """
+
+    def __init__(self, campaign_id: str, config: Dict[str, Any], fuzzer_id: str = None):
+        super().__init__(campaign_id, config, fuzzer_id)
+
+        self.workdir = os.path.abspath(
+            config.get("workdir")
+            or os.path.join("runtime", "honggfuzz", str(campaign_id), self.id[:8])
+        )
+        self.crash_dir = os.path.join(self.workdir, "crashes")
+        self.stats_path = os.path.join(self.workdir, "stats.csv")
+        self.input_dir = config.get("input_dir")
+
+        self._stats = FileTail(self.stats_path)
+        self._columns = list(_DEFAULT_COLUMNS)
+        self._latest: Dict[str, Any] = {}
+        self._watcher = None
+        self._crash_checked_at = None
+        self._rescan_since = None
+
+    # -----------------------------------------
+    # Setup / Command
+    # -----------------------------------------
+
+    def setup(self):
+        if not self.config.get("target_binary"):
+            raise ValueError("honggfuzz requires 'target_binary' in config")
+
+        os.makedirs(self.crash_dir, exist_ok=True)
+
+        if not self.input_dir:
+            self.input_dir = os.path.join(self.workdir, "seeds")
+            os.makedirs(self.input_dir, exist_ok=True)
+            seed = os.path.join(self.input_dir, "seed")
+            if not os.path.exists(seed):
+                with open(seed, "wb") as f:
+                    f.write(b"FUZZ")
+
+        self._watcher = get_shared_watcher().watch([self.crash_dir])
+
+    def build_command(self):
+        cfg = self.config
+
+        cmd = [
+            cfg.get("honggfuzz_path", "honggfuzz"),
+            "--input", self.input_dir,
+            "--workspace", self.workdir,
+            "--crashdir", self.crash_dir,
+            "--statsfile", self.stats_path,
+            "--threads", str(int(cfg.get("threads", 1))),
+        ]
+
+        if cfg.get("timeout"):
+            cmd += ["--timeout", str(cfg["timeout"])]
+        if cfg.get("dictionary"):
+            cmd += ["--dict", cfg["dictionary"]]
+
+        cmd += list(cfg.get("extra_args", []))
+        cmd += ["--", cfg["target_binary"]]
+        cmd += list(cfg.get("target_args", []))
+
+        return cmd
+
+    def build_env(self):
+        if not self.config.get("env"):
+            return None
+        env = dict(os.environ)
+        env.update({k: str(v) for k, v in self.config["env"].items()})
+        return env
+
+    def output_streams(self):
+        log = open(os.path.join(self.workdir, "honggfuzz.log"), "ab")
+        return log, log
+
+    def cores_needed(self):
+        return max(1, int(self.config.get("threads", 1)))
+
+    def crash_dirs(self):
+        return [self.crash_dir]
+
+    def export_state(self):
+        return {
+            "stats": self._stats.position(),
+            "columns": self._columns,
+            "crash_checked_at": self._crash_checked_at,
+        }
+
+    def restore_state(self, state):
+        self._stats.seek(state.get("stats"))
+        self._columns = state.get("columns") or list(_DEFAULT_COLUMNS)
+        # Crashes since the last poll of the previous daemon were missed
+        self._rescan_since = state.get("crash_checked_at") or 0.0
+
+    def scale_config(self):
+        config = dict(self.config)
+        config.pop("workdir", None)
+        return config
+
+    def queue_dirs(self):
+        # New inputs are written back into the input corpus; honggfuzz
+        # does not re-read it while running, so it only contributes
+        return [self.input_dir] if self.input_dir else []
+
+    def stop(self):
+        super().stop()
+        if self._watcher:
+            self._watcher.close()
+
+    # -----------------------------------------
+    # Metrics
+    # -----------------------------------------
+
+    def collect_metrics(self):
+        last = None
+
+        for line in self._stats.read_lines():
+            if line.startswith("#"):
+                self._columns = [c.strip() for c in line.lstrip("#").split(",")]
+            elif line.strip():
+                last = line
+
+        if last is not None:
+            row = {}
+            for column, value in zip(self._columns, last.split(",")):
+                name = _STATS_COLUMNS.get(column)
+                if name:
+                    row[name] = _parse_number(value)
+            self._latest = row
+
+        if not self._latest:
+            return None
+
+        return {
+            "exec_per_sec": self._latest.get("exec_per_sec"),
+            "corpus_size": None,
+            "coverage": self._latest.get("coverage"),
+            "crashes_found": self._latest.get("crashes_found"),
+            "total_execs": self._latest.get("total_execs"),
+            "block_coverage": self._latest.get("block_coverage"),
+        }
+
+    # -----------------------------------------
+    # Crashes
+    # -----------------------------------------
+
+    def collect_crashes(self):
+        if self._watcher is None:
+            return []
+
+        crashes = []
+        checked_at = time.time()
+        paths = self._watcher.poll()
+
+        if self._rescan_since is not None:
+            # The first poll lists every file already in the directory;
+            # only those written since the last check are new
+            paths = self._written_since(self._rescan_since, paths)
+            self._rescan_since = None
+
+        for path in sorted(paths):
+            name = os.path.basename(path)
+
+            if name.startswith(".") or name.upper().startswith("HONGGFUZZ.REPORT"):
+                continue
+
+            stack = _STACK_HASH.search(name)
+            crashes.append({
+                "type": name.split(".", 1)[0],
+                "input_path": path,
+                # honggfuzz's own stack hash is the best bucket we have
+                "stack_trace": f"STACK {stack.group(1)}" if stack else "",
+            })
+
+        self._crash_checked_at = checked_at
+        return crashes
+
+    @staticmethod
+    def _written_since(since: float, paths) -> list:
+        written = []
+        for path in paths:
+            try:
+                if os.stat(path).st_mtime >= since - 1.0:
+                    written.append(path)
+            except OSError:
+                continue
+        return written
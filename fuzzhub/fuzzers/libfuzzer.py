@@ -0,0 +1,413 @@
+"""
+File: fuzzhub/fuzzers/libfuzzer.py
+
+libFuzzer adapter.
+
+The target's output goes to libfuzzer.log in the working directory
+(a file, not a pipe, so the process survives a daemon restart). A
+poller on the shared stream pump tails it and parses it line by line
+into an in-memory stats record, so collect_metrics and collect_crashes
+never touch the filesystem. With -jobs=N, libFuzzer writes each job's
+output to fuzz-<N>.log; those files are tailed by the same poller and
+aggregated per job. Log offsets are exported with each heartbeat, so
+a restarted daemon reattaches and continues from them.
+"""
+
+import collections
+import os
+import re
+import threading
+from typing import Any, Dict
+
+from fuzzhub.fuzzers.base import BaseFuzzer
+from fuzzhub.utils.files import FileTail
+from fuzzhub.utils.streams import get_pump
+
+
+_STATUS = re.compile(r"^#(\d+)[:\s]")
+# -fork=N status lines print "exec/s 2048", without the colon
+_FIELD = re.compile(r"\b(cov|ft|corp|exec/s|rss|job|oom/timeout/crash)(?::\s*|\s+)(\S+)")
+_ERROR = re.compile(r"^==\d+==\s*ERROR:\s*(\w+):\s*(.*)")
+_UBSAN = re.compile(r"runtime error:\s*(.*)")
+_ARTIFACT = re.compile(r"Test unit written to (\S+)")
+_JOB_LOG = re.compile(r"^fuzz-(\d+)\.log$")
+_COVERAGE_LINE = ("COVERED_FUNC:", "UNCOVERED_FUNC:", "UNCOVERED_PC:", "COVERED:")
+
+_MAX_TRACE_LINES = 256
+
+# libFuzzer's own "ERROR: libFuzzer: ..." reasons
+_LIBFUZZER_ERRORS = (
+    ("deadly signal", "deadly_signal"),
+    ("timeout", "timeout"),
+    ("out-of-memory", "out_of_memory"),
+    ("fuzz target exited", "target_exit"),
+    ("malloc limit", "malloc_limit"),
+)
+
+# Artifact file prefixes that indicate a finding
+_ARTIFACT_TYPES = {
+    "crash": "crash",
+    "leak": "leak",
+    "timeout": "timeout",
+    "oom": "out_of_memory",
+}
+
+
+def _error_type(tool: str, text: str) -> str:
+    if tool == "libFuzzer":
+        for needle, name in _LIBFUZZER_ERRORS:
+            if needle in text:
+                return name
+        return "libfuzzer_error"
+
+    return text.split()[0] if text else tool
+
+
+class _StreamParser:
+    """
+    Incremental parser for one libFuzzer output stream.
+    """
+
+    def __init__(self, workdir: str, on_crash, coverage_path: str = None):
+        self.workdir = workdir
+        self.coverage_path = coverage_path
+        self.stats: Dict[str, Any] = {}
+        self._on_crash = on_crash
+        self._trace = None
+        self._crash_type = None
+        self._coverage = None
+
+    def feed(self, line: str):
+        if self._coverage is not None:
+            if line.startswith(_COVERAGE_LINE):
+                self._coverage.append(line)
+                return
+            self.finish()
+
+        if line.startswith("COVERAGE:") and self.coverage_path:
+            self._coverage = []
+            return
+
+        status = _STATUS.match(line)
+        if status:
+            self._update_stats(int(status.group(1)), line)
+            return
+
+        error = _ERROR.match(line)
+        if error:
+            self._crash_type = _error_type(error.group(1), error.group(2))
+            self._trace = [line]
+            return
+
+        if self._trace is None:
+            ubsan = _UBSAN.search(line)
+            if ubsan:
+                self._crash_type = "undefined_behavior"
+                self._trace = [line]
+                return
+
+        artifact = _ARTIFACT.search(line)
+        if artifact:
+            self._emit(artifact.group(1))
+            return
+
+        if self._trace is not None and len(self._trace) < _MAX_TRACE_LINES:
+            self._trace.append(line)
+
+    def flush_coverage(self):
+        """
+        Write the -print_coverage dump collected so far (if any).
+        """
+        if not self._coverage:
+            return
+
+        tmp = self.coverage_path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write("\n".join(self._coverage) + "\n")
+        os.replace(tmp, self.coverage_path)
+
+    def finish(self):
+        self.flush_coverage()
+        self._coverage = None
+
+    def _update_stats(self, execs: int, line: str):
+        stats = {"total_execs": execs}
+
+        for key, value in _FIELD.findall(line):
+            if key == "corp":
+                stats["corpus_size"] = int(value.split("/")[0])
+            elif key == "exec/s":
+                stats["exec_per_sec"] = float(value)
+            elif key == "cov":
+                stats["coverage"] = int(value)
+            elif key == "ft":
+                stats["features"] = int(value)
+            elif key == "rss":
+                stats["rss_mb"] = int(value.rstrip("Mb"))
+            elif key == "job":
+                stats["jobs_started"] = int(value)
+
+        self.stats.update(stats)
+
+    def _emit(self, path: str):
+        name = os.path.basename(path)
+        prefix = name.split("-", 1)[0]
+
+        crash_type = self._crash_type or _ARTIFACT_TYPES.get(prefix)
+        trace = self._trace or []
+        self._trace = None
+        self._crash_type = None
+
+        if crash_type is None:
+            # e.g. slow-unit-*: informational, not a finding
+            return
+
+        if not os.path.isabs(path):
+            path = os.path.normpath(os.path.join(self.workdir, path))
+
+        self._on_crash({
+            "type": crash_type,
+            "input_path": path,
+            "stack_trace": "\n".join(trace),
+        })
+
+
+class LibFuzzerFuzzer(BaseFuzzer):
+    """
+    Config keys:
+        target_binary   (required) libFuzzer-linked target
+        corpus_dir      writable corpus (default runtime/libfuzzer/<campaign>/corpus)
+        seed_dirs       extra read-only corpus directories
+        fork            -fork=N
+        jobs            -jobs=N (with optional workers for -workers=N)
+        max_len         -max_len
+        timeout         -timeout (seconds)
+        rss_limit_mb    -rss_limit_mb
+        dictionary      -dict
+        print_coverage  pass -print_coverage=1; the dump printed at exit
+                        feeds campaign coverage
+        extra_args      additional libFuzzer flags
+        env             extra environment variables
+    """
+
+    def __init__(self, campaign_id: str, config: Dict[str, Any], fuzzer_id: str = None):
+        super().__init__(campaign_id, config, fuzzer_id)
+
+        base = os.path.abspath(os.path.join("runtime", "libfuzzer", str(campaign_id)))
+
+        self.workdir = os.path.join(base, self.id[:8])
+        self.corpus_dir = os.path.abspath(
+            config.get("corpus_dir") or os.path.join(base, "corpus")
+        )
+        self.artifact_dir = os.path.join(self.workdir, "artifacts")
+
+        self._stats_lock = threading.Lock()
+        self._main = _StreamParser(
+            self.workdir, self._record_crash,
+            os.path.join(self.workdir, "coverage.txt"),
+        )
+        self._log = FileTail(os.path.join(self.workdir, "libfuzzer.log"))
+        self._jobs: Dict[int, _StreamParser] = {}
+        self._job_tails: Dict[int, FileTail] = {}
+        self._crashes = collections.deque()
+        self._crashes_found = 0
+
+    # -----------------------------------------
+    # Setup / Command
+    # -----------------------------------------
+
+    def setup(self):
+        if not self.config.get("target_binary"):
+            raise ValueError("libFuzzer requires 'target_binary' in config")
+
+        os.makedirs(self.corpus_dir, exist_ok=True)
+        os.makedirs(self.artifact_dir, exist_ok=True)
+
+    def build_command(self):
+        cfg = self.config
+
+        cmd = [
+            cfg["target_binary"],
+            f"-artifact_prefix={self.artifact_dir}/",
+            "-print_final_stats=1",
+        ]
+
+        if cfg.get("print_coverage"):
+            cmd.append("-print_coverage=1")
+
+        if cfg.get("fork"):
+            cmd.append(f"-fork={int(cfg['fork'])}")
+        elif cfg.get("jobs"):
+            cmd.append(f"-jobs={int(cfg['jobs'])}")
+            if cfg.get("workers"):
+                cmd.append(f"-workers={int(cfg['workers'])}")
+
+        for key, flag in (
+            ("max_len", "-max_len"),
+            ("timeout", "-timeout"),
+            ("rss_limit_mb", "-rss_limit_mb"),
+            ("dictionary", "-dict"),
+        ):
+            if cfg.get(key) is not None:
+                cmd.append(f"{flag}={cfg[key]}")
+
+        cmd += list(cfg.get("extra_args", []))
+        cmd.append(self.corpus_dir)
+        cmd += list(cfg.get("seed_dirs", []))
+
+        return cmd
+
+    def build_env(self):
+        if not self.config.get("env"):
+            return None
+        env = dict(os.environ)
+        env.update({k: str(v) for k, v in self.config["env"].items()})
+        return env
+
+    def output_streams(self):
+        log = open(self._log.path, "ab")
+        return log, log
+
+    def working_dir(self):
+        return self.workdir
+
+    def on_started(self):
+        get_pump().add_poller(f"libfuzzer-{self.id}", self._poll_logs)
+
+    def stop(self):
+        get_pump().remove_poller(f"libfuzzer-{self.id}")
+        super().stop()
+
+        # Whatever was written before the process exited
+        self._poll_logs()
+        with self._stats_lock:
+            self._main.finish()
+
+    def export_state(self):
+        with self._stats_lock:
+            return {
+                "log": self._log.position(),
+                "stats": dict(self._main.stats),
+                "jobs": {
+                    str(job): {"tail": tail.position(), "stats": dict(self._jobs[job].stats)}
+                    for job, tail in self._job_tails.items()
+                },
+                "crashes_found": self._crashes_found,
+            }
+
+    def restore_state(self, state):
+        self._log.seek(state.get("log"))
+        self._main.stats.update(state.get("stats") or {})
+        for job, saved in (state.get("jobs") or {}).items():
+            self._add_job(int(job)).seek(saved.get("tail"))
+            self._jobs[int(job)].stats.update(saved.get("stats") or {})
+        self._crashes_found = state.get("crashes_found", 0)
+
+    def coverage_sources(self):
+        sources = [("libfuzzer", self._main.coverage_path)]
+        sources += [("libfuzzer", p.coverage_path) for p in list(self._jobs.values())]
+        return sources + super().coverage_sources()
+
+    def cores_needed(self):
+        cfg = self.config
+        if cfg.get("fork"):
+            return int(cfg["fork"])
+        if cfg.get("jobs"):
+            # -jobs runs min(jobs, workers) processes; workers defaults to cores/2
+            return max(1, min(int(cfg["jobs"]), int(cfg.get("workers") or cfg["jobs"])))
+        return 1
+
+    def crash_dirs(self):
+        return [self.artifact_dir]
+
+    def queue_dirs(self):
+        return [self.corpus_dir]
+
+    def corpus_import(self):
+        return "libfuzzer", self.corpus_dir
+
+    # -----------------------------------------
+    # Stream Handling (pump thread)
+    # -----------------------------------------
+
+    def _poll_logs(self):
+        self._feed(self._main, self._log)
+
+        if not self.config.get("jobs") or self.config.get("fork"):
+            return
+
+        try:
+            names = os.listdir(self.workdir)
+        except OSError:
+            return
+
+        for name in names:
+            match = _JOB_LOG.match(name)
+            if match and int(match.group(1)) not in self._job_tails:
+                self._add_job(int(match.group(1)))
+
+        for job, tail in list(self._job_tails.items()):
+            self._feed(self._jobs[job], tail)
+
+    def _add_job(self, job: int) -> FileTail:
+        tail = FileTail(os.path.join(self.workdir, f"fuzz-{job}.log"))
+        with self._stats_lock:
+            self._jobs[job] = _StreamParser(
+                self.workdir, self._record_crash,
+                os.path.join(self.workdir, f"coverage-{job}.txt"),
+            )
+            self._job_tails[job] = tail
+        return tail
+
+    def _feed(self, parser: _StreamParser, tail: FileTail):
+        lines = tail.read_lines()
+        if lines:
+            with self._stats_lock:
+                for line in lines:
+                    parser.feed(line)
+                # A dump at the end of a log has no line after it
+                parser.flush_coverage()
+
+    def _record_crash(self, crash: dict):
+        self._crashes.append(crash)
+        self._crashes_found += 1
+
+    # -----------------------------------------
+    # Metrics / Crashes (no I/O)
+    # -----------------------------------------
+
+    def collect_metrics(self):
+        with self._stats_lock:
+            jobs = {job: dict(p.stats) for job, p in self._jobs.items() if p.stats}
+            main = dict(self._main.stats)
+            crashes_found = self._crashes_found
+
+        if jobs:
+            stats = {
+                "exec_per_sec": sum(j.get("exec_per_sec", 0) for j in jobs.values()),
+                "total_execs": sum(j.get("total_execs", 0) for j in jobs.values()),
+                "coverage": max(j.get("coverage", 0) for j in jobs.values()),
+                "features": max(j.get("features", 0) for j in jobs.values()),
+                "corpus_size": max(j.get("corpus_size", 0) for j in jobs.values()),
+                "jobs": jobs,
+            }
+        elif main:
+            stats = main
+        else:
+            return None
+
+        return {
+            "exec_per_sec": stats.get("exec_per_sec"),
+            "corpus_size": stats.get("corpus_size"),
+            "coverage": stats.get("coverage"),
+            "crashes_found": crashes_found,
+            "features": stats.get("features"),
+            "total_execs": stats.get("total_execs"),
+            "jobs": stats.get("jobs"),
+        }
+
+    def collect_crashes(self):
+        crashes = []
+        while self._crashes:
+            crashes.append(self._crashes.popleft())
+        return crashes
@@ -32,3 +32,19 @@ class FuzzerRegistry:
 from fuzzhub.fuzzers.dummy import DummyFuzzer
 FuzzerRegistry.register("dummy", DummyFuzzer)
 
+# AFL++
+from fuzzhub.fuzzers.afl import AflFuzzer
+FuzzerRegistry.register("afl", AflFuzzer)
+
+# libFuzzer
+from fuzzhub.fuzzers.libfuzzer import LibFuzzerFuzzer
+FuzzerRegistry.register("libfuzzer", LibFuzzerFuzzer)
+
+# honggfuzz
+from fuzzhub.fuzzers.honggfuzz import HonggfuzzFuzzer
+FuzzerRegistry.register("honggfuzz", HonggfuzzFuzzer)
+
+
+# boofuzz
+from fuzzhub.fuzzers.boofuzz import BoofuzzFuzzer
+FuzzerRegistry.register("boofuzz", BoofuzzFuzzer)
@@ -0,0 +1,135 @@
+"""
+File: fuzzhub/tui/live_client.py
+
+Client for the v2 live-state WebSocket protocol.
+
+Keeps a local copy of every instance's row, built from the server's
+snapshot and patched by its numbered deltas. After a reconnect it asks
+to resume from the last batch it applied, so only missed deltas are
+transferred.
+"""
+
+import asyncio
+import json
+from urllib.parse import urlencode
+
+import websockets
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class LiveClient:
+    """
+    on_change(changes, removed) is called after every applied message:
+    changes maps id -> changed fields, or is None after a snapshot
+    (rows were replaced). on_event(event) receives other events
+    (crash_found, fuzzer_exit, ...).
+    """
+
+    def __init__(self, url="ws://127.0.0.1:8000/ws", topics=None,
+                 on_change=None, on_event=None):
+        self.url = url
+        self.topics = list(topics or [])
+        self.on_change = on_change
+        self.on_event = on_event
+
+        self.rows = {}
+        self.fields = []
+        self._ids = {}
+        self.epoch = None
+        self.seq = None
+        self.encoding = "msgpack" if msgpack else "json"
+
+    def _connect_url(self):
+        params = {"v": "2", "encoding": self.encoding}
+        if self.topics:
+            params["topics"] = ",".join(self.topics)
+        if self.epoch is not None and self.seq is not None:
+            params["epoch"] = self.epoch
+            params["since"] = str(self.seq)
+        return f"{self.url}?{urlencode(params)}"
+
+    # --------------------------------------------------
+    # Connection
+    # --------------------------------------------------
+
+    async def run(self):
+        while True:
+            try:
+                async with websockets.connect(self._connect_url()) as websocket:
+                    async for frame in websocket:
+                        await self._handle(websocket, frame)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception:
+                await asyncio.sleep(2)
+
+    async def _handle(self, websocket, frame):
+        if isinstance(frame, bytes):
+            message = msgpack.unpackb(frame, raw=False)
+        else:
+            message = json.loads(frame)
+
+        kind = message.get("type")
+
+        if kind == "ping":
+            await websocket.send(json.dumps({"op": "pong"}))
+        elif kind in ("snapshot", "delta"):
+            self.apply(message)
+        elif kind in ("resumed", "subscribed", "pong"):
+            pass
+        elif self.on_event:
+            self.on_event(message)
+
+    # --------------------------------------------------
+    # State
+    # --------------------------------------------------
+
+    def apply(self, message: dict):
+        if message["type"] == "snapshot":
+            self.fields = list(message["fields"])
+            self.rows, self._ids = {}, {}
+            for entry in message["rows"]:
+                self._add(entry)
+            self.epoch = message["epoch"]
+            self.seq = message["seq"]
+            if self.on_change:
+                self.on_change(None, [])
+            return
+
+        if self.seq is not None and message["seq"] <= self.seq:
+            return
+
+        self.fields += message.get("fields", [])
+        changes = {}
+
+        for entry in message.get("added", []):
+            fid = self._add(entry)
+            changes[fid] = dict(self.rows[fid])
+
+        for entry in message.get("changes", []):
+            fid = self._ids.get(entry[0])
+            if fid is None:
+                continue
+            diff = {self.fields[i]: v for i, v in zip(entry[1::2], entry[2::2])}
+            self.rows[fid].update(diff)
+            changes[fid] = diff
+
+        removed = [self._ids.pop(slot) for slot in message.get("removed", []) if slot in self._ids]
+        for fid in removed:
+            self.rows.pop(fid, None)
+
+        self.seq = message["seq"]
+        if self.on_change:
+            self.on_change(changes, removed)
+
+    def _add(self, entry) -> str:
+        row = dict(zip(self.fields, entry[1:]))
+        self._ids[entry[0]] = row["id"]
+        self.rows[row["id"]] = row
+        return row["id"]
@@ -11,6 +11,7 @@ from fuzzhub.tui.widgets.sidebar import Sidebar
 from fuzzhub.tui.widgets.stats_panel import StatsPanel
 from fuzzhub.tui.widgets.fuzzer_table import FuzzerTable
 from fuzzhub.tui.api_client import APIClient
+from fuzzhub.tui.live_client import LiveClient
 
 
 class DashboardScreen(Screen):
@@ -20,6 +21,8 @@ class DashboardScreen(Screen):
         self.api = APIClient()
         self.stats = StatsPanel()
         self.table = FuzzerTable()
+        self.live = LiveClient(on_change=self.on_live_change)
+        self._ws_task = None
 
     def compose(self):
         with Horizontal():
@@ -40,3 +43,17 @@ class DashboardScreen(Screen):
 
         if self.table.row_count > 0:
             self.table.cursor_coordinate = (0, 0)
+
+        self._ws_task = asyncio.create_task(self.live.run())
+
+    async def on_unmount(self):
+        if self._ws_task:
+            self._ws_task.cancel()
+
+    def on_live_change(self, changes, removed):
+        rows = self.live.rows
+        if changes is None:
+            self.table.update_data(list(rows.values()))
+        else:
+            self.table.apply_changes(rows, changes, removed)
+        self.stats.update_stats(list(rows.values()))
@@ -3,8 +3,7 @@ File: fuzzhub/tui/screens/fuzzer_detail.py
 """
 
 import asyncio
-import json
-import websockets
+import time
 
 from textual.screen import Screen
 from textual.binding import Binding
@@ -12,6 +11,7 @@ from textual.containers import Vertical
 from textual.widgets import Static, Footer
 
 from fuzzhub.tui.api_client import APIClient
+from fuzzhub.tui.live_client import LiveClient
 
 
 class FuzzerDetailScreen(Screen):
@@ -28,6 +28,8 @@ class FuzzerDetailScreen(Screen):
         self.fuzzer_id = fuzzer_id
         self.api = APIClient()
         self.detail_text = Static("Loading...", id="detail_text")
+        # Only this instance's row
+        self.live = LiveClient(topics=[f"fuzzer:{fuzzer_id}"], on_change=self.on_live_change)
         self._ws_task = None
 
     def compose(self):
@@ -38,7 +40,7 @@ class FuzzerDetailScreen(Screen):
 
     async def on_mount(self):
         await self.refresh_data()
-        self._ws_task = asyncio.create_task(self.listen_ws())
+        self._ws_task = asyncio.create_task(self.live.run())
 
     async def on_unmount(self):
         if self._ws_task:
@@ -48,22 +50,10 @@ class FuzzerDetailScreen(Screen):
     # Live Updates
     # --------------------------------------------------
 
-    async def listen_ws(self):
-        uri = "ws://127.0.0.1:8000/ws"
-
-        while True:
-            try:
-                async with websockets.connect(uri) as websocket:
-                    while True:
-                        message = await websocket.recv()
-                        event = json.loads(message)
-
-                        if event.get("type") == "fuzzer_update":
-                            if event.get("id") == self.fuzzer_id:
-                                await self.refresh_data()
-
-            except Exception:
-                await asyncio.sleep(2)
+    def on_live_change(self, changes, removed):
+        fuzzer = self.live.rows.get(self.fuzzer_id)
+        if fuzzer:
+            self.render_fuzzer(fuzzer)
 
     # --------------------------------------------------
     # Data Refresh
@@ -79,6 +69,13 @@ class FuzzerDetailScreen(Screen):
             self.detail_text.update("[red]Fuzzer not found[/red]")
             return
 
+        self.render_fuzzer(fuzzer)
+
+    def render_fuzzer(self, fuzzer: dict):
+        uptime = fuzzer.get("uptime_seconds")
+        if fuzzer.get("started_at") and fuzzer.get("state") == "running":
+            uptime = time.time() - fuzzer["started_at"]
+
         text = f"""
 [bold cyan]Fuzzer Details[/bold cyan]
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -86,7 +83,7 @@ class FuzzerDetailScreen(Screen):
 [bold]ID:[/bold] {fuzzer.get("id")}
 [bold]State:[/bold] {fuzzer.get("state")}
 [bold]PID:[/bold] {fuzzer.get("pid")}
-[bold]Uptime:[/bold] {fuzzer.get("uptime_seconds")}
+[bold]Uptime:[/bold] {uptime}
 [bold]Exec/s:[/bold] {fuzzer.get("exec_per_sec")}
 [bold]Corpus:[/bold] {fuzzer.get("corpus_size")}
 [bold]Coverage:[/bold] {fuzzer.get("coverage")}
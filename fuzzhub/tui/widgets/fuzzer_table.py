@@ -10,6 +10,31 @@ from fuzzhub.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Row field -> column key (the ID column is the row key itself)
+_COLUMNS = {
+    "state": "state",
+    "exec_per_sec": "execs",
+    "crash_count": "crashes",
+}
+
+
+def _state_cell(state):
+    if state == "running":
+        return "[green]running[/green]"
+    elif state == "stopped":
+        return "[yellow]stopped[/yellow]"
+    elif state == "finished":
+        return "[blue]finished[/blue]"
+    elif state == "crashed":
+        return "[red]crashed[/red]"
+    return state or ""
+
+
+def _cell(field, value):
+    if field == "state":
+        return _state_cell(value)
+    return str(value if value is not None else 0)
+
 
 class FuzzerTable(DataTable):
 
@@ -20,7 +45,10 @@ class FuzzerTable(DataTable):
     ]
 
     def on_mount(self):
-        self.add_columns("ID", "State", "Execs", "Crashes")
+        self.add_column("ID", key="id")
+        self.add_column("State", key="state")
+        self.add_column("Execs", key="execs")
+        self.add_column("Crashes", key="crashes")
         self.cursor_type = "row"
         self.show_cursor = True
         self.zebra_stripes = True
@@ -31,22 +59,30 @@ class FuzzerTable(DataTable):
         self.clear()
 
         for f in fuzzers:
-            state = f.get("state", "")
-
-            if state == "running":
-                state = "[green]running[/green]"
-            elif state == "stopped":
-                state = "[yellow]stopped[/yellow]"
-            elif state == "crashed":
-                state = "[red]crashed[/red]"
-
-            self.add_row(
-                f.get("id", ""),
-                state,
-                str(f.get("executions", 0)),
-                str(f.get("crashes", 0)),
-                key=f.get("id"),
-            )
+            self._add(f)
+
+    def apply_changes(self, rows, changes, removed):
+        """
+        Patch only the cells a live-state delta touched.
+        """
+        for fid in removed:
+            if fid in self.rows:
+                self.remove_row(fid)
+
+        for fid, diff in changes.items():
+            if fid not in self.rows:
+                self._add(rows[fid])
+                continue
+            for field, column in _COLUMNS.items():
+                if field in diff:
+                    self.update_cell(fid, column, _cell(field, diff[field]))
+
+    def _add(self, f):
+        self.add_row(
+            f.get("id", ""),
+            *(_cell(field, f.get(field)) for field in _COLUMNS),
+            key=f.get("id"),
+        )
 
     def action_open_selected(self):
         if self.cursor_row is None:
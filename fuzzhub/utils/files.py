@@ -0,0 +1,78 @@
+"""
+File: fuzzhub/utils/files.py
+
+Incremental file readers used by fuzzer adapters.
+"""
+
+import os
+from typing import List, Optional, Tuple
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """
+    (mtime_ns, size) of a file, or None if it does not exist.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class FileTail:
+    """
+    Reads only the bytes appended to a file since the last call.
+
+    A trailing partial line is left unread until its newline
+    arrives. If the file shrinks or is replaced, reading restarts
+    from the beginning.
+    """
+
+    def __init__(self, path: str, offset: int = 0):
+        self.path = path
+        self.offset = offset
+        self._inode = None
+
+    def position(self) -> dict:
+        """
+        Resume point, JSON-serializable (see seek()).
+        """
+        return {"offset": self.offset, "inode": self._inode}
+
+    def seek(self, position: Optional[dict]):
+        """
+        Continue from a position() saved earlier, e.g. by a previous
+        daemon; a replaced file (new inode) is still read from 0.
+        """
+        position = position or {}
+        self.offset = position.get("offset", 0)
+        self._inode = position.get("inode")
+
+    def read_lines(self, max_bytes: int = 4 * 1024 * 1024) -> List[str]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return []
+
+        if self._inode is not None and st.st_ino != self._inode:
+            self.offset = 0
+        self._inode = st.st_ino
+
+        if st.st_size < self.offset:
+            self.offset = 0
+
+        if st.st_size == self.offset:
+            return []
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(max_bytes)
+
+        end = data.rfind(b"\n")
+        if end < 0:
+            return []
+
+        chunk = data[:end + 1]
+        self.offset += len(chunk)
+
+        return chunk.decode("utf-8", errors="replace").splitlines()
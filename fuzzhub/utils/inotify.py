@@ -0,0 +1,335 @@
+"""
+File: fuzzhub/utils/inotify.py
+
+Directory change notifications for new files.
+
+On Linux a single non-blocking inotify descriptor watches any number
+of directories, so discovering new files costs one read() regardless
+of directory size. Elsewhere (or if inotify is unavailable) it falls
+back to an mtime-gated listdir diff.
+
+Inotify instances are limited per user (fs.inotify.max_user_instances,
+often 128), so per-instance consumers share one watcher through
+get_shared_watcher() instead of opening their own.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT = struct.Struct("iIII")
+_MASK = IN_CLOSE_WRITE | IN_MOVED_TO
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+
+    if _libc is None and sys.platform.startswith("linux"):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6",
+                               use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+            _libc = libc
+        except (OSError, AttributeError):
+            _libc = False
+
+    return _libc or None
+
+
+class DirectoryWatcher:
+    """
+    Reports files that appear (closed after writing or moved in) in
+    a set of watched directories.
+
+    Files already present when a directory is first watched are
+    reported by the first poll(). Directories that do not exist yet
+    are retried on every poll(). Each file is reported once: the names
+    already reported are kept per directory, so rescans (after an
+    event queue overflow or a re-created watch) only return new files.
+    """
+
+    def __init__(self, force_polling: bool = False):
+        self._fd = None
+        self._wd_to_dir: Dict[int, str] = {}
+        self._dir_to_wd: Dict[str, int] = {}
+        self._pending: Set[str] = set()
+        self._initial: List[str] = []
+
+        # directory -> names already returned by poll()
+        self._reported: Dict[str, Set[str]] = {}
+
+        # Polling fallback state
+        self._poll_sig: Dict[str, int] = {}
+
+        libc = None if force_polling else _load_libc()
+        if libc:
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+                self._libc = libc
+            else:
+                err = ctypes.get_errno()
+                print(f"[!] inotify unavailable ({os.strerror(err)}), polling directories instead")
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._fd is not None
+
+    def fileno(self) -> Optional[int]:
+        return self._fd
+
+    # -----------------------------------------
+    # Watch Management
+    # -----------------------------------------
+
+    def add(self, path: str):
+        path = os.path.abspath(path)
+        if path in self._dir_to_wd or path in self._poll_sig:
+            return
+        self._pending.add(path)
+        self._attach_pending()
+
+    def remove(self, path: str):
+        path = os.path.abspath(path)
+        self._pending.discard(path)
+        self._reported.pop(path, None)
+        self._poll_sig.pop(path, None)
+
+        wd = self._dir_to_wd.pop(path, None)
+        if wd is not None:
+            self._wd_to_dir.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _attach_pending(self):
+        for path in list(self._pending):
+            if not os.path.isdir(path):
+                continue
+
+            self._pending.discard(path)
+            self._reported.setdefault(path, set())
+
+            if self._fd is not None:
+                wd = self._libc.inotify_add_watch(self._fd, path.encode(), _MASK)
+                if wd < 0:
+                    err = ctypes.get_errno()
+                    if err in (errno.ENOENT, errno.ENOTDIR):
+                        # Removed again since the isdir() check
+                        self._pending.add(path)
+                    else:
+                        # e.g. ENOSPC past fs.inotify.max_user_watches
+                        print(f"[!] Cannot watch {path} ({os.strerror(err)}), polling it instead")
+                        self._poll_sig[path] = None
+                    continue
+                self._wd_to_dir[wd] = path
+                self._dir_to_wd[path] = wd
+                # Watch is live, so nothing can slip between it and this scan
+                self._initial.extend(self._list(path))
+            else:
+                self._poll_sig[path] = None
+
+    def _report(self, path: str, found: List[str]):
+        directory, name = os.path.split(path)
+        reported = self._reported.get(directory)
+        if reported is None or name in reported:
+            return
+        reported.add(name)
+        found.append(path)
+
+    @staticmethod
+    def _list(path: str) -> List[str]:
+        try:
+            with os.scandir(path) as entries:
+                return [e.path for e in entries if e.is_file()]
+        except OSError:
+            return []
+
+    # -----------------------------------------
+    # Polling
+    # -----------------------------------------
+
+    def poll(self) -> List[str]:
+        """
+        Return paths of files that appeared since the last call.
+        """
+        if self._pending:
+            self._attach_pending()
+
+        if self._fd is None:
+            return self._poll_fallback()
+
+        found = self._poll_fallback() if self._poll_sig else []
+        for path in self._initial:
+            self._report(path, found)
+        self._initial = []
+
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0").decode(
+                    "utf-8", errors="surrogateescape"
+                )
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    # Kernel dropped events: fall back to a full scan once
+                    for directory in self._dir_to_wd:
+                        for path in self._list(directory):
+                            self._report(path, found)
+                    continue
+
+                if mask & IN_IGNORED:
+                    path = self._wd_to_dir.pop(wd, None)
+                    if path:
+                        # Directory removed: a re-created one starts
+                        # empty, so names in it are new files again
+                        self._dir_to_wd.pop(path, None)
+                        self._reported.pop(path, None)
+                        self._pending.add(path)
+                    continue
+
+                directory = self._wd_to_dir.get(wd)
+                if directory is None or mask & IN_ISDIR or not name:
+                    continue
+
+                self._report(os.path.join(directory, name), found)
+
+        return found
+
+    def _poll_fallback(self) -> List[str]:
+        found = []
+
+        for path in self._poll_sig:
+            try:
+                sig = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+
+            if sig == self._poll_sig.get(path):
+                continue
+            self._poll_sig[path] = sig
+
+            for entry in self._list(path):
+                self._report(entry, found)
+
+        return found
+
+
+# -------------------------------------------------
+# Shared Watcher
+# -------------------------------------------------
+
+class SharedDirectoryWatcher:
+    """
+    One DirectoryWatcher shared by many consumers. Whoever polls
+    drains the descriptor for everyone; files are queued per directory
+    until the consumer watching that directory asks for them.
+    """
+
+    def __init__(self):
+        self._watcher = DirectoryWatcher()
+        self._queued: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._watcher.uses_inotify
+
+    def watch(self, paths: Iterable[str]) -> "SharedWatch":
+        return SharedWatch(self, [os.path.abspath(p) for p in paths])
+
+    def _add(self, paths: List[str]):
+        with self._lock:
+            for path in paths:
+                self._queued.setdefault(path, [])
+                self._watcher.add(path)
+
+    def _remove(self, paths: List[str]):
+        with self._lock:
+            for path in paths:
+                self._queued.pop(path, None)
+                self._watcher.remove(path)
+
+    def _poll(self, paths: List[str]) -> List[str]:
+        with self._lock:
+            for path in self._watcher.poll():
+                queued = self._queued.get(os.path.dirname(path))
+                if queued is not None:
+                    queued.append(path)
+
+            found = []
+            for path in paths:
+                queued = self._queued.get(path)
+                if queued:
+                    found.extend(queued)
+                    queued.clear()
+            return found
+
+
+class SharedWatch:
+    """
+    A consumer's view of the shared watcher: poll() returns new files
+    in its own directories only, close() stops watching them.
+    """
+
+    def __init__(self, shared: SharedDirectoryWatcher, paths: List[str]):
+        self._shared = shared
+        self._paths = paths
+        shared._add(paths)
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._shared.uses_inotify
+
+    def poll(self) -> List[str]:
+        if not self._paths:
+            return []
+        return self._shared._poll(self._paths)
+
+    def close(self):
+        self._shared._remove(self._paths)
+        self._paths = []
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_watcher() -> SharedDirectoryWatcher:
+    """
+    Process-wide watcher, created on first use.
+    """
+    global _shared
+
+    with _shared_lock:
+        if _shared is None:
+            _shared = SharedDirectoryWatcher()
+        return _shared
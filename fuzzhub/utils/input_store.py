@@ -0,0 +1,151 @@
+"""
+File: fuzzhub/utils/input_store.py
+
+Content-addressed store for crash inputs.
+
+Files are keyed by SHA-256 and laid out as <root>/ab/cd/<sha256>
+(two 256-way shard levels), so no directory grows past a few
+thousand entries even with millions of inputs, and identical inputs
+are stored once. Inputs are copied into the store (reflinked where
+the filesystem supports it) and hashed from that private copy, so the
+fuzzer later rewriting or deleting its file cannot change what was
+stored. Stored files are read-only.
+"""
+
+import fcntl
+import hashlib
+import os
+import stat
+import tempfile
+from typing import Optional, Tuple
+
+_CHUNK = 1024 * 1024
+
+# ioctl(dest, FICLONE, src): copy-on-write clone (btrfs, XFS, ...)
+_FICLONE = 0x40049409
+
+_READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+class InputChanged(OSError):
+    """
+    The source file changed while it was being stored (still being
+    written); retry later.
+    """
+
+
+def _hash_file(path: str) -> Tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_CHUNK)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def _signature(fd: int) -> Tuple[int, int]:
+    st = os.fstat(fd)
+    return st.st_mtime_ns, st.st_size
+
+
+class InputStore:
+
+    def __init__(self, root: str, reflink: bool = True):
+        self.root = os.path.abspath(root)
+        self.reflink = reflink
+        self._tmp = os.path.join(self.root, "tmp")
+        os.makedirs(self._tmp, exist_ok=True)
+
+    def path_for(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def exists(self, sha256: str) -> bool:
+        return os.path.exists(self.path_for(sha256))
+
+    def open(self, sha256: str):
+        return open(self.path_for(sha256), "rb")
+
+    def put(self, source: str) -> Tuple[str, int, bool]:
+        """
+        Store a file. Returns (sha256, size, newly_stored).
+
+        Raises InputChanged if the source was modified while it was
+        copied.
+        """
+        fd, staged = tempfile.mkstemp(dir=self._tmp)
+
+        try:
+            with open(source, "rb") as src, os.fdopen(fd, "wb") as dst:
+                before = _signature(src.fileno())
+                sha256, size = self._copy(src, dst, staged, before[1])
+                if _signature(src.fileno()) != before or size != before[1]:
+                    raise InputChanged(f"{source} changed while being stored")
+                os.fchmod(dst.fileno(), _READ_ONLY)
+
+            target = self.path_for(sha256)
+            if os.path.exists(target):
+                return sha256, size, False
+
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            try:
+                # link() fails if a concurrent put() got there first
+                os.link(staged, target)
+            except FileExistsError:
+                return sha256, size, False
+            return sha256, size, True
+        finally:
+            try:
+                os.unlink(staged)
+            except OSError:
+                pass
+
+    def _copy(self, src, dst, staged: str, expected: int) -> Tuple[str, int]:
+        """
+        Copy src into dst; returns the SHA-256 and size of what was
+        written. Reads at most one byte past the expected size, so a
+        file that keeps growing cannot hold the copy up.
+        """
+        if self.reflink:
+            try:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            except OSError:
+                pass
+            else:
+                # The clone is a snapshot; hash it, not the source
+                return _hash_file(staged)
+
+        digest = hashlib.sha256()
+        size = 0
+        while size <= expected:
+            chunk = src.read(min(_CHUNK, expected + 1 - size))
+            if not chunk:
+                break
+            dst.write(chunk)
+            digest.update(chunk)
+            size += len(chunk)
+        return digest.hexdigest(), size
+
+
+_store: Optional[InputStore] = None
+
+
+def get_input_store() -> InputStore:
+    """
+    Process-wide store configured from storage.inputs.
+    """
+    global _store
+
+    if _store is None:
+        from fuzzhub.utils.config import get_config
+
+        cfg = get_config().get("storage", {}).get("inputs", {})
+        _store = InputStore(
+            cfg.get("root", os.path.join("runtime", "inputs")),
+            # "link" was the setting's name when inputs were hardlinked
+            reflink=cfg.get("reflink", cfg.get("link", True)),
+        )
+    return _store
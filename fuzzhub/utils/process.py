@@ -1,11 +1,30 @@
 """
 File: fuzzhub/utils/process.py
 
-Process utilities for PID validation.
+Process utilities for PID validation and spawning.
+
+A bare PID can be reused by an unrelated process once the original
+exits. open_pidfd() pins the process a PID refers to right now, and
+open_verified() additionally checks its start time against the one
+recorded when it was spawned, so a recycled PID is never adopted.
+
+Spawn-time settings (CPU affinity, resource limits) are applied by a small command
+prefix that execs the real command, never by a preexec_fn: running
+Python between fork() and exec() in a multithreaded daemon can
+deadlock on locks held by other threads.
 """
 
 import os
+import select
+import shutil
 import signal
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import psutil
 
 
 def pid_exists(pid: int) -> bool:
@@ -23,3 +42,183 @@ def terminate_pid(pid: int):
         os.kill(pid, signal.SIGTERM)
     except Exception:
         pass
+
+
+# Fallback when taskset is not installed; exec keeps the PID
+_AFFINITY_EXEC = (
+    "import os, sys; "
+    "os.sched_setaffinity(0, [int(c) for c in sys.argv[1].split(',')]); "
+    "os.execvp(sys.argv[2], sys.argv[2:])"
+)
+
+
+def pinned_command(cmd: list, cpus) -> list:
+    """
+    cmd prefixed so that it runs on the given CPUs only.
+    """
+    if not cpus:
+        return list(cmd)
+
+    mask = ",".join(str(int(c)) for c in cpus)
+    taskset = shutil.which("taskset")
+    if taskset:
+        return [taskset, "-c", mask] + list(cmd)
+    return [sys.executable, "-c", _AFFINITY_EXEC, mask] + list(cmd)
+
+
+# Fallback when prlimit is not installed; argv[1] is "name=soft:hard,..."
+_RLIMIT_EXEC = (
+    "import os, resource, sys; "
+    "[resource.setrlimit(getattr(resource, 'RLIMIT_' + n.upper()), "
+    "tuple(int(v) for v in l.split(':'))) "
+    "for n, l in (i.split('=') for i in sys.argv[1].split(','))]; "
+    "os.execvp(sys.argv[2], sys.argv[2:])"
+)
+
+
+def limited_command(cmd: list, limits: dict) -> list:
+    """
+    cmd prefixed so that it runs under the given resource limits:
+    {"core": (soft, hard), "as": ..., "cpu": ...} (prlimit names).
+    """
+    if not limits:
+        return list(cmd)
+
+    prlimit = shutil.which("prlimit")
+    if prlimit:
+        return (
+            [prlimit]
+            + [f"--{name}={soft}:{hard}" for name, (soft, hard) in limits.items()]
+            + ["--"] + list(cmd)
+        )
+
+    spec = ",".join(f"{name}={soft}:{hard}" for name, (soft, hard) in limits.items())
+    return [sys.executable, "-c", _RLIMIT_EXEC, spec] + list(cmd)
+
+
+def process_start_time(pid: int) -> Optional[float]:
+    """
+    Start time of a live process (epoch seconds), None if it is gone.
+    """
+    if pid is None:
+        return None
+    try:
+        process = psutil.Process(pid)
+        if process.status() == psutil.STATUS_ZOMBIE:
+            return None
+        return process.create_time()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+def open_pidfd(pid: int) -> Optional[int]:
+    """
+    pidfd for a live process, None if it is gone or pidfds are
+    unsupported.
+    """
+    if pid is None or not hasattr(os, "pidfd_open"):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError:
+        return None
+
+
+def _pidfd_exited(pidfd: int) -> bool:
+    # A pidfd becomes readable once its process has exited
+    poller = select.poll()
+    poller.register(pidfd, select.POLLIN)
+    return bool(poller.poll(0))
+
+
+def open_verified(pid: int, started_at: datetime, tolerance: float = 5.0):
+    """
+    Return (alive, pidfd) for a process recorded as started at
+    started_at (naive UTC). pidfd is None when pidfds are unsupported;
+    alive is False when the PID is gone or now belongs to a process
+    that started at a different time.
+    """
+    if pid is None or started_at is None:
+        return False, None
+
+    expected = started_at.replace(tzinfo=timezone.utc).timestamp()
+
+    pidfd = open_pidfd(pid)
+    if pidfd is None and hasattr(os, "pidfd_open"):
+        return False, None
+
+    # Checked after the pidfd is open: if it still matches now, the
+    # pidfd refers to the process we spawned
+    created = process_start_time(pid)
+    alive = created is not None and abs(created - expected) <= tolerance
+
+    if alive and pidfd is not None and _pidfd_exited(pidfd):
+        alive = False
+
+    if not alive and pidfd is not None:
+        os.close(pidfd)
+        pidfd = None
+
+    return alive, pidfd
+
+
+class AdoptedProcess:
+    """
+    Popen-like handle for a live process started by a previous daemon.
+
+    It is not our child, so its exit status cannot be collected:
+    wait() returns None once it is gone. Signals go through the pidfd
+    when there is one.
+    """
+
+    def __init__(self, pid: int, pidfd: Optional[int] = None):
+        self.pid = pid
+        self.returncode = None
+        self._pidfd = pidfd
+        self._start_time = process_start_time(pid)
+
+    def _alive(self) -> bool:
+        if self._pidfd is not None:
+            return not _pidfd_exited(self._pidfd)
+        return self._start_time is not None and process_start_time(self.pid) == self._start_time
+
+    def poll(self):
+        return None
+
+    def send_signal(self, signum: int):
+        try:
+            if self._pidfd is not None:
+                signal.pidfd_send_signal(self._pidfd, signum)
+            elif self._alive():
+                os.kill(self.pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+    def wait(self, timeout: float = None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while self._alive():
+            if self._pidfd is not None:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                poller = select.poll()
+                poller.register(self._pidfd, select.POLLIN)
+                poller.poll(None if remaining is None else remaining * 1000)
+            else:
+                time.sleep(0.05)
+
+            if deadline is not None and time.monotonic() >= deadline and self._alive():
+                raise subprocess.TimeoutExpired(str(self.pid), timeout)
+
+        self.close()
+        return None
+
+    def close(self):
+        if self._pidfd is not None:
+            os.close(self._pidfd)
+            self._pidfd = None
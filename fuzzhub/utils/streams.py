@@ -0,0 +1,73 @@
+"""
+File: fuzzhub/utils/streams.py
+
+Shared poll thread for fuzzer output.
+
+Fuzzers write their output to log files (never pipes, so a process
+outlives a daemon restart); pollers registered here tail those files.
+One thread runs every poller each poll interval, so instances do not
+each need a reader thread of their own.
+"""
+
+import threading
+import time
+from typing import Callable, Dict
+
+_POLL_INTERVAL = 0.5
+
+
+class StreamPump(threading.Thread):
+
+    def __init__(self, poll_interval: float = _POLL_INTERVAL):
+        super().__init__(daemon=True, name="stream-pump")
+
+        self.poll_interval = poll_interval
+
+        self._pollers: Dict[str, Callable] = {}
+        self._lock = threading.Lock()
+
+    # -----------------------------------------
+    # Registration
+    # -----------------------------------------
+
+    def add_poller(self, key: str, fn: Callable[[], None]):
+        with self._lock:
+            self._pollers[key] = fn
+
+    def remove_poller(self, key: str):
+        with self._lock:
+            self._pollers.pop(key, None)
+
+    # -----------------------------------------
+    # Loop
+    # -----------------------------------------
+
+    def run(self):
+        while True:
+            time.sleep(self.poll_interval)
+
+            with self._lock:
+                pollers = list(self._pollers.items())
+
+            for name, fn in pollers:
+                try:
+                    fn()
+                except Exception as e:
+                    print(f"[!] Stream poller {name} failed: {e}")
+
+
+_pump = None
+_pump_lock = threading.Lock()
+
+
+def get_pump() -> StreamPump:
+    """
+    Process-wide pump, started on first use.
+    """
+    global _pump
+
+    with _pump_lock:
+        if _pump is None:
+            _pump = StreamPump()
+            _pump.start()
+        return _pump
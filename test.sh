@@ -3,7 +3,7 @@
 #======================================================================
 # Load tests
 #======================================================================
-for tst in ./tests/* ; do
+for tst in ./tests/*.sh ; do
 	. ${tst}
 done
 
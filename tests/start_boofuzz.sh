@@ -0,0 +1,9 @@
+#! /usr/bin/sh
+
+# Start a boofuzz session against tests/fakes/tcp_target
+# (run "./tests/fakes/tcp_target 9999 &" first)
+start_fake_boofuzz() {
+	curl -X POST http://localhost:8000/fuzzers/start \
+			-H "Content-Type: application/json" \
+			-d "{\"campaign_id\":\"test_campaign\",\"fuzzer_type\":\"boofuzz\",\"config\":{\"host\":\"127.0.0.1\",\"port\":9999,\"seed\":\"HELLO\"}}"
+}
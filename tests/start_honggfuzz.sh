@@ -0,0 +1,8 @@
+#! /usr/bin/sh
+
+# Start a honggfuzz instance backed by tests/fakes/honggfuzz
+start_fake_honggfuzz() {
+	curl -X POST http://localhost:8000/fuzzers/start \
+			-H "Content-Type: application/json" \
+			-d "{\"campaign_id\":\"test_campaign\",\"fuzzer_type\":\"honggfuzz\",\"config\":{\"honggfuzz_path\":\"$(pwd)/tests/fakes/honggfuzz\",\"target_binary\":\"/bin/true\",\"threads\":2}}"
+}